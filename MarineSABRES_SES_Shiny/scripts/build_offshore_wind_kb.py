@@ -20,6 +20,10 @@ Valid transitions (matching main KB):
 
 Output: data/ses_knowledge_db_offshore_wind.json
 
+Usage:
+    micromamba run -n shiny python scripts/build_offshore_wind_kb.py --bib export-2026-4-9.bib
+    micromamba run -n shiny python scripts/kb_build.py build offshore_wind_kb   (incremental, guarded)
+
 NOTE ON MANUAL POST-GENERATION EDITS
 ------------------------------------
 Some connections and element placements in the output JSON may have been
@@ -32,41 +36,35 @@ additions not mirrored here. Before rebuilding:
      the script is (overwrite)
   3. if the JSON is authoritative, mirror manual changes into this script
      before rebuilding, or skip the rebuild entirely.
+scripts/kb_build.py refuses to overwrite the JSON once it differs from what
+this script last produced (or before it has been built/adopted once).
 """
 
+import argparse
 import re
 import json
 from pathlib import Path
 
+from kb_lib import OFFSHORE_WIND_KB_PATH, classify_papers, load_bibtex
+from kb_lib.build_graph import OFFSHORE_WIND_BIB_PATH
+from kb_lib.bibtex import plain_text
+
 # === Parse BibTeX ===
 
 def parse_bibtex(bib_path):
-    """Parse BibTeX file into list of dicts."""
-    text = Path(bib_path).read_text(encoding="utf-8")
+    """Parse BibTeX file into list of dicts (parsed entries cached by file hash)."""
     entries = []
-    raw_entries = re.split(r'\n@\w+\{', text)
-    for raw in raw_entries:
-        if not raw.strip():
-            continue
+    for raw in load_bibtex(bib_path):
+        fields = raw['fields']
         entry = {}
-        m = re.search(r'year\s*=\s*\{(\d{4})\}', raw)
-        if m:
-            entry['year'] = int(m.group(1))
-        m = re.search(r'title\s*=\s*\{\{(.+?)\}\}', raw, re.DOTALL)
-        if m:
-            entry['title'] = re.sub(r'\s+', ' ', m.group(1).strip())
-        m = re.search(r'author\s*=\s*\{(.+?)\}(?:\s*,\s*\n|\s*\n)', raw, re.DOTALL)
-        if m:
-            entry['authors'] = re.sub(r'\s+', ' ', m.group(1).strip())
-        m = re.search(r'journal\s*=\s*\{(.+?)\}', raw)
+        m = re.search(r'\d{4}', fields.get('year', ''))
         if m:
-            entry['journal'] = m.group(1).strip()
-        m = re.search(r'doi\s*=\s*\{(.+?)\}', raw)
-        if m:
-            entry['doi'] = m.group(1).strip()
-        m = re.search(r'abstract\s*=\s*\{\{(.+?)\}\}', raw, re.DOTALL)
-        if m:
-            entry['abstract'] = re.sub(r'\s+', ' ', m.group(1).strip())
+            entry['year'] = int(m.group(0))
+        for name, key in (('title', 'title'), ('author', 'authors'), ('journal', 'journal'),
+                          ('doi', 'doi'), ('abstract', 'abstract')):
+            value = plain_text(fields.get(name, ''))
+            if value:
+                entry[key] = value
         if entry.get('title'):
             entries.append(entry)
     return entries
@@ -93,186 +91,27 @@ def format_citation(entry):
     return f"{first} {year}"
 
 
-def classify_paper(entry):
-    """Classify paper into DAPSIWRM-relevant themes based on title + abstract."""
-    text = (entry.get('title', '') + ' ' + entry.get('abstract', '')).lower()
-    tags = set()
-
-    # --- Drivers ---
-    if any(w in text for w in ['energy demand', 'renewable energy target', 'decarboni',
-                                'carbon neutral', 'climate target', 'energy transition',
-                                'energy security', 'energy policy', 'net zero',
-                                'climate mitigation', 'green deal', 'paris agreement']):
-        tags.add('driver_energy_transition')
-    if any(w in text for w in ['economic growth', 'job creation', 'employment',
-                                'economic development', 'blue economy', 'blue growth',
-                                'industriali', 'regional development']):
-        tags.add('driver_economic')
-    if any(w in text for w in ['food security', 'protein demand', 'fish demand',
-                                'seafood', 'aquaculture demand']):
-        tags.add('driver_food_security')
-    if any(w in text for w in ['population growth', 'urbanis', 'coastal population']):
-        tags.add('driver_population')
-    if any(w in text for w in ['climate change', 'global warming', 'sea level rise',
-                                'ocean warming', 'climate variab']):
-        tags.add('driver_climate_change')
-
-    # --- Activities ---
-    if any(w in text for w in ['offshore wind farm', 'wind turbine', 'wind energy',
-                                'wind power', 'owf', 'owe', 'offshore wind']):
-        tags.add('activity_offshore_wind')
-    if any(w in text for w in ['fishing', 'fishery', 'fisheries', 'trawl', 'angling',
-                                'recreational fish']):
-        tags.add('activity_fishing')
-    if any(w in text for w in ['aquaculture', 'mariculture', 'fish farm', 'mussel',
-                                'seaweed', 'kelp farm']):
-        tags.add('activity_aquaculture')
-    if any(w in text for w in ['shipping', 'navigation', 'vessel traffic', 'maritime transport']):
-        tags.add('activity_shipping')
-    if any(w in text for w in ['tourism', 'recreation', 'leisure', 'whale watch']):
-        tags.add('activity_tourism')
-    if any(w in text for w in ['multi-use', 'multi use', 'co-location', 'colocation',
-                                'coexistence', 'co-exist']):
-        tags.add('activity_multi_use')
-    if any(w in text for w in ['decommission', 'end-of-life', 'repurpos']):
-        tags.add('activity_decommissioning')
-    if any(w in text for w in ['cable', 'grid connect', 'transmission', 'substation']):
-        tags.add('activity_grid_infrastructure')
-
-    # --- Pressures ---
-    if any(w in text for w in ['noise pollution', 'underwater noise', 'pile driving',
-                                'acoustic', 'noise impact']):
-        tags.add('pressure_noise')
-    if any(w in text for w in ['habitat loss', 'habitat alter', 'seabed disturb',
-                                'benthic impact', 'sediment', 'scour']):
-        tags.add('pressure_habitat')
-    if any(w in text for w in ['collision', 'bird strike', 'avian mortality',
-                                'seabird', 'bird', 'bat']):
-        tags.add('pressure_bird_collision')
-    if any(w in text for w in ['electromagnetic', 'emf', 'electric field', 'magnetic field']):
-        tags.add('pressure_emf')
-    if any(w in text for w in ['visual impact', 'landscape', 'seascape', 'viewshed',
-                                'aesthetic']):
-        tags.add('pressure_visual')
-    if any(w in text for w in ['displacement', 'exclusion', 'access restrict',
-                                'fishing ground', 'spatial conflict', 'space compet']):
-        tags.add('pressure_displacement')
-    if any(w in text for w in ['barrier', 'migration', 'movement', 'connectivity']):
-        tags.add('pressure_barrier')
-
-    # --- State / Components ---
-    if any(w in text for w in ['biodiversity', 'species richness', 'community composition',
-                                'ecosystem', 'ecological']):
-        tags.add('state_biodiversity')
-    if any(w in text for w in ['marine mammal', 'cetacean', 'seal', 'porpoise',
-                                'dolphin', 'whale']):
-        tags.add('state_marine_mammals')
-    if any(w in text for w in ['fish population', 'fish stock', 'fish communit',
-                                'demersal', 'pelagic', 'cod', 'herring']):
-        tags.add('state_fish')
-    if any(w in text for w in ['benthic', 'benthos', 'invertebrate', 'mussel bed',
-                                'reef effect', 'artificial reef', 'fouling',
-                                'colonisation', 'colonization']):
-        tags.add('state_benthos')
-    if any(w in text for w in ['food web', 'trophic', 'predator', 'prey']):
-        tags.add('state_food_web')
-    if any(w in text for w in ['seabird', 'bird population', 'avian', 'gannet',
-                                'tern', 'gull']):
-        tags.add('state_seabirds')
-
-    # --- Ecosystem Services (= "impacts" in JSON) ---
-    if any(w in text for w in ['ecosystem service', 'provisioning', 'regulating',
-                                'cultural service', 'supporting service']):
-        tags.add('es_ecosystem_services')
-    if any(w in text for w in ['carbon sequestration', 'carbon storage', 'blue carbon',
-                                'carbon capture']):
-        tags.add('es_carbon')
-    if any(w in text for w in ['fish production', 'fishery production', 'catch',
-                                'landings', 'spillover']):
-        tags.add('es_fish_production')
-
-    # --- Goods & Benefits / Welfare (= "welfare" in JSON) ---
-    if any(w in text for w in ['electricity', 'energy production', 'power generation',
-                                'energy output', 'capacity factor', 'megawatt', 'gigawatt']):
-        tags.add('gb_energy')
-    if any(w in text for w in ['revenue', 'profit', 'income', 'economic benefit',
-                                'cost-benefit', 'cost benefit', 'lcoe']):
-        tags.add('gb_economic')
-    if any(w in text for w in ['employment', 'job', 'workforce', 'skill',
-                                'supply chain', 'local econom']):
-        tags.add('gb_employment')
-    if any(w in text for w in ['social accept', 'public perception', 'attitude',
-                                'nimby', 'not in my back', 'community support',
-                                'social license', 'willingness to pay']):
-        tags.add('hw_social_acceptance')
-    if any(w in text for w in ['livelihood', 'wellbeing', 'well-being', 'welfare',
-                                'quality of life', 'health']):
-        tags.add('hw_wellbeing')
-    if any(w in text for w in ['justice', 'equity', 'just transition', 'distribut',
-                                'procedural', 'fairness']):
-        tags.add('hw_justice')
-    if any(w in text for w in ['cultural heritage', 'identity', 'sense of place',
-                                'cultural value']):
-        tags.add('hw_cultural')
-    if any(w in text for w in ['conflict', 'dispute', 'tension', 'opposition',
-                                'protest', 'resistance']):
-        tags.add('hw_conflict')
-
-    # --- Responses ---
-    if any(w in text for w in ['marine spatial planning', 'msp', 'spatial plan',
-                                'zoning', 'maritime spatial']):
-        tags.add('response_msp')
-    if any(w in text for w in ['environmental impact assessment', 'eia', 'impact assessment',
-                                'strategic environmental assessment', 'sea ']):
-        tags.add('response_eia')
-    if any(w in text for w in ['stakeholder', 'participat', 'engagement', 'consultation',
-                                'governance', 'co-management']):
-        tags.add('response_stakeholder')
-    if any(w in text for w in ['mitigation', 'compensat', 'offset', 'nature positive',
-                                'biodiversity net gain', 'nature inclusive']):
-        tags.add('response_mitigation')
-    if any(w in text for w in ['regulation', 'policy', 'legislation', 'directive',
-                                'permit', 'licensing']):
-        tags.add('response_regulation')
-    if any(w in text for w in ['monitor', 'survey', 'indicator', 'baseline',
-                                'assessment framework']):
-        tags.add('response_monitoring')
-    if any(w in text for w in ['subsid', 'incentive', 'auction', 'feed-in',
-                                'contract for difference', 'cfd']):
-        tags.add('response_subsidy')
-    if any(w in text for w in ['bubble curtain', 'noise mitigation', 'soft start',
-                                'deterrent', 'pinger']):
-        tags.add('measure_noise_mitigation')
-    if any(w in text for w in ['closed area', 'exclusion zone', 'buffer zone',
-                                'no-take', 'protected area', 'mpa']):
-        tags.add('measure_spatial')
-    if any(w in text for w in ['seasonal restrict', 'timing restrict', 'construction window']):
-        tags.add('measure_temporal')
-    if any(w in text for w in ['artificial reef', 'reef', 'habitat enhance',
-                                'nature inclusive design', 'eco-design']):
-        tags.add('measure_habitat_enhancement')
-
-    return tags
-
-
 # === Build the KB ===
 
-def build_kb(papers):
-    """Build the offshore wind parks SES knowledge base with correct DAPSIWRM mappings."""
+def build_kb(papers, jobs=None):
+    """Build the offshore wind parks SES knowledge base with correct DAPSIWRM mappings.
+
+    Papers are tagged by classify_papers(): in parallel batches, reusing
+    the memoized tags of papers already classified with the same rules.
+    """
 
+    tags_per_paper, stats = classify_papers(papers, 'offshore_wind_paper_themes', jobs=jobs)
     paper_tags = []
-    for p in papers:
-        tags = classify_paper(p)
+    for p, tags in zip(papers, tags_per_paper):
         citation = format_citation(p)
-        paper_tags.append({'entry': p, 'tags': tags, 'citation': citation})
+        paper_tags.append({'entry': p, 'tags': set(tags), 'citation': citation})
 
     # Print tag statistics
-    all_tags = {}
-    for pt in paper_tags:
-        for t in pt['tags']:
-            all_tags[t] = all_tags.get(t, 0) + 1
+    all_tags = stats['tag_counts']
 
     print(f"\nParsed {len(papers)} papers")
+    print(f"Classified {stats['classified']} papers, reused {stats['reused']} memoized "
+          f"({stats['seconds']:.2f}s, {stats['papers_per_second']} papers/s)")
     print(f"Tag distribution ({len(all_tags)} unique tags):")
     for tag, count in sorted(all_tags.items(), key=lambda x: -x[1])[:20]:
         print(f"  {tag}: {count}")
@@ -2465,14 +2304,20 @@ def build_kb(papers):
 
 # === Main ===
 if __name__ == "__main__":
-    bib_path = Path(r"C:\Users\arturas.baziukas\OneDrive - ku.lt\HORIZON_EUROPE\Marine-SABRES\SESToolbox\MarineSABRES_SES_Shiny\.playwright-mcp\export-2026-4-9.bib")
+    parser = argparse.ArgumentParser(description="Build the offshore wind parks SES KB from a BibTeX export.")
+    parser.add_argument('--bib', type=Path, default=OFFSHORE_WIND_BIB_PATH,
+                        help="BibTeX export (default: $OFFSHORE_WIND_BIB or data/offshore_wind_papers.bib)")
+    parser.add_argument('--out', type=Path, default=OFFSHORE_WIND_KB_PATH, help="output KB file")
+    parser.add_argument('--jobs', '-j', type=int, default=None, help="paper classification workers")
+    args = parser.parse_args()
+    bib_path = args.bib
 
     papers = parse_bibtex(bib_path)
     print(f"Parsed {len(papers)} papers from BibTeX")
 
-    kb = build_kb(papers)
+    kb = build_kb(papers, jobs=args.jobs)
 
-    out_path = Path(r"C:\Users\arturas.baziukas\OneDrive - ku.lt\HORIZON_EUROPE\Marine-SABRES\SESToolbox\MarineSABRES_SES_Shiny\data\ses_knowledge_db_offshore_wind.json")
+    out_path = args.out
     with open(out_path, 'w', encoding='utf-8') as f:
         json.dump(kb, f, indent=2, ensure_ascii=False)
 
@@ -26,6 +26,8 @@ not mirrored here. Before rebuilding:
      is (overwrite)
   3. if the JSON is authoritative, mirror manual changes into the in-script
      definitions below before rebuilding
+scripts/kb_build.py refuses to overwrite the JSON once it differs from what
+this script last produced (or before it has been built/adopted once).
 """
 
 import json
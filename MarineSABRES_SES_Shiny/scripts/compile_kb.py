@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Compile the KB JSON files to binary .kbc artifacts (kb_lib.compiled).
+
+Writes data/<kb>.kbc next to each KB file. Scripts can then use
+kb_lib.load_compiled(), which memory-maps the artifact when it matches
+the JSON and falls back to parsing the JSON otherwise. The JSON stays the
+file that is edited and committed; re-run this after changing it.
+
+Usage:
+    micromamba run -n shiny python scripts/compile_kb.py
+    micromamba run -n shiny python scripts/compile_kb.py --check
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from kb_lib import KB_PATH, OFFSHORE_WIND_KB_PATH, WP5_KB_PATH, ArtifactError, CompiledKB, compile_kb
+from kb_lib.compiled import default_artifact_path
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compile KB JSON files to binary artifacts.")
+    parser.add_argument(
+        "kb_files", nargs="*", type=Path,
+        help="KB files to compile (default: main, offshore wind and WP5 KBs)",
+    )
+    parser.add_argument(
+        "--check", action="store_true",
+        help="only report whether each artifact is present, intact and up to date",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    kb_files = args.kb_files or [KB_PATH, OFFSHORE_WIND_KB_PATH, WP5_KB_PATH]
+
+    stale = 0
+    for kb_path in kb_files:
+        artifact = default_artifact_path(kb_path)
+        if args.check:
+            try:
+                status = "OK" if CompiledKB(artifact).is_current(kb_path) else "STALE"
+            except FileNotFoundError:
+                status = "MISSING"
+            except ArtifactError:
+                status = "CORRUPT"
+            stale += status != "OK"
+            print(f"  [{status:<7}] {artifact}")
+            continue
+
+        started = time.perf_counter()
+        compile_kb(kb_path, artifact)
+        print(f"{kb_path.name} -> {artifact.name} "
+              f"({artifact.stat().st_size / 1024:.0f} KiB, {time.perf_counter() - started:.2f}s)")
+
+    sys.exit(1 if stale else 0)
+
+
+if __name__ == "__main__":
+    main()
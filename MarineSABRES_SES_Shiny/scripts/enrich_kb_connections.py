@@ -12,15 +12,11 @@ This script systematically reviews and updates all 1120 connections across
 - references: 2-3 per connection with regional relevance
 """
 
-import json
 import copy
 import random
 import re
-import os
 
-# Set working directory
-PROJ_DIR = r"C:\Users\DELL\OneDrive - ku.lt\HORIZON_EUROPE\Marine-SABRES\SESToolbox\MarineSABRES_SES_Shiny"
-KB_PATH = os.path.join(PROJ_DIR, "data", "ses_knowledge_db.json")
+from kb_lib import KB_PATH, KBTransaction, KnowledgeBase, load_rules
 
 # ============================================================
 # REFERENCE LIBRARIES by region and topic
@@ -495,36 +491,9 @@ def get_region(context_name):
 
 
 def detect_topics(conn):
-    """Detect relevant topics from connection text."""
+    """Detect relevant topics from connection text (rules in kb_lib/rules/connection_topics.json)."""
     text = f"{conn['from']} {conn['to']} {conn.get('rationale', '')}".lower()
-    topics = []
-
-    topic_keywords = {
-        "fishing": ["fish", "trawl", "catch", "harvest", "angl", "longline", "gillnet", "seine", "overfish"],
-        "pollution": ["pollut", "contamin", "toxic", "chemical", "plastic", "microplastic", "sewage", "waste"],
-        "eutrophication": ["nutrient", "eutrophic", "nitrogen", "phosphor", "fertiliz", "algal bloom", "cyanobacter"],
-        "climate_change": ["climate", "warming", "temperature", "sea level", "ocean heat", "greenhouse"],
-        "habitat_destruction": ["habitat", "deforest", "mangrove loss", "seabed disturb", "dredg"],
-        "tourism": ["touris", "recreation", "visitor", "diving", "snorkel", "cruise"],
-        "governance": ["regulat", "policy", "govern", "management", "MPA", "protect", "legislat", "enforcement"],
-        "wellbeing": ["wellbeing", "well-being", "livelihood", "income", "employ", "health", "welfare"],
-        "ecosystem_services": ["ecosystem service", "provision", "regulating", "cultural service"],
-        "mpa": ["marine protected", "no-take", "reserve", "sanctuary"],
-        "invasive_species": ["invasive", "alien species", "non-native", "introduced species", "Mnemiopsis"],
-        "aquaculture": ["aquaculture", "fish farm", "mariculture", "mussel farm", "shellfish farm"],
-        "coastal_development": ["coastal develop", "urbaniz", "construction", "port expan", "land reclaim"],
-        "shipping": ["ship", "vessel", "maritime transport", "navigation", "ballast"],
-        "dredging": ["dredg", "channel", "sediment extract"],
-        "hypoxia": ["hypox", "anoxic", "dead zone", "oxygen deple", "oxygen deficit"],
-        "acidification": ["acidif", "pH", "carbonate", "aragonite"],
-        "coral_bleaching": ["bleach", "coral stress", "thermal stress on coral"],
-    }
-
-    for topic, keywords in topic_keywords.items():
-        if any(kw in text for kw in keywords):
-            topics.append(topic)
-
-    return topics
+    return load_rules("connection_topics").match(text)
 
 
 def get_habitat_topic(context_name):
@@ -970,11 +939,69 @@ def review_strength(conn, context_name):
 # MAIN PROCESSING
 # ============================================================
 
-def main():
-    print("Loading knowledge base...")
-    with open(KB_PATH, "r", encoding="utf-8") as f:
-        db = json.load(f)
+def enrich_kb(db, stats):
+    """Review and enrich every connection of ``db`` in place, counting changes in ``stats``."""
+    random.seed(42)  # Reproducible reference selection
+
+    kb = KnowledgeBase(db)
+    current = None
+    for ctx_name, _, conn in kb.iter_connections():
+        if ctx_name != current:
+            current = ctx_name
+            print(f"Processing {ctx_name}: {len(kb.connections(ctx_name))} connections")
+
+        stats["total_processed"] += 1
+
+        # 1. Enrich rationale
+        old_rationale = conn.get("rationale", "")
+        new_rationale = enrich_rationale(conn, ctx_name)
+        if new_rationale != old_rationale:
+            conn["rationale"] = new_rationale
+            stats["rationale_enriched"] += 1
+
+        # 2. Review confidence
+        old_conf = conn.get("confidence", 3)
+        new_conf = review_confidence(conn, ctx_name)
+        if new_conf != old_conf:
+            conn["confidence"] = new_conf
+            stats["confidence_adjusted"] += 1
+
+        # 3. Review temporal lag
+        old_lag = conn.get("temporal_lag")
+        new_lag = review_temporal_lag(conn, ctx_name)
+        if new_lag != old_lag:
+            conn["temporal_lag"] = new_lag
+            stats["temporal_lag_adjusted"] += 1
+
+        # 4. Review reversibility
+        old_rev = conn.get("reversibility")
+        new_rev = review_reversibility(conn, ctx_name)
+        if new_rev != old_rev:
+            conn["reversibility"] = new_rev
+            stats["reversibility_adjusted"] += 1
+
+        # 5. Review strength
+        old_str = conn.get("strength")
+        new_str = review_strength(conn, ctx_name)
+        if new_str != old_str:
+            conn["strength"] = new_str
+            stats["strength_adjusted"] += 1
+
+        # 6. Add references
+        existing_refs = conn.get("references", [])
+        if len(existing_refs) < 3:
+            new_ref_candidates = get_refs_for_connection(conn, ctx_name, existing_refs)
+            refs_needed = 3 - len(existing_refs)
+            if new_ref_candidates:
+                # Select most relevant refs (not random)
+                selected = new_ref_candidates[:refs_needed]
+                if len(selected) < refs_needed and len(new_ref_candidates) > len(selected):
+                    selected = new_ref_candidates[:refs_needed]
+                conn["references"] = existing_refs + selected
+                stats["references_added"] += len(selected)
+
 
+def main():
     stats = {
         "rationale_enriched": 0,
         "confidence_adjusted": 0,
@@ -985,67 +1012,10 @@ def main():
         "total_processed": 0,
     }
 
-    random.seed(42)  # Reproducible reference selection
-
-    for ctx_name, ctx in db["contexts"].items():
-        connections = ctx.get("connections", [])
-        print(f"Processing {ctx_name}: {len(connections)} connections")
-
-        for i, conn in enumerate(connections):
-            stats["total_processed"] += 1
-
-            # 1. Enrich rationale
-            old_rationale = conn.get("rationale", "")
-            new_rationale = enrich_rationale(conn, ctx_name)
-            if new_rationale != old_rationale:
-                conn["rationale"] = new_rationale
-                stats["rationale_enriched"] += 1
-
-            # 2. Review confidence
-            old_conf = conn.get("confidence", 3)
-            new_conf = review_confidence(conn, ctx_name)
-            if new_conf != old_conf:
-                conn["confidence"] = new_conf
-                stats["confidence_adjusted"] += 1
-
-            # 3. Review temporal lag
-            old_lag = conn.get("temporal_lag")
-            new_lag = review_temporal_lag(conn, ctx_name)
-            if new_lag != old_lag:
-                conn["temporal_lag"] = new_lag
-                stats["temporal_lag_adjusted"] += 1
-
-            # 4. Review reversibility
-            old_rev = conn.get("reversibility")
-            new_rev = review_reversibility(conn, ctx_name)
-            if new_rev != old_rev:
-                conn["reversibility"] = new_rev
-                stats["reversibility_adjusted"] += 1
-
-            # 5. Review strength
-            old_str = conn.get("strength")
-            new_str = review_strength(conn, ctx_name)
-            if new_str != old_str:
-                conn["strength"] = new_str
-                stats["strength_adjusted"] += 1
-
-            # 6. Add references
-            existing_refs = conn.get("references", [])
-            if len(existing_refs) < 3:
-                new_ref_candidates = get_refs_for_connection(conn, ctx_name, existing_refs)
-                refs_needed = 3 - len(existing_refs)
-                if new_ref_candidates:
-                    # Select most relevant refs (not random)
-                    selected = new_ref_candidates[:refs_needed]
-                    if len(selected) < refs_needed and len(new_ref_candidates) > len(selected):
-                        selected = new_ref_candidates[:refs_needed]
-                    conn["references"] = existing_refs + selected
-                    stats["references_added"] += len(selected)
-
-    # Write output
-    print("\nWriting enriched knowledge base...")
-    with open(KB_PATH, "w", encoding="utf-8") as f:
-        json.dump(db, f, indent=2, ensure_ascii=False)
+    print("Loading knowledge base...")
+    with KBTransaction(KB_PATH, "Enrich connection rationales, scores and references") as tx:
+        enrich_kb(tx.data, stats)
+        print("\nWriting enriched knowledge base...")
 
     print("\n=== ENRICHMENT SUMMARY ===")
     print(f"Total connections processed: {stats['total_processed']}")
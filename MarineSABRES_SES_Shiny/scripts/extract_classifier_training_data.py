@@ -0,0 +1,81 @@
+"""
+Build (text, DAPSIWRM-category) labelled pairs for the BERT chunk-classifier.
+
+Sources:
+  - data/ml_training_data.rds-derived 7 templates' element names (232 pairs)
+  - data/ses_knowledge_db.json — full KB (33 contexts, ~1200 connections)
+  - data/ses_knowledge_db_offshore_wind.json — 4 regional contexts
+
+The full KB stores elements under per-category fields (drivers, activities,
+pressures, marine_processes_functioning, ecosystem_services, goods_benefits,
+responses) as lists of {name, relevance} dicts.
+
+Output: data/element_classifier_training.json with shape:
+  {
+    "examples": [{"text": "...", "category": "Drivers"}, ...],
+    "categories": ["Drivers", "Activities", ...]
+  }
+"""
+
+import json
+
+from kb_lib import DATA_DIR, KB_PATH, OFFSHORE_WIND_KB_PATH, element_name, load_kb
+
+CATEGORY_MAP = {
+    "drivers": "Drivers",
+    "activities": "Activities",
+    "pressures": "Pressures",
+    "states": "Marine Processes & Functioning",          # used in main KB
+    "marine_processes_functioning": "Marine Processes & Functioning",
+    "marine_processes": "Marine Processes & Functioning",
+    "components": "Marine Processes & Functioning",
+    "impacts": "Ecosystem Services",                      # used in main KB
+    "ecosystem_services": "Ecosystem Services",
+    "welfare": "Goods & Benefits",                         # used in main KB
+    "goods_benefits": "Goods & Benefits",
+    "goods_and_benefits": "Goods & Benefits",
+    "responses": "Responses",
+    "measures": "Responses",
+}
+
+
+def harvest(json_path):
+    """Yield (name, canonical_category) from one KB file."""
+    if not json_path.exists():
+        return
+    kb = load_kb(json_path)
+    for _, kb_field, el in kb.iter_elements(categories=list(CATEGORY_MAP)):
+        name = element_name(el)
+        if name and len(name.strip()) >= 3:
+            yield name.strip(), CATEGORY_MAP[kb_field]
+
+
+def main():
+    examples_by_name = {}
+
+    for path in [KB_PATH, OFFSHORE_WIND_KB_PATH]:
+        for name, cat in harvest(path):
+            # Dedupe on name (first category wins; element naming is consistent
+            # in the KB)
+            key = name.lower()
+            if key not in examples_by_name:
+                examples_by_name[key] = {"text": name, "category": cat}
+
+    examples = list(examples_by_name.values())
+
+    categories = sorted({e["category"] for e in examples})
+    out_path = DATA_DIR / "element_classifier_training.json"
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump({"examples": examples, "categories": categories}, f, indent=2, ensure_ascii=False)
+
+    print(f"Wrote {len(examples)} examples to {out_path}")
+    print("Class balance:")
+    counts = {}
+    for e in examples:
+        counts[e["category"]] = counts.get(e["category"], 0) + 1
+    for c in categories:
+        print(f"  {c}: {counts.get(c, 0)}")
+
+
+if __name__ == "__main__":
+    main()
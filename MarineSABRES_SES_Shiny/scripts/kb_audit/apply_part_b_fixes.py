@@ -3,17 +3,21 @@
 
 Removes 11 invalid connections and reclassifies 3 elements in
 data/ses_knowledge_db.json. Modifies the file in place after creating
-a .backup copy.
+a .backup copy; the write is one atomic kb_lib.KBTransaction.
 
 Usage:
     micromamba run -n shiny python scripts/kb_audit/apply_part_b_fixes.py
 """
 
-import json
 import shutil
 import sys
+from collections import defaultdict
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from kb_lib import KB_PATH, EndpointIndex, KBTransaction  # noqa: E402
+
 
 # Part B1-B5: Connections to remove (match on context + from + to substrings)
 REMOVALS = [
@@ -69,22 +73,28 @@ RECLASSIFICATIONS = [
 
 def apply_removals(kb: dict, removals: list) -> int:
     """Remove connections matching (context, from_substr, to_substr)."""
-    removed = 0
+    # Resolve every removal against the untouched lists first, then drop
+    # all matched indices per context in one rebuild
+    doomed = defaultdict(set)
+    indexes = {}
     for ctx_name, from_substr, to_substr in removals:
         ctx = kb.get("contexts", {}).get(ctx_name)
         if not ctx:
             print(f"WARNING: context '{ctx_name}' not found", file=sys.stderr)
             continue
-        conns = ctx.get("connections", [])
-        before = len(conns)
-        ctx["connections"] = [
-            c for c in conns
-            if not (from_substr in c.get("from", "") and to_substr in c.get("to", ""))
-        ]
-        n = before - len(ctx["connections"])
-        if n == 0:
+        index = indexes.get(ctx_name)
+        if index is None:
+            index = indexes[ctx_name] = EndpointIndex(ctx.get("connections", []), case_sensitive=True)
+        matches = set(index.find(from_substr, to_substr)) - doomed[ctx_name]
+        if not matches:
             print(f"WARNING: no match for {ctx_name}: {from_substr} -> {to_substr}", file=sys.stderr)
-        removed += n
+        doomed[ctx_name] |= matches
+
+    removed = 0
+    for ctx_name, indices in doomed.items():
+        ctx = kb["contexts"][ctx_name]
+        ctx["connections"] = [c for i, c in enumerate(ctx["connections"]) if i not in indices]
+        removed += len(indices)
     return removed
 
 
@@ -138,40 +148,31 @@ def apply_reclassifications(kb: dict, reclass: list) -> int:
 
 
 def main():
-    project_root = Path(__file__).parent.parent.parent
-    kb_path = project_root / "data" / "ses_knowledge_db.json"
+    kb_path = KB_PATH
     backup_path = kb_path.with_suffix(".json.backup-part-b")
 
-    print(f"Reading {kb_path}")
-    with open(kb_path, "r", encoding="utf-8") as f:
-        kb = json.load(f)
-
     # Backup
     print(f"Creating backup: {backup_path}")
     shutil.copy2(kb_path, backup_path)
 
-    # Apply changes
-    print("\nApplying removals...")
-    n_removed = apply_removals(kb, REMOVALS)
-    print(f"Removed {n_removed} connections (expected 11)")
-
-    print("\nApplying reclassifications...")
-    n_reclass = apply_reclassifications(kb, RECLASSIFICATIONS)
-    print(f"Reclassified {n_reclass} elements (expected 3)")
-
-    if n_removed != 11 or n_reclass != 3:
-        print("\nERROR: counts do not match expected values. Aborting write.", file=sys.stderr)
-        sys.exit(1)
-
-    # Write
-    print(f"\nWriting {kb_path}")
-    with open(kb_path, "w", encoding="utf-8") as f:
-        json.dump(kb, f, indent=2, ensure_ascii=False)
-
-    # Validate
-    with open(kb_path, "r", encoding="utf-8") as f:
-        json.load(f)
-    print("JSON validated successfully.")
+    # Apply changes; the KB is only written if the counts check out
+    print(f"Reading {kb_path}")
+    with KBTransaction(kb_path, "Part B: remove 11 invalid connections, reclassify 3 elements") as tx:
+        with tx.step("removals"):
+            print("\nApplying removals...")
+            n_removed = apply_removals(tx.data, REMOVALS)
+            print(f"Removed {n_removed} connections (expected 11)")
+
+        with tx.step("reclassifications"):
+            print("\nApplying reclassifications...")
+            n_reclass = apply_reclassifications(tx.data, RECLASSIFICATIONS)
+            print(f"Reclassified {n_reclass} elements (expected 3)")
+
+        if n_removed != 11 or n_reclass != 3:
+            print("\nERROR: counts do not match expected values. Aborting write.", file=sys.stderr)
+            sys.exit(1)
+
+        print(f"\nWriting {kb_path}")
     print("\nDone. Original backed up to:", backup_path)
 
 
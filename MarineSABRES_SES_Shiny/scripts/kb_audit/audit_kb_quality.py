@@ -16,6 +16,12 @@ from datetime import date
 from pathlib import Path
 import re
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from kb_lib import OFFSHORE_WIND_KB_PATH, KB_PATH, load_kb, load_rules  # noqa: E402
+from kb_lib.connection_table import MISSING, ConnectionTable  # noqa: E402
+from kb_lib.near_duplicates import duplicate_text_groups  # noqa: E402
+
 # Valid transitions after Rules 17-18 + ExUP exception (23 total)
 VALID_TRANSITIONS = {
     ("drivers", "activities"), ("activities", "pressures"),
@@ -45,8 +51,7 @@ PHYSICAL_IMPACT_PATTERN = re.compile(
 
 def audit_kb(kb_path: str) -> dict:
     """Audit a single KB file and return flags."""
-    with open(kb_path, "r", encoding="utf-8") as f:
-        kb = json.load(f)
+    kb = load_kb(kb_path)
 
     flags = {
         "halpern_only": [],
@@ -59,119 +64,115 @@ def audit_kb(kb_path: str) -> dict:
     }
 
     all_rationales = defaultdict(list)
-    total_connections = 0
-
-    # KB files nest contexts under a "contexts" key
-    contexts = kb.get("contexts", {})
-    if not isinstance(contexts, dict):
-        contexts = {}
-
-    for context_name, context_data in contexts.items():
-        if not isinstance(context_data, dict):
-            continue
-        connections = context_data.get("connections", [])
-        if not isinstance(connections, list):
-            continue
-
-        for idx, conn in enumerate(connections):
-            if not isinstance(conn, dict):
-                continue
-            total_connections += 1
-
-            from_elem = conn.get("from", "")
-            to_elem = conn.get("to", "")
+    markers = load_rules("audit_markers")
+
+    # Per-string facts are computed once per distinct reference, type and
+    # rationale in the interned connection table, not once per connection
+    table = ConnectionTable.from_kb(kb)
+    total_connections = len(table)
+    halpern_ref = ["halpern" in ref.lower() for ref in table.references.strings]
+    type_names = {
+        field: [t.lower() for t in table.vocab[field].strings] for field in ("from_type", "to_type")
+    }
+    rationale_markers = [markers.matched(text.lower()) for text in table.texts.strings]
+    no_markers = markers.matched("")
+
+    ctx_col, index_col = table.column("ctx"), table.column("index")
+    from_type_col, to_type_col = table.column("from_type"), table.column("to_type")
+    rationale_col = table.column("rationale")
+    ref_ptr, ref_ids = table.column("ref_ptr"), table.column("ref_ids")
+
+    for row in table.rows():
+        conn = table.raw.get(row)
+        if conn is None:
+            from_type = type_names["from_type"][from_type_col[row]] if from_type_col[row] != MISSING else ""
+            to_type = type_names["to_type"][to_type_col[row]] if to_type_col[row] != MISSING else ""
+            rid = rationale_col[row]
+            rationale = table.texts[rid] if rid != MISSING else ""
+            found = rationale_markers[rid] if rid != MISSING else no_markers
+            refs = None
+            ids = ref_ids[ref_ptr[row]:ref_ptr[row + 1]]
+            ref_list, ref_count = True, len(ids)
+            all_halpern = all(halpern_ref[i] for i in ids)
+        else:
+            # Row outside the table layout: read the original dict
             from_type = conn.get("from_type", "").lower()
             to_type = conn.get("to_type", "").lower()
             rationale = conn.get("rationale", "")
+            found = markers.matched(rationale.lower())
             refs = conn.get("references", [])
-            confidence = conn.get("confidence", None)
-
-            entry = {
-                "context": context_name,
-                "index": idx,
-                "from": from_elem,
-                "to": to_elem,
-                "from_type": from_type,
-                "to_type": to_type,
-            }
-
-            # Flag 1: Halpern-only references
-            if isinstance(refs, list) and len(refs) > 0:
-                all_halpern = all(
-                    "halpern" in str(r).lower() for r in refs
-                )
-                if all_halpern:
-                    flags["halpern_only"].append(entry)
-
-            # Flag 2: Chain-completion connections
-            rationale_lower = rationale.lower()
-            if any(
-                marker in rationale_lower
-                for marker in [
-                    "connection added to complete",
-                    "added to ensure",
-                    "added to connect",
-                    "chain completion",
-                ]
-            ):
-                flags["chain_completion"].append(entry)
-
-            # Flag 3: Bridge connections and explicitly invalid connections
-            if any(
-                marker in rationale_lower
-                for marker in [
-                    "bridge", "connect disconnected",
-                    "no scientific basis", "no ecological",
-                    "no mechanism", "no causal",
-                ]
-            ):
-                flags["bridge_connections"].append(entry)
-
-            # Flag 5: Single-reference connections
-            if isinstance(refs, list) and len(refs) == 1:
+            ref_list = isinstance(refs, list)
+            ref_count = len(refs) if ref_list else 0
+            all_halpern = ref_list and all("halpern" in str(r).lower() for r in refs)
+
+        entry = {
+            "context": table.contexts[ctx_col[row]],
+            "index": index_col[row],
+            "from": table.value(row, "from", ""),
+            "to": table.value(row, "to", ""),
+            "from_type": from_type,
+            "to_type": to_type,
+        }
+
+        # Flag 1: Halpern-only references
+        if ref_list and ref_count > 0 and all_halpern:
+            flags["halpern_only"].append(entry)
+
+        # Flags 2-3: chain-completion and bridge / explicitly invalid
+        # connections, by rationale marker (kb_lib/rules/audit_markers.json)
+        if "chain_completion" in found:
+            flags["chain_completion"].append(entry)
+        if "bridge" in found:
+            flags["bridge_connections"].append(entry)
+
+        # Flag 5: Single-reference connections
+        if ref_list and ref_count == 1:
+            flags["single_reference"].append(entry)
+        elif isinstance(refs, str) and refs.strip():
+            # Some refs might be strings instead of arrays
+            if ";" not in refs and "," not in refs:
                 flags["single_reference"].append(entry)
-            elif isinstance(refs, str) and refs.strip():
-                # Some refs might be strings instead of arrays
-                if ";" not in refs and "," not in refs:
-                    flags["single_reference"].append(entry)
-
-            # Flag 6: Non-framework transitions
-            if from_type and to_type:
-                if (from_type, to_type) not in VALID_TRANSITIONS:
-                    flags["non_framework_transitions"].append(entry)
-
-            # Collect rationale for duplicate detection
-            if rationale.strip() and len(rationale) > 50:
-                key = rationale.strip()[:200]
-                all_rationales[key].append(entry)
-
-        # Flag 7: Research/monitoring elements typed as activities
-        activities_list = context_data.get("activities", [])
-        if isinstance(activities_list, list):
-            for elem in activities_list:
-                name = elem.get("name", "") if isinstance(elem, dict) else str(elem)
-                if not name:
-                    continue
-                # Must match research/monitoring/surveys
-                if not RESEARCH_PATTERN.search(name):
-                    continue
-                # Skip if element also indicates physical impact
-                if PHYSICAL_IMPACT_PATTERN.search(name):
-                    continue
-                flags["research_elements"].append({
-                    "context": context_name,
-                    "element_name": name,
-                })
 
-    # Flag 4: Duplicate rationale (3+ occurrences with different element pairs)
-    for rationale_prefix, entries in all_rationales.items():
+        # Flag 6: Non-framework transitions
+        if from_type and to_type:
+            if (from_type, to_type) not in VALID_TRANSITIONS:
+                flags["non_framework_transitions"].append(entry)
+
+        # Collect rationale for duplicate detection
+        if rationale.strip() and len(rationale) > 50:
+            all_rationales[rationale.strip()].append(entry)
+
+    # Flag 7: Research/monitoring elements typed as activities
+    for context_name, _, elem in kb.iter_elements(["activities"]):
+        name = elem.get("name", "") if isinstance(elem, dict) else str(elem)
+        if not name:
+            continue
+        # Must match research/monitoring/surveys
+        if not RESEARCH_PATTERN.search(name):
+            continue
+        # Skip if element also indicates physical impact
+        if PHYSICAL_IMPACT_PATTERN.search(name):
+            continue
+        flags["research_elements"].append({
+            "context": context_name,
+            "element_name": name,
+        })
+
+    # Flag 4: Duplicate rationale (3+ occurrences with different element
+    # pairs). Identical texts group directly; templated or copy-pasted
+    # variants are grouped by the MinHash LSH index in kb_lib.near_duplicates
+    for texts, similarity in duplicate_text_groups(all_rationales):
+        entries = [e for text in texts for e in all_rationales[text]]
         if len(entries) >= 3:
             pairs = set((e["from"], e["to"]) for e in entries)
             if len(pairs) > 1:
+                typical = max(texts, key=lambda text: len(all_rationales[text]))
                 flags["duplicate_rationale"].append({
-                    "rationale_prefix": rationale_prefix,
+                    "rationale_prefix": typical[:200],
                     "count": len(entries),
                     "distinct_pairs": len(pairs),
+                    "variants": len(texts),
+                    "min_similarity": similarity,
                     "connections": entries[:5],
                 })
 
@@ -225,7 +226,8 @@ def write_markdown(report: dict, output_path: str):
         for item in flag_list[:20]:
             if "rationale_prefix" in item:
                 lines.append(
-                    f"- **{item['count']}x** ({item['distinct_pairs']} pairs): "
+                    f"- **{item['count']}x** ({item['distinct_pairs']} pairs, "
+                    f"{item['variants']} variants): "
                     f'"{item["rationale_prefix"][:80]}..."'
                 )
             elif "element_name" in item:
@@ -246,14 +248,10 @@ def write_markdown(report: dict, output_path: str):
 
 
 def main():
-    project_root = Path(__file__).parent.parent.parent  # audit_kb_quality.py -> kb_audit/ -> scripts/ -> project root
     output_dir = Path(__file__).parent / "output"
     output_dir.mkdir(exist_ok=True)
 
-    kb_files = [
-        project_root / "data" / "ses_knowledge_db.json",
-        project_root / "data" / "ses_knowledge_db_offshore_wind.json",
-    ]
+    kb_files = [KB_PATH, OFFSHORE_WIND_KB_PATH]
 
     for kb_path in kb_files:
         if not kb_path.exists():
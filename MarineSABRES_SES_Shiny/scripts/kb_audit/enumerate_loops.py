@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Enumerate the feedback loops of every KB context.
+
+Finds all simple cycles (up to --max-length links) in each context's
+connection graph with kb_lib.loops and classifies them as Reinforcing or
+Balancing from the connection polarities, the way the Shiny loop analysis
+(functions/network_analysis.R) does. Loops are streamed to a JSONL file
+as they are found, one object per loop; a per-context summary is printed.
+
+Does NOT modify the KB files.
+
+Usage:
+    micromamba run -n shiny python scripts/kb_audit/enumerate_loops.py
+    micromamba run -n shiny python scripts/kb_audit/enumerate_loops.py --max-length 6 --context baltic_sea
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from kb_lib import KB_PATH, OFFSHORE_WIND_KB_PATH, load_kb  # noqa: E402
+from kb_lib.loops import BALANCING, REINFORCING, UNDETERMINED, iter_loops  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Enumerate feedback loops in the SES knowledge bases.")
+    parser.add_argument(
+        "kb_files", nargs="*", type=Path,
+        help="KB files (default: main and offshore wind KBs)",
+    )
+    parser.add_argument(
+        "--max-length", type=int, default=10,
+        help="longest loop to report, in links (default: 10, as in find_all_cycles; 0 = no bound)",
+    )
+    parser.add_argument(
+        "--context", action="append", dest="contexts",
+        help="only this context (repeatable)",
+    )
+    parser.add_argument(
+        "--output", type=Path, default=Path(__file__).parent / "output" / "kb_loops.jsonl",
+        help="JSONL file to write the loops to",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    kb_files = args.kb_files or [KB_PATH, OFFSHORE_WIND_KB_PATH]
+    max_length = args.max_length or None
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+    total = Counter()
+    with open(args.output, "w", encoding="utf-8") as out:
+        for kb_path in kb_files:
+            kb = load_kb(kb_path)
+            per_context = defaultdict(Counter)
+            longest = defaultdict(int)
+            for loop in iter_loops(kb, max_length, args.contexts):
+                loop = {"kb_file": kb_path.name, **loop}
+                out.write(json.dumps(loop, ensure_ascii=False) + "\n")
+                per_context[loop["context"]][loop["polarity"]] += 1
+                longest[loop["context"]] = max(longest[loop["context"]], loop["length"])
+
+            print("=" * 70)
+            print(f"{kb_path.name} (max length: {max_length or 'unbounded'})")
+            print("=" * 70)
+            for ctx_name, _ in kb.iter_contexts():
+                if args.contexts and ctx_name not in args.contexts:
+                    continue
+                counts = per_context.get(ctx_name, Counter())
+                n = sum(counts.values())
+                detail = f", longest {longest[ctx_name]}" if n else ""
+                extra = f", {counts[UNDETERMINED]} undetermined" if counts[UNDETERMINED] else ""
+                print(f"  {ctx_name:<40} {n:>5} loop(s): {counts[REINFORCING]} R, "
+                      f"{counts[BALANCING]} B{extra}{detail}")
+                total.update(counts)
+            print()
+
+    print(f"Total: {sum(total.values())} loop(s) — {total[REINFORCING]} reinforcing, "
+          f"{total[BALANCING]} balancing, {total[UNDETERMINED]} undetermined "
+          f"({time.perf_counter() - started:.2f}s)")
+    print(f"Loops: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Find near-duplicate element names across the KB files and SES templates.
+
+Clusters element names whose character-trigram Jaccard similarity is at
+or above --threshold, using MinHash LSH (kb_lib.near_duplicates) so that
+only likely matches are compared. Covers the main and offshore-wind KBs
+and every data/*_SES_Template.json.
+
+Clusters are merge *candidates* for review, e.g. before adding entries to
+fix_kb_classifications.build_operations(); nothing is merged here.
+
+Writes kb_near_duplicates.json and kb_near_duplicates.md to
+kb_audit/output/. Does NOT modify the KB files.
+
+Usage:
+    micromamba run -n shiny python scripts/kb_audit/find_near_duplicates.py
+    micromamba run -n shiny python scripts/kb_audit/find_near_duplicates.py --threshold 0.7 --no-templates
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from kb_lib import KB_PATH, OFFSHORE_WIND_KB_PATH, load_kb  # noqa: E402
+from kb_lib.near_duplicates import (  # noqa: E402
+    DEFAULT_THRESHOLD,
+    find_near_duplicates,
+    kb_occurrences,
+    template_occurrences,
+    template_paths,
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Find near-duplicate KB element names.")
+    parser.add_argument(
+        "kb_files", nargs="*", type=Path,
+        help="KB files to scan (default: main and offshore wind KBs)",
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help=f"minimum trigram Jaccard similarity (default: {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument("--no-templates", action="store_true", help="skip data/*_SES_Template.json")
+    parser.add_argument(
+        "--output-dir", type=Path, default=Path(__file__).parent / "output",
+        help="directory for kb_near_duplicates.json / .md",
+    )
+    return parser.parse_args()
+
+
+def describe(occurrences):
+    sources = sorted({f"{o['context']} ({o['category']})" for o in occurrences})
+    shown = ", ".join(sources[:3])
+    return shown + (f", +{len(sources) - 3} more" if len(sources) > 3 else "")
+
+
+def write_markdown(clusters, stats, threshold, path, run_date):
+    lines = [
+        "# Near-Duplicate Element Names",
+        "",
+        f"**Date**: {run_date}",
+        f"**Threshold**: {threshold} (trigram Jaccard)",
+        f"**Names scanned**: {stats['names']}; candidate pairs {stats['candidate_pairs']}, "
+        f"similar pairs {stats['similar_pairs']}, clusters {len(clusters)}",
+        "",
+    ]
+    for n, cluster in enumerate(clusters, 1):
+        flag = " — **cross-category**" if len(cluster["categories"]) > 1 else ""
+        lines.append(f"## {n}. min similarity {cluster['min_similarity']}{flag}")
+        lines.append("")
+        for name, occurrences in cluster["names"].items():
+            lines.append(f"- `{name}` — {len(occurrences)}x: {describe(occurrences)}")
+        lines.append("")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def main():
+    args = parse_args()
+    kb_files = args.kb_files or [KB_PATH, OFFSHORE_WIND_KB_PATH]
+
+    occurrences = []
+    for kb_path in kb_files:
+        occurrences.extend(kb_occurrences(load_kb(kb_path), kb_path.name))
+    templates = [] if args.no_templates else template_paths()
+    for path in templates:
+        occurrences.extend(template_occurrences(path))
+
+    started = time.perf_counter()
+    clusters, stats = find_near_duplicates(occurrences, args.threshold)
+    elapsed = time.perf_counter() - started
+
+    print("=" * 70)
+    print(f"Near-duplicate element names ({len(kb_files)} KB file(s), {len(templates)} template(s))")
+    print("=" * 70)
+    for cluster in clusters[:20]:
+        names = " | ".join(cluster["names"])
+        print(f"  [{cluster['min_similarity']:.2f}] {names}")
+    if len(clusters) > 20:
+        print(f"  ... and {len(clusters) - 20} more")
+    cross = sum(1 for c in clusters if len(c["categories"]) > 1)
+    print(f"\n{stats['names']} names, {stats['candidate_pairs']} LSH candidate pairs, "
+          f"{stats['similar_pairs']} similar pairs -> {len(clusters)} clusters "
+          f"({cross} cross-category) in {elapsed:.2f}s")
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    json_out = args.output_dir / "kb_near_duplicates.json"
+    md_out = args.output_dir / "kb_near_duplicates.md"
+    run_date = date.today().isoformat()
+    with open(json_out, "w", encoding="utf-8") as f:
+        json.dump(
+            {"run_date": run_date, "threshold": args.threshold, "stats": stats, "clusters": clusters},
+            f, indent=2, ensure_ascii=False,
+        )
+    write_markdown(clusters, stats, args.threshold, md_out, run_date)
+    print(f"Reports: {json_out}, {md_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,14 @@
 Reduce orphan elements in ses_knowledge_db.json to <=15% per context.
 For each orphan, adds a scientifically reasonable connection based on DAPSI(W)R(M) flow.
 """
-import json
-import os
+import sys
+from pathlib import Path
 
-DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'ses_knowledge_db.json')
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from kb_lib import KB_PATH, KBTransaction  # noqa: E402
+
+DB_PATH = KB_PATH
 
 # Category key -> (flow direction, target category key, default polarity)
 # Valid flows: D→A, A→P, P→S, S→I, I→W, W→D, R→P, R→A
@@ -103,33 +107,33 @@ def fix_orphans_in_context(context):
 
 
 def main():
-    with open(DB_PATH, 'r', encoding='utf-8') as f:
-        db = json.load(f)
-
-    print(f"{'Context':<35} {'Before':>10} {'Total':>8} {'%':>6} {'Added':>6} {'After':>8} {'%':>6}")
-    print('-' * 85)
+    with KBTransaction(DB_PATH, 'Add DAPSI(W)R(M) flow connections for orphan elements') as tx:
+        db = tx.data
 
-    for ctx_id, context in db['contexts'].items():
-        # Before stats
-        orphans_before, total = find_orphans(context)
-        orphan_count_before = sum(len(v) for v in orphans_before.values())
-        pct_before = (orphan_count_before / total * 100) if total > 0 else 0
+        print(f"{'Context':<35} {'Before':>10} {'Total':>8} {'%':>6} {'Added':>6} {'After':>8} {'%':>6}")
+        print('-' * 85)
 
-        # Fix
-        _, _, added = fix_orphans_in_context(context)
+        for ctx_id, context in db['contexts'].items():
+            # Before stats
+            orphans_before, total = find_orphans(context)
+            orphan_count_before = sum(len(v) for v in orphans_before.values())
+            pct_before = (orphan_count_before / total * 100) if total > 0 else 0
 
-        # After stats
-        orphans_after, _ = find_orphans(context)
-        orphan_count_after = sum(len(v) for v in orphans_after.values())
-        pct_after = (orphan_count_after / total * 100) if total > 0 else 0
+            # Fix
+            _, _, added = fix_orphans_in_context(context)
 
-        flag = ' !!!' if pct_after > 15 else ''
-        print(f"{ctx_id:<35} {orphan_count_before:>10} {total:>8} {pct_before:>5.1f}% {added:>6} {orphan_count_after:>8} {pct_after:>5.1f}%{flag}")
+            # After stats
+            orphans_after, _ = find_orphans(context)
+            orphan_count_after = sum(len(v) for v in orphans_after.values())
+            pct_after = (orphan_count_after / total * 100) if total > 0 else 0
 
-    with open(DB_PATH, 'w', encoding='utf-8') as f:
-        json.dump(db, f, indent=2, ensure_ascii=False)
+            flag = ' !!!' if pct_after > 15 else ''
+            print(f"{ctx_id:<35} {orphan_count_before:>10} {total:>8} {pct_before:>5.1f}% {added:>6} {orphan_count_after:>8} {pct_after:>5.1f}%{flag}")
 
-    print(f"\nSaved to {DB_PATH}")
+    if tx.committed:
+        print(f"\nSaved to {DB_PATH} ({len(tx.patch)} change(s))")
+    else:
+        print(f"\nNo changes; {DB_PATH} left untouched")
 
 
 if __name__ == '__main__':
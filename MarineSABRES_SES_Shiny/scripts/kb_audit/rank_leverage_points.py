@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Rank leverage points in every KB context by network centrality.
+
+Computes per-element degree, strength (links weighted by strength and
+confidence), betweenness, PageRank and a composite leverage score for each
+context with kb_lib.centrality, and exports them as one CSV table
+(kb_audit/output/kb_centrality.csv) that R can read with read.csv().
+
+Metrics are cached per context content hash in
+kb_audit/output/.kb_centrality_cache.json; a rerun only recomputes
+contexts that changed. Use --no-cache for a full run.
+
+Does NOT modify the KB files.
+
+Usage:
+    micromamba run -n shiny python scripts/kb_audit/rank_leverage_points.py
+    micromamba run -n shiny python scripts/kb_audit/rank_leverage_points.py --top 3
+"""
+
+import argparse
+import csv
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from kb_lib import KB_PATH, OFFSHORE_WIND_KB_PATH, load_kb  # noqa: E402
+from kb_lib.centrality import (  # noqa: E402
+    METRICS,
+    load_metrics_cache,
+    metrics_for_kb,
+    save_metrics_cache,
+)
+
+COLUMNS = ["kb_file", "context", "rank", "element", "category", *METRICS]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Rank leverage points in the SES knowledge bases.")
+    parser.add_argument(
+        "kb_files", nargs="*", type=Path,
+        help="KB files (default: main and offshore wind KBs)",
+    )
+    parser.add_argument(
+        "--top", type=int, default=5,
+        help="leverage points to print per context (default: 5; the CSV has every element)",
+    )
+    parser.add_argument(
+        "--output-dir", type=Path, default=Path(__file__).parent / "output",
+        help="directory for kb_centrality.csv and the cache",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="recompute every context and leave the cache untouched",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    kb_files = args.kb_files or [KB_PATH, OFFSHORE_WIND_KB_PATH]
+    cache_path = args.output_dir / ".kb_centrality_cache.json"
+    cache = {} if args.no_cache else load_metrics_cache(cache_path)
+
+    started = time.perf_counter()
+    table = []
+    recomputed = 0
+    for kb_path in kb_files:
+        kb = load_kb(kb_path)
+        results, entry, n = metrics_for_kb(kb, cache.get(kb_path.name))
+        cache[kb_path.name] = entry
+        recomputed += n
+
+        print("=" * 70)
+        print(f"{kb_path.name}: {len(results)} contexts ({n} recomputed)")
+        print("=" * 70)
+        for ctx_name, rows in results.items():
+            top = ", ".join(f"{r['element']} ({r['leverage_score']:.2f})" for r in rows[:args.top])
+            print(f"  {ctx_name}: {top or '-'}")
+            table.extend({"kb_file": kb_path.name, "context": ctx_name, **row} for row in rows)
+        print()
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    csv_out = args.output_dir / "kb_centrality.csv"
+    with open(csv_out, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(table)
+    if not args.no_cache:
+        save_metrics_cache(cache_path, cache)
+
+    print(f"Ranked {len(table)} elements ({recomputed} context(s) recomputed) "
+          f"in {time.perf_counter() - started:.2f}s")
+    print(f"Table: {csv_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Run every KB validation check over all knowledge base files in one pass.
+
+Validates the main, offshore-wind and WP5 mechanism KBs with the checks
+registered in kb_lib.checks (structural checks, audit flags, per-context
+graph checks and WP5 mechanism checks). Each file is traversed once; the
+per-context graph checks run in a process pool.
+
+Results are cached per context in kb_audit/output/.kb_validation_cache.json;
+a rerun only revalidates contexts whose content changed (plus cross-context
+checks touched by the change). Use --no-cache for a full run.
+
+Writes a combined JSON report and Markdown summary to kb_audit/output/.
+Does NOT modify the KB files. Exits with status 1 if any FAIL is found.
+
+Usage:
+    micromamba run -n shiny python scripts/kb_audit/run_kb_checks.py
+    micromamba run -n shiny python scripts/kb_audit/run_kb_checks.py --jobs 1 --check connection_flows
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from kb_lib import (  # noqa: E402
+    KB_PATH,
+    OFFSHORE_WIND_KB_PATH,
+    WP5_KB_PATH,
+    registered_checks,
+    validate_kbs,
+    write_markdown,
+)
+
+
+def parse_args():
+    check_names = [cls.name for cls in registered_checks()]
+    parser = argparse.ArgumentParser(description="Validate the SES knowledge base files.")
+    parser.add_argument(
+        "kb_files", nargs="*", type=Path,
+        help="KB files to validate (default: main, offshore wind and WP5 KBs)",
+    )
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=None,
+        help="worker processes for graph checks (default: CPU count; 1 = no pool)",
+    )
+    parser.add_argument(
+        "--check", action="append", choices=check_names, dest="checks",
+        help="run only this check (repeatable)",
+    )
+    parser.add_argument(
+        "--output-dir", type=Path, default=Path(__file__).parent / "output",
+        help="directory for kb_validation.json / kb_validation.md",
+    )
+    parser.add_argument(
+        "--cache", type=Path, default=None,
+        help="incremental validation cache (default: <output-dir>/.kb_validation_cache.json)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="validate everything from scratch and leave the cache untouched",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    kb_files = args.kb_files or [KB_PATH, OFFSHORE_WIND_KB_PATH, WP5_KB_PATH]
+
+    missing = [p for p in kb_files if not p.exists()]
+    for path in missing:
+        print(f"WARNING: {path} not found, skipping")
+    kb_files = [p for p in kb_files if p.exists()]
+    if not kb_files:
+        print("ERROR: no KB files to validate")
+        sys.exit(1)
+
+    check_classes = registered_checks()
+    if args.checks:
+        check_classes = [cls for cls in check_classes if cls.name in args.checks]
+
+    cache_path = None
+    if not args.no_cache:
+        cache_path = args.cache or args.output_dir / ".kb_validation_cache.json"
+
+    started = time.perf_counter()
+    reports = validate_kbs(kb_files, check_classes, jobs=args.jobs, cache_path=cache_path)
+    elapsed = time.perf_counter() - started
+
+    for report in reports:
+        print("=" * 70)
+        size = ", ".join(
+            f"{report[k]} {k}" for k in ("contexts", "connections", "demonstration_areas", "mechanisms")
+            if k in report
+        )
+        print(f"{report['kb_file']} (version {report['version']}; {size})")
+        print("=" * 70)
+        for result in report["checks"].values():
+            print(f"  [{result['status']:<4}] {result['title']}: {len(result['issues'])} issue(s)")
+        c = report["issue_counts"]
+        done = report["revalidated"]
+        if cache_path is not None:
+            rerun = ", ".join(done["global_checks"]) or "none"
+            print(f"  Revalidated contexts: {done['contexts']}; rerun global checks: {rerun}")
+        print(f"  RESULT: {report['status']} — {c['FAIL']} FAIL, {c['WARN']} WARN, {c['INFO']} INFO")
+        print()
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    json_out = args.output_dir / "kb_validation.json"
+    md_out = args.output_dir / "kb_validation.md"
+    run_date = date.today().isoformat()
+
+    for report in reports:
+        del report["revalidated"]
+    with open(json_out, "w", encoding="utf-8") as f:
+        json.dump({"run_date": run_date, "reports": reports}, f, indent=2, ensure_ascii=False)
+    write_markdown(reports, md_out, run_date)
+
+    print(f"Validated {len(reports)} file(s) in {elapsed:.2f}s")
+    print(f"Reports: {json_out}, {md_out}")
+
+    sys.exit(1 if any(r["status"] == "FAIL" for r in reports) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -20,21 +20,21 @@ import sys
 from collections import defaultdict
 from pathlib import Path
 
-
-CHAIN_COMPLETION_MARKERS = [
-    "connection added to complete",
-    "added to ensure",
-    "added to connect",
-    "chain completion",
-]
-
-# Must match audit_kb_quality.py's bridge marker set exactly.
-# If this diverges, the audit and triage will disagree.
-BRIDGE_MARKERS = [
-    "bridge", "connect disconnected",
-    "no scientific basis", "no ecological",
-    "no mechanism", "no causal",
-]
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from kb_lib import KB_PATH, load_kb, load_rules  # noqa: E402
+from kb_lib.graph import (  # noqa: E402
+    Reachability,
+    adjacency,
+    graph_nodes,
+    split_count,
+    strong_bridges,
+    strongly_connected_components,
+)
+
+# Chain-completion and bridge markers are shared with audit_kb_quality.py
+# through kb_lib/rules/audit_markers.json, so the audit and triage agree.
+MARKERS = load_rules("audit_markers")
 
 # Connections that MUST be absent (Part B removals). If any are present,
 # the script exits — Part B has not been applied yet.
@@ -62,88 +62,53 @@ def preflight_check(kb: dict) -> None:
 
 def is_chain_completion(conn: dict) -> bool:
     """True if rationale contains a chain-completion marker."""
-    rationale = conn.get("rationale", "").lower()
-    return any(marker in rationale for marker in CHAIN_COMPLETION_MARKERS)
+    return "chain_completion" in MARKERS.matched(conn.get("rationale", "").lower())
 
 
 def build_organic_graph(connections: list) -> dict:
     """Build adjacency dict from non-chain-completion connections."""
-    graph = defaultdict(set)
-    for conn in connections:
-        if is_chain_completion(conn):
-            continue
-        f = conn.get("from", "")
-        t = conn.get("to", "")
-        if f and t:
-            graph[f].add(t)
-    return graph
-
-
-def has_path(graph: dict, start: str, end: str, max_depth: int = 10) -> bool:
-    """BFS check if a path exists from start to end in the organic graph."""
-    if start == end:
-        return True
-    visited = {start}
-    queue = [(start, 0)]
-    while queue:
-        node, depth = queue.pop(0)
-        if depth >= max_depth:
-            continue
-        for neighbor in graph.get(node, set()):
-            if neighbor == end:
-                return True
-            if neighbor not in visited:
-                visited.add(neighbor)
-                queue.append((neighbor, depth + 1))
-    return False
+    return adjacency(
+        (conn.get("from", ""), conn.get("to", ""))
+        for conn in connections if not is_chain_completion(conn)
+    )
 
 
-def is_bridge(conn: dict) -> bool:
-    """True if rationale contains a bridge marker."""
-    rationale = conn.get("rationale", "").lower()
-    return any(marker in rationale for marker in BRIDGE_MARKERS)
+# Longest organic path (in connections) accepted as an alternative route
+MAX_PATH_DEPTH = 10
 
 
-def count_sccs(connections: list, exclude_conn: tuple = None) -> int:
-    """Count strongly-connected components in the directed graph built
-    from connections. Optionally exclude one connection (by from, to tuple)
-    to measure impact of removal.
-    """
-    try:
-        import networkx as nx
-    except ImportError:
-        print("ERROR: networkx not installed. Run:", file=sys.stderr)
-        print("  micromamba install -n shiny networkx", file=sys.stderr)
-        sys.exit(1)
-
-    G = nx.DiGraph()
-    for c in connections:
-        f = c.get("from", "")
-        t = c.get("to", "")
-        if not f or not t:
-            continue
-        if exclude_conn is not None and (f, t) == exclude_conn:
-            continue
-        G.add_edge(f, t)
-    if G.number_of_nodes() == 0:
-        return 0
-    return nx.number_strongly_connected_components(G)
+def is_bridge(conn: dict) -> bool:
+    """True if rationale contains a bridge marker."""
+    return "bridge" in MARKERS.matched(conn.get("rationale", "").lower())
 
 
 def triage_bridges_in_context(ctx_name: str, ctx: dict) -> list:
-    """Classify bridge connections in a single context using SCC criterion."""
+    """Classify bridge connections in a single context using SCC criterion.
+
+    A bridge is LOAD_BEARING if removing it increases the number of
+    strongly-connected components. All such edges come from one
+    strong-bridge computation per context rather than an SCC recount per
+    bridge; the post-removal count is only worked out for the (few)
+    load-bearing ones, on their own component.
+    """
     connections = ctx.get("connections", [])
-    decisions = []
+    bridge_idx = [idx for idx, conn in enumerate(connections) if is_bridge(conn)]
+    if not bridge_idx:
+        return []
 
-    base_scc_count = count_sccs(connections)
+    graph = adjacency((c.get("from", ""), c.get("to", "")) for c in connections)
+    components = strongly_connected_components(graph_nodes(graph), graph)
+    component_of = {node: comp for comp in components for node in comp}
+    critical = strong_bridges(graph, components)
+    base_scc_count = len(components)
 
-    for idx, conn in enumerate(connections):
-        if not is_bridge(conn):
-            continue
+    decisions = []
+    for idx in bridge_idx:
+        conn = connections[idx]
         f = conn.get("from", "")
         t = conn.get("to", "")
-        new_scc_count = count_sccs(connections, exclude_conn=(f, t))
-        if new_scc_count > base_scc_count:
+        if (f, t) in critical:
+            new_scc_count = base_scc_count - 1 + split_count(component_of[f], graph, (f, t))
             verdict = "LOAD_BEARING"
             reason = f"removal increases SCC count ({base_scc_count} -> {new_scc_count})"
         else:
@@ -188,9 +153,18 @@ def improve_bridge_rationale(conn: dict) -> str:
 
 
 def triage_context(ctx_name: str, ctx: dict) -> list:
-    """Classify chain-completion connections in a single context."""
+    """Classify chain-completion connections in a single context.
+
+    Organic reachability (paths of at most MAX_PATH_DEPTH connections) is
+    precomputed once as per-element bitsets, so each chain-completion is
+    decided with a bit test.
+    """
     connections = ctx.get("connections", [])
-    organic_graph = build_organic_graph(connections)
+    organic = [c for c in connections if not is_chain_completion(c)]
+    organic_types = {
+        (c.get("from_type", "").lower(), c.get("to_type", "").lower()) for c in organic
+    }
+    reach = Reachability(build_organic_graph(connections), max_depth=MAX_PATH_DEPTH)
     decisions = []
 
     for idx, conn in enumerate(connections):
@@ -201,14 +175,10 @@ def triage_context(ctx_name: str, ctx: dict) -> list:
         # Edge case: if no organic connections of the same transition type exist,
         # cannot verify redundancy — treat as LOAD_BEARING
         transition_type = (conn.get("from_type", "").lower(), conn.get("to_type", "").lower())
-        has_organic_same_type = any(
-            (c.get("from_type", "").lower(), c.get("to_type", "").lower()) == transition_type
-            for c in connections if not is_chain_completion(c)
-        )
-        if not has_organic_same_type:
+        if transition_type not in organic_types:
             verdict = "LOAD_BEARING"
             reason = "no organic connections of same transition type to compare against"
-        elif has_path(organic_graph, f, t):
+        elif reach.reaches(f, t):
             verdict = "REDUNDANT"
             reason = "alternative organic path exists"
         else:
@@ -289,13 +259,10 @@ def write_markdown_report(decisions: list, output_path: Path) -> None:
 
 
 def main():
-    project_root = Path(__file__).parent.parent.parent
-    kb_path = project_root / "data" / "ses_knowledge_db.json"
     output_dir = Path(__file__).parent / "output"
     output_dir.mkdir(exist_ok=True)
 
-    with open(kb_path, "r", encoding="utf-8") as f:
-        kb = json.load(f)
+    kb = load_kb(KB_PATH).data
 
     preflight_check(kb)
 
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Incrementally rebuild the generated data/ artifacts (kb_lib.build_graph).
+
+  status  show each target's state and why it is stale (default: all targets)
+  build   rebuild stale targets and their stale dependencies, in parallel
+  adopt   record the current outputs as built, e.g. to take the committed
+          offshore-wind and WP5 KBs (which may carry manual edits) as the
+          baseline
+
+Targets: offshore_wind_kb, wp5_mechanisms_kb, element_classifier_training,
+compiled_kbs, reference_registries. An output that changed since it was
+built (a hand edit) is never overwritten without --force.
+
+Usage:
+    micromamba run -n shiny python scripts/kb_build.py status
+    micromamba run -n shiny python scripts/kb_build.py build
+    micromamba run -n shiny python scripts/kb_build.py build compiled_kbs --jobs 2
+    micromamba run -n shiny python scripts/kb_build.py adopt offshore_wind_kb wp5_mechanisms_kb
+    micromamba run -n shiny python scripts/kb_build.py build wp5_mechanisms_kb --force
+"""
+
+import argparse
+import sys
+import time
+
+from kb_lib.build_graph import BLOCKED, EDITED, OK, STALE, UNTRACKED, BuildGraph
+
+MARKERS = {OK: "OK", STALE: "STALE", EDITED: "EDITED", UNTRACKED: "UNTRACKED", BLOCKED: "BLOCKED"}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Rebuild stale generated KB artifacts.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    status = sub.add_parser("status", help="show target states")
+    status.add_argument("targets", nargs="*", help="targets (default: all)")
+
+    build = sub.add_parser("build", help="rebuild stale targets")
+    build.add_argument("targets", nargs="*", help="targets (default: all)")
+    build.add_argument("--force", action="store_true", help="also overwrite edited / untracked outputs")
+    build.add_argument("--jobs", "-j", type=int, default=None, help="parallel builds (default: CPU count)")
+
+    adopt = sub.add_parser("adopt", help="record current outputs as built")
+    adopt.add_argument("targets", nargs="*", help="targets (default: all)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    try:
+        graph = BuildGraph()
+        if args.targets:
+            graph.closure(args.targets)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(2)
+
+    if args.command == "status":
+        plan = graph.plan(args.targets)
+        for name, status, reasons in plan:
+            deps = f" (after {', '.join(graph.deps[name])})" if graph.deps[name] else ""
+            print(f"  [{MARKERS[status]:<9}] {name}{deps}")
+            for reason in reasons:
+                print(f"               {reason}")
+        sys.exit(0 if all(status == OK for _, status, _ in plan) else 1)
+
+    elif args.command == "adopt":
+        adopted = graph.adopt(args.targets)
+        skipped = [n for n in args.targets or graph.order if n not in adopted]
+        print(f"Adopted {len(adopted)} target(s): {', '.join(adopted) or 'none'}")
+        if skipped:
+            print(f"Not adopted (outputs missing): {', '.join(skipped)}")
+
+    else:
+        started = time.perf_counter()
+        results = graph.build(args.targets, force=args.force, jobs=args.jobs)
+        counts = {}
+        for result in results.values():
+            counts[result] = counts.get(result, 0) + 1
+        summary = ", ".join(f"{n} {result}" for result, n in sorted(counts.items()))
+        print(f"\n{summary} in {time.perf_counter() - started:.1f}s")
+        sys.exit(1 if counts.get("failed") or counts.get("refused") else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Shared helpers for the knowledge base maintenance scripts.
+
+Scripts in scripts/ can ``import kb_lib`` directly; scripts in
+scripts/kb_audit/ put the parent directory on sys.path first.
+"""
+
+from .knowledge_base import (
+    PROJECT_ROOT,
+    DATA_DIR,
+    KB_PATH,
+    OFFSHORE_WIND_KB_PATH,
+    WP5_KB_PATH,
+    CATEGORIES,
+    KnowledgeBase,
+    element_name,
+    load_kb,
+)
+from .keyword_matcher import KeywordMatcher, load_rules
+from .corrections import (
+    CorrectionError,
+    EndpointIndex,
+    apply_corrections,
+    format_diff,
+    resolve_corrections,
+)
+from .transaction import (
+    ConcurrentModificationError,
+    KBTransaction,
+    apply_patch,
+    json_diff,
+    write_json_atomic,
+)
+from .refactor import RefactorError, apply_refactor, plan_refactor
+from .loops import iter_loops, loop_polarity, simple_cycles
+from .centrality import SparseGraph, context_metrics, metrics_for_kb
+from .multiplex import MultiplexGraph
+from .near_duplicates import find_near_duplicates
+from .references import ReferenceRegistry, load_registry, parse_citation
+from .bibtex import BibTeXError, iter_bibtex, load_bibtex
+from .paper_classifier import classify_papers
+from .build_graph import BuildGraph, BuildTarget
+from .connection_table import ConnectionTable, StringPool
+from .compiled import ArtifactError, CompiledKB, compile_kb, load_compiled
+from .shards import ShardedKB, join_kb, open_shards, split_kb
+from .validation import (
+    Check,
+    GraphCheck,
+    register_check,
+    registered_checks,
+    validate_kbs,
+    write_markdown,
+)
+from . import checks  # noqa: F401  (registers the default checks)
+
+__all__ = [
+    "PROJECT_ROOT",
+    "DATA_DIR",
+    "KB_PATH",
+    "OFFSHORE_WIND_KB_PATH",
+    "WP5_KB_PATH",
+    "CATEGORIES",
+    "KnowledgeBase",
+    "element_name",
+    "load_kb",
+    "KeywordMatcher",
+    "load_rules",
+    "CorrectionError",
+    "EndpointIndex",
+    "apply_corrections",
+    "format_diff",
+    "resolve_corrections",
+    "ConcurrentModificationError",
+    "KBTransaction",
+    "apply_patch",
+    "json_diff",
+    "write_json_atomic",
+    "RefactorError",
+    "apply_refactor",
+    "plan_refactor",
+    "iter_loops",
+    "loop_polarity",
+    "simple_cycles",
+    "SparseGraph",
+    "context_metrics",
+    "metrics_for_kb",
+    "MultiplexGraph",
+    "find_near_duplicates",
+    "ReferenceRegistry",
+    "load_registry",
+    "parse_citation",
+    "BibTeXError",
+    "iter_bibtex",
+    "load_bibtex",
+    "classify_papers",
+    "BuildGraph",
+    "BuildTarget",
+    "ConnectionTable",
+    "StringPool",
+    "ArtifactError",
+    "CompiledKB",
+    "compile_kb",
+    "load_compiled",
+    "ShardedKB",
+    "join_kb",
+    "open_shards",
+    "split_kb",
+    "Check",
+    "GraphCheck",
+    "register_check",
+    "registered_checks",
+    "validate_kbs",
+    "write_markdown",
+]
@@ -0,0 +1,269 @@
+"""
+Streaming BibTeX reader for the literature-driven KB builders.
+
+iter_bibtex() reads a text stream in chunks and yields one entry at a time,
+so a bibliography is never held in memory as a whole. The tokenizer tracks
+brace depth, so field values may contain nested braces ("{{Offshore} wind
+{farms}}") and commas, newlines or "@" inside braces do not end an entry.
+It understands:
+
+  @string{name = "value"}    macros, usable in later values and with #
+  @comment{...} / @preamble  skipped, as is any text between entries
+                             (an "@" not followed by a type and { or ( too)
+  field = {..} / ".." / 2021 / name / a # b   values and concatenation
+  jan .. dec                 the standard month macros
+
+Entries are dicts ``{"type", "key", "fields"}`` with lowercase type and
+field names; values are kept as written minus the outer delimiters (use
+plain_text() to drop protective braces and collapse whitespace).
+
+load_bibtex() caches the parsed entries by the SHA-256 of the file, so
+rebuilding from an unchanged bibliography skips parsing entirely.
+"""
+
+import json
+import re
+from pathlib import Path
+
+from .knowledge_base import DATA_DIR
+from .transaction import write_json_atomic
+from .validation_cache import file_digest
+
+CACHE_VERSION = 1
+CACHE_DIR = DATA_DIR / "cache" / "bibtex"
+CHUNK_SIZE = 1 << 16
+
+MONTHS = {
+    name: str(i) for i, name in enumerate(
+        ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], 1
+    )
+}
+
+_SPACE = re.compile(r"\s*")
+_IDENTIFIER = re.compile(r'[^\s={}(),#"]*')
+_ENTRY_TYPE = re.compile(r"\w*")
+_DELIMITERS = {closer: re.compile("[{}%s]" % re.escape(closer)) for closer in ("}", ")", '"')}
+
+
+class BibTeXError(ValueError):
+    """Malformed BibTeX; the message names the line."""
+
+
+class _Reader:
+    """Character stream with one character of lookahead and line counting."""
+
+    def __init__(self, stream, chunk_size=CHUNK_SIZE):
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self.line = 1
+
+    def peek(self):
+        if self._pos >= len(self._buf):
+            self._buf = self._stream.read(self._chunk_size)
+            self._pos = 0
+            if not self._buf:
+                return ""
+        return self._buf[self._pos]
+
+    def next(self):
+        ch = self.peek()
+        if ch:
+            self._pos += 1
+            if ch == "\n":
+                self.line += 1
+        return ch
+
+    def _run(self, pattern):
+        """Consume and return the longest run matching ``pattern`` (across chunks)."""
+        pieces = []
+        while self.peek():
+            m = pattern.match(self._buf, self._pos)
+            end = m.end()
+            pieces.append(m.group())
+            self.line += m.group().count("\n")
+            self._pos = end
+            if end < len(self._buf):
+                break
+        return "".join(pieces)
+
+    def skip_space(self):
+        self._run(_SPACE)
+
+    def error(self, message):
+        return BibTeXError(f"line {self.line}: {message}")
+
+    def expect(self, chars):
+        self.skip_space()
+        ch = self.next()
+        if ch not in chars:
+            raise self.error(f"expected {' or '.join(repr(c) for c in chars)}, got {ch or 'end of file'!r}")
+        return ch
+
+    def identifier(self):
+        self.skip_space()
+        return self._run(_IDENTIFIER)
+
+    def entry_type(self):
+        """The word after "@" (an entry type if it starts with a letter)."""
+        self.skip_space()
+        return self._run(_ENTRY_TYPE)
+
+    def skip_to(self, target):
+        """Advance past the next ``target`` character; False at end of file."""
+        while self.peek():
+            found = self._buf.find(target, self._pos)
+            end = len(self._buf) if found < 0 else found + 1
+            self.line += self._buf.count("\n", self._pos, end)
+            self._pos = end
+            if found >= 0:
+                return True
+        return False
+
+    def balanced(self, opener, closer):
+        """Text up to the ``closer`` matching an already consumed ``opener``."""
+        start = self.line
+        stop = _DELIMITERS[closer]
+        depth = 0
+        pieces = []
+        while True:
+            if not self.peek():
+                raise BibTeXError(f"line {start}: unbalanced {opener!r}")
+            # Copy the run of plain text in one slice, then handle the delimiter
+            m = stop.search(self._buf, self._pos)
+            end = m.start() if m else len(self._buf)
+            pieces.append(self._buf[self._pos:end])
+            self.line += self._buf.count("\n", self._pos, end)
+            self._pos = end
+            if not m:
+                continue
+            ch = m.group()
+            self._pos += 1
+            if ch == "{":
+                depth += 1
+            elif ch == "}" and depth:
+                depth -= 1
+            elif ch == closer and depth == 0:
+                return "".join(pieces)
+            pieces.append(ch)
+
+
+def _value(reader, macros):
+    """A field value: pieces joined by ``#``."""
+    pieces = []
+    while True:
+        reader.skip_space()
+        ch = reader.peek()
+        if ch == "{":
+            reader.next()
+            pieces.append(reader.balanced("{", "}"))
+        elif ch == '"':
+            reader.next()
+            pieces.append(reader.balanced('"', '"'))
+        else:
+            name = reader.identifier()
+            if not name:
+                raise reader.error(f"expected a value, got {ch or 'end of file'!r}")
+            pieces.append(name if name.isdigit() else macros.get(name.lower(), MONTHS.get(name.lower(), name)))
+        reader.skip_space()
+        if reader.peek() != "#":
+            return "".join(pieces)
+        reader.next()
+
+
+def _fields(reader, closer, macros):
+    """``name = value`` pairs up to ``closer`` (a trailing comma is allowed)."""
+    fields = {}
+    while True:
+        reader.skip_space()
+        if reader.peek() == closer:
+            reader.next()
+            return fields
+        name = reader.identifier().lower()
+        if not name:
+            raise reader.error(f"expected a field name, got {reader.peek() or 'end of file'!r}")
+        reader.expect("=")
+        fields[name] = _value(reader, macros)
+        if reader.expect("," + closer) == closer:
+            return fields
+
+
+def iter_bibtex(stream, macros=None):
+    """
+    Yield the entries of a BibTeX text stream in file order.
+
+    Args:
+        stream: text file object (read in CHUNK_SIZE pieces)
+        macros: optional {name: value} predefined @string macros; @string
+            entries in the stream are added to it
+
+    Raises:
+        BibTeXError on a malformed entry.
+    """
+    macros = {} if macros is None else macros
+    reader = _Reader(stream)
+    while reader.skip_to("@"):
+        kind = reader.entry_type().lower()
+        reader.skip_space()
+        if not kind[:1].isalpha() or reader.peek() not in ("{", "("):
+            # Text between entries ("Exported by me@host.org") is a comment
+            continue
+        opener = reader.next()
+        closer = "}" if opener == "{" else ")"
+
+        if kind == "comment":
+            reader.balanced(opener, closer)
+        elif kind == "preamble":
+            _value(reader, macros)
+            reader.expect(closer)
+        elif kind == "string":
+            macros.update(_fields(reader, closer, macros))
+        else:
+            reader.skip_space()
+            chars = []
+            while reader.peek() and reader.peek() not in ("," + closer):
+                chars.append(reader.next())
+            key = "".join(chars).strip()
+            end = reader.next()
+            if not end:
+                raise reader.error(f"unterminated @{kind} entry {key!r}")
+            fields = _fields(reader, closer, macros) if end == "," else {}
+            yield {"type": kind, "key": key, "fields": fields}
+
+
+def plain_text(value):
+    """Field value without braces, whitespace collapsed."""
+    return re.sub(r"\s+", " ", value.replace("{", "").replace("}", "")).strip()
+
+
+def parse_bibtex_file(path):
+    """All entries of a BibTeX file, streamed from disk."""
+    with open(path, "r", encoding="utf-8") as f:
+        return list(iter_bibtex(f))
+
+
+def load_bibtex(path, cache_dir=CACHE_DIR):
+    """
+    Entries of a BibTeX file, cached by content hash in ``cache_dir``.
+
+    The cache file is named after the file's SHA-256, so an unchanged
+    bibliography (under any name) is read back without parsing and any
+    edit parses it afresh. Pass ``cache_dir=None`` to bypass the cache.
+    """
+    if cache_dir is None:
+        return parse_bibtex_file(path)
+    digest = file_digest(path)
+    cache_path = Path(cache_dir) / f"{digest}.json"
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("version") == CACHE_VERSION and cached.get("sha256") == digest:
+            return cached["entries"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    entries = parse_bibtex_file(path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    write_json_atomic(cache_path, {"version": CACHE_VERSION, "sha256": digest, "entries": entries})
+    return entries
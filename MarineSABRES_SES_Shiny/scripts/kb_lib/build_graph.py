@@ -0,0 +1,339 @@
+"""
+Dependency-tracked, incremental builds of the generated data/ artifacts.
+
+Each BuildTarget names the script that produces it, the files it reads
+(the script itself, rule tables, library modules, source KBs) and the
+files it writes. A target that reads another target's output depends on
+it, so the targets form a DAG that is built in topological waves; the
+targets of one wave run in parallel, each as its own subprocess.
+
+Content hashes, not timestamps, decide what is stale. After a successful
+build the SHA-256 of every input and output is recorded in the build state
+file (data/cache/build_state.json, local to the checkout). A target is
+
+  ok         inputs and outputs match the record
+  stale      never built, an input or the command changed, an output is
+             missing, or an upstream target is going to be rebuilt
+  edited     an output no longer matches the hash recorded when it was
+             built: it was changed by hand and a rebuild would lose that
+  untracked  a ``guarded`` target whose outputs exist but were never
+             recorded (e.g. the committed offshore-wind and WP5 KBs, which
+             may carry manual edits); ``adopt`` records them as built
+  blocked    a source input is missing
+
+Edited and untracked targets are never rebuilt unless forced.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .knowledge_base import DATA_DIR, KB_PATH, OFFSHORE_WIND_KB_PATH, PROJECT_ROOT, WP5_KB_PATH
+from .transaction import write_json_atomic
+from .validation_cache import file_digest
+
+STATE_VERSION = 1
+STATE_PATH = DATA_DIR / "cache" / "build_state.json"
+# BibTeX export the offshore-wind KB is built from (not in the repository)
+OFFSHORE_WIND_BIB_PATH = Path(os.environ.get("OFFSHORE_WIND_BIB", DATA_DIR / "offshore_wind_papers.bib"))
+
+OK, STALE, EDITED, UNTRACKED, BLOCKED = "ok", "stale", "edited", "untracked", "blocked"
+
+_SCRIPTS = PROJECT_ROOT / "scripts"
+_KB_LIB = _SCRIPTS / "kb_lib"
+
+
+class BuildTarget:
+    """One builder script with its declared inputs and outputs."""
+
+    def __init__(self, name, command, inputs, outputs, guarded=False):
+        """
+        Args:
+            name: target name used on the command line
+            command: script path followed by its arguments; run with the
+                current interpreter from PROJECT_ROOT
+            inputs: files the build reads
+            outputs: files the build writes
+            guarded: outputs may be hand-edited, so never overwrite them
+                before they have been built or adopted once
+        """
+        self.name = name
+        self.command = [str(part) for part in command]
+        self.inputs = [Path(p) for p in inputs]
+        self.outputs = [Path(p) for p in outputs]
+        self.guarded = guarded
+
+
+def default_targets():
+    kbs = [KB_PATH, OFFSHORE_WIND_KB_PATH, WP5_KB_PATH]
+    return [
+        BuildTarget(
+            "offshore_wind_kb",
+            [_SCRIPTS / "build_offshore_wind_kb.py", "--bib", OFFSHORE_WIND_BIB_PATH],
+            [_SCRIPTS / "build_offshore_wind_kb.py", _KB_LIB / "rules" / "offshore_wind_paper_themes.json",
+             _KB_LIB / "bibtex.py", _KB_LIB / "paper_classifier.py", _KB_LIB / "keyword_matcher.py",
+             _KB_LIB / "near_duplicates.py", _KB_LIB / "knowledge_base.py", OFFSHORE_WIND_BIB_PATH],
+            [OFFSHORE_WIND_KB_PATH],
+            guarded=True,
+        ),
+        BuildTarget(
+            "wp5_mechanisms_kb",
+            [_SCRIPTS / "build_wp5_mechanisms_kb.py"],
+            [_SCRIPTS / "build_wp5_mechanisms_kb.py"],
+            [WP5_KB_PATH],
+            guarded=True,
+        ),
+        BuildTarget(
+            "element_classifier_training",
+            [_SCRIPTS / "extract_classifier_training_data.py"],
+            [_SCRIPTS / "extract_classifier_training_data.py", _KB_LIB / "knowledge_base.py",
+             KB_PATH, OFFSHORE_WIND_KB_PATH],
+            [DATA_DIR / "element_classifier_training.json"],
+        ),
+        BuildTarget(
+            "compiled_kbs",
+            [_SCRIPTS / "compile_kb.py"],
+            [_SCRIPTS / "compile_kb.py", _KB_LIB / "compiled.py", _KB_LIB / "knowledge_base.py",
+             _KB_LIB / "transaction.py", *kbs],
+            [kb.with_suffix(".kbc") for kb in kbs],
+        ),
+        BuildTarget(
+            "reference_registries",
+            [_SCRIPTS / "kb_references.py", "build"],
+            [_SCRIPTS / "kb_references.py", _KB_LIB / "references.py", _KB_LIB / "knowledge_base.py",
+             KB_PATH, OFFSHORE_WIND_KB_PATH],
+            [kb.with_name(f"{kb.stem}.references.json") for kb in (KB_PATH, OFFSHORE_WIND_KB_PATH)],
+        ),
+    ]
+
+
+def _hash(path):
+    try:
+        return file_digest(path)
+    except OSError:
+        return None
+
+
+def _display(path):
+    try:
+        return str(Path(path).relative_to(PROJECT_ROOT))
+    except ValueError:
+        return str(path)
+
+
+class BuildGraph:
+    """Build targets ordered by their file dependencies, with recorded state."""
+
+    def __init__(self, targets=None, state_path=STATE_PATH):
+        self.targets = {}
+        for target in default_targets() if targets is None else targets:
+            if target.name in self.targets:
+                raise ValueError(f"duplicate build target '{target.name}'")
+            self.targets[target.name] = target
+        self.state_path = Path(state_path)
+        self.state = self._load_state()
+
+        producer = {}
+        for target in self.targets.values():
+            for out in target.outputs:
+                if out in producer:
+                    raise ValueError(f"{_display(out)} is an output of both '{producer[out]}' and '{target.name}'")
+                producer[out] = target.name
+        self.producer = producer
+        self.deps = {
+            name: sorted({producer[p] for p in target.inputs if p in producer} - {name})
+            for name, target in self.targets.items()
+        }
+        self.order = self._topological_order()
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return state.get("targets", {}) if state.get("version") == STATE_VERSION else {}
+
+    def _save_state(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        write_json_atomic(self.state_path, {"version": STATE_VERSION, "targets": self.state})
+
+    def _topological_order(self):
+        order = []
+        marks = {}
+
+        def visit(name, chain):
+            if marks.get(name) == "done":
+                return
+            if marks.get(name) == "active":
+                raise ValueError("build dependency cycle: " + " -> ".join(chain + [name]))
+            marks[name] = "active"
+            for dep in self.deps[name]:
+                visit(dep, chain + [name])
+            marks[name] = "done"
+            order.append(name)
+
+        for name in self.targets:
+            visit(name, [])
+        return order
+
+    def closure(self, names):
+        """``names`` plus everything they depend on, in build order."""
+        unknown = [n for n in names if n not in self.targets]
+        if unknown:
+            raise ValueError(f"unknown build target(s): {', '.join(unknown)} (one of: {', '.join(self.targets)})")
+        wanted = set()
+        stack = list(names)
+        while stack:
+            name = stack.pop()
+            if name not in wanted:
+                wanted.add(name)
+                stack.extend(self.deps[name])
+        return [name for name in self.order if name in wanted]
+
+    # ── Status ───────────────────────────────────────────────────────────
+
+    def status(self, name, rebuilding=()):
+        """
+        (status, reasons) of one target. ``rebuilding`` names upstream
+        targets about to be rebuilt, which make this one stale.
+        """
+        target = self.targets[name]
+        record = self.state.get(name)
+
+        missing = [p for p in target.inputs if p not in self.producer and not p.exists()]
+        if missing:
+            return BLOCKED, [f"missing input {_display(p)}" for p in missing]
+
+        if record is None:
+            if target.guarded and any(p.exists() for p in target.outputs):
+                return UNTRACKED, ["outputs exist but were never built or adopted"]
+            return STALE, ["never built"]
+
+        edited = [p for p in target.outputs
+                  if p.exists() and _hash(p) != record["outputs"].get(_display(p))]
+        if edited:
+            return EDITED, [f"{_display(p)} changed since it was built" for p in edited]
+
+        reasons = [f"output {_display(p)} missing" for p in target.outputs if not p.exists()]
+        if record.get("command") != target.command[1:]:
+            reasons.append("command changed")
+        reasons.extend(
+            f"input {_display(p)} changed" for p in target.inputs
+            if _hash(p) != record["inputs"].get(_display(p))
+        )
+        reasons.extend(f"upstream {dep} is rebuilt" for dep in self.deps[name] if dep in rebuilding)
+        return (STALE, reasons) if reasons else (OK, [])
+
+    def plan(self, names=None):
+        """[(name, status, reasons)] in build order, propagating staleness downstream."""
+        rebuilding = set()
+        plan = []
+        for name in self.closure(names) if names else self.order:
+            status, reasons = self.status(name, rebuilding)
+            if status == STALE:
+                rebuilding.add(name)
+            plan.append((name, status, reasons))
+        return plan
+
+    # ── Building ─────────────────────────────────────────────────────────
+
+    def _record(self, name, input_hashes):
+        target = self.targets[name]
+        self.state[name] = {
+            "command": target.command[1:],
+            "inputs": input_hashes,
+            "outputs": {_display(p): _hash(p) for p in target.outputs},
+            "built": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+
+    def adopt(self, names=None):
+        """Record the current outputs of targets as built from the current inputs."""
+        adopted = []
+        for name in names or self.order:
+            target = self.targets[name]
+            if all(p.exists() for p in target.outputs):
+                self._record(name, {_display(p): _hash(p) for p in target.inputs})
+                adopted.append(name)
+        self._save_state()
+        return adopted
+
+    def _run(self, name):
+        target = self.targets[name]
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, *target.command], cwd=PROJECT_ROOT,
+            capture_output=True, text=True, encoding="utf-8", errors="replace",
+        )
+        return proc.returncode, (proc.stdout + proc.stderr).strip(), time.perf_counter() - started
+
+    def build(self, names=None, force=False, jobs=None, log=print):
+        """
+        Rebuild the stale targets among ``names`` (default: all) and their
+        dependencies, one topological wave at a time. Staleness is checked
+        again when a target's wave comes up, so a rebuilt upstream target
+        whose outputs came out byte-identical does not trigger rebuilds.
+
+        Args:
+            force: also rebuild edited and untracked targets
+            jobs: parallel builds per wave (default: CPU count)
+            log: callable for progress lines
+
+        Returns:
+            {name: result} where result is "ok" (up to date), "built",
+            "failed", "refused" or "skipped" (blocked or an upstream
+            target did not build).
+        """
+        jobs = max(1, (os.cpu_count() or 1) if jobs is None else jobs)
+        names = self.closure(names) if names else list(self.order)
+        level = {}
+        for name in names:
+            level[name] = 1 + max((level[d] for d in self.deps[name] if d in level), default=-1)
+        waves = [[n for n in names if level[n] == lv] for lv in range(max(level.values(), default=-1) + 1)]
+
+        results = {}
+        for wave in waves:
+            runnable = []
+            for name in wave:
+                # Refused upstream targets keep their existing outputs, which
+                # downstream targets can still build from
+                unbuilt = [dep for dep in self.deps[name] if results.get(dep) == "failed"
+                           or not all(p.exists() for p in self.targets[dep].outputs)]
+                if unbuilt:
+                    results[name] = "skipped"
+                    log(f"  [SKIPPED]  {name}: upstream {', '.join(unbuilt)} did not build")
+                    continue
+                status, reasons = self.status(name)
+                if status == OK:
+                    results[name] = "ok"
+                    continue
+                if status == BLOCKED:
+                    results[name] = "skipped"
+                    log(f"  [BLOCKED]  {name}: {'; '.join(reasons)}")
+                    continue
+                if status in (EDITED, UNTRACKED) and not force:
+                    results[name] = "refused"
+                    log(f"  [REFUSED]  {name}: {'; '.join(reasons)} (adopt it, or rebuild with --force)")
+                    continue
+                runnable.append((name, {_display(p): _hash(p) for p in self.targets[name].inputs}))
+            if not runnable:
+                continue
+
+            with ThreadPoolExecutor(max_workers=min(jobs, len(runnable))) as executor:
+                outcomes = list(executor.map(lambda item: self._run(item[0]), runnable))
+            for (name, input_hashes), (code, output, elapsed) in zip(runnable, outcomes):
+                if code == 0:
+                    self._record(name, input_hashes)
+                    results[name] = "built"
+                    log(f"  [BUILT]    {name} ({elapsed:.1f}s)")
+                else:
+                    results[name] = "failed"
+                    log(f"  [FAILED]   {name} (exit {code})")
+                    for line in output.splitlines()[-10:]:
+                        log(f"             {line}")
+            self._save_state()
+        return results
@@ -0,0 +1,296 @@
+"""
+Centrality and leverage-point metrics for every KB context.
+
+Each context's connections become one SparseGraph: nodes numbered in
+sorted order and compressed sparse row (CSR) arrays for the outgoing and
+incoming links, built once and shared by every metric:
+
+  in_degree, out_degree     distinct predecessors / successors
+  in_strength, out_strength summed link weights, weight = strength
+                            (weak 1, medium/moderate 2, strong 3, as in
+                            compute_edge_properties) x confidence / 5
+  betweenness               Brandes, directed, unweighted, not normalised
+                            (igraph::betweenness defaults)
+  pagerank                  power iteration, damping 0.85, dangling mass
+                            spread uniformly (igraph::page_rank defaults)
+  weighted_pagerank         the same with links weighted as above
+  leverage_score            z(betweenness) + z(pagerank) + z(out_strength),
+                            scaled like safe_scale() in network_analysis.R
+
+identify_leverage_points() in R uses eigenvector centrality as the third
+term; most KB contexts are acyclic, where it is zero for every node, so
+the weighted out-strength takes its place here.
+
+context_metrics() returns one row dict per element. metrics_for_kb()
+caches rows per context under the context's content hash, so a rerun only
+recomputes contexts that changed.
+"""
+
+import hashlib
+import inspect
+import json
+import math
+import os
+import sys
+from array import array
+from pathlib import Path
+
+from .knowledge_base import CATEGORIES, element_name
+from .validation_cache import context_fingerprints
+
+STRENGTH_WEIGHTS = {"weak": 1.0, "medium": 2.0, "moderate": 2.0, "strong": 3.0}
+DEFAULT_STRENGTH = 2.0
+DEFAULT_CONFIDENCE = 3
+DAMPING = 0.85
+
+METRICS = (
+    "in_degree", "out_degree", "in_strength", "out_strength",
+    "betweenness", "pagerank", "weighted_pagerank", "leverage_score",
+)
+
+CACHE_VERSION = 1
+
+
+def connection_weight(conn):
+    """Link weight from a connection's ``strength`` and ``confidence``."""
+    strength = STRENGTH_WEIGHTS.get(conn.get("strength"), DEFAULT_STRENGTH)
+    confidence = conn.get("confidence", DEFAULT_CONFIDENCE)
+    if not isinstance(confidence, (int, float)) or isinstance(confidence, bool):
+        confidence = DEFAULT_CONFIDENCE
+    return strength * confidence / 5
+
+
+class SparseGraph:
+    """
+    Weighted digraph in CSR form. Parallel links between the same pair of
+    nodes are merged into one entry holding the sum of their weights.
+    """
+
+    def __init__(self, nodes, edges):
+        """
+        Args:
+            nodes: node names (every endpoint must be among them)
+            edges: iterable of (from, to, weight)
+        """
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        merged = {}
+        for src, dst, weight in edges:
+            key = (self.index[src], self.index[dst])
+            merged[key] = merged.get(key, 0.0) + weight
+        self.out_ptr, self.out_idx, self.out_w = self._csr(merged, len(self.nodes))
+        self.in_ptr, self.in_idx, self.in_w = self._csr(
+            {(j, i): w for (i, j), w in merged.items()}, len(self.nodes)
+        )
+
+    @staticmethod
+    def _csr(entries, n):
+        ptr = array("l", [0] * (n + 1))
+        for i, _ in entries:
+            ptr[i + 1] += 1
+        for i in range(n):
+            ptr[i + 1] += ptr[i]
+        idx = array("l", [0] * len(entries))
+        weights = array("d", [0.0] * len(entries))
+        fill = array("l", ptr[:-1])
+        for (i, j), w in sorted(entries.items()):
+            idx[fill[i]] = j
+            weights[fill[i]] = w
+            fill[i] += 1
+        return ptr, idx, weights
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def degrees(self, ptr):
+        return [ptr[i + 1] - ptr[i] for i in range(len(self.nodes))]
+
+    def strengths(self, ptr, weights):
+        return [math.fsum(weights[ptr[i]:ptr[i + 1]]) for i in range(len(self.nodes))]
+
+    def pagerank(self, weighted=False, damping=DAMPING, tol=1e-12, max_iter=1000):
+        """PageRank vector by power iteration over the CSR rows."""
+        n = len(self.nodes)
+        if n == 0:
+            return []
+        ptr, idx = self.out_ptr, self.out_idx
+        weights = self.out_w if weighted else array("d", [1.0] * len(idx))
+        out = [math.fsum(weights[ptr[i]:ptr[i + 1]]) for i in range(n)]
+        rank = [1.0 / n] * n
+        for _ in range(max_iter):
+            dangling = math.fsum(rank[i] for i in range(n) if out[i] == 0)
+            base = (1.0 - damping + damping * dangling) / n
+            new = [base] * n
+            for i in range(n):
+                if out[i]:
+                    share = damping * rank[i] / out[i]
+                    for k in range(ptr[i], ptr[i + 1]):
+                        new[idx[k]] += share * weights[k]
+            total = math.fsum(new)
+            new = [x / total for x in new]
+            delta = sum(abs(a - b) for a, b in zip(new, rank))
+            rank = new
+            if delta < tol:
+                break
+        return rank
+
+    def betweenness(self):
+        """Brandes' algorithm, one BFS per source over the CSR rows."""
+        n = len(self.nodes)
+        ptr, idx = self.out_ptr, self.out_idx
+        centrality = [0.0] * n
+        for s in range(n):
+            order = []
+            preds = [[] for _ in range(n)]
+            sigma = [0] * n
+            dist = [-1] * n
+            sigma[s] = 1
+            dist[s] = 0
+            queue = [s]
+            head = 0
+            while head < len(queue):
+                v = queue[head]
+                head += 1
+                order.append(v)
+                for k in range(ptr[v], ptr[v + 1]):
+                    w = idx[k]
+                    if dist[w] < 0:
+                        dist[w] = dist[v] + 1
+                        queue.append(w)
+                    if dist[w] == dist[v] + 1:
+                        sigma[w] += sigma[v]
+                        preds[w].append(v)
+            delta = [0.0] * n
+            for w in reversed(order):
+                for v in preds[w]:
+                    delta[v] += sigma[v] / sigma[w] * (1.0 + delta[w])
+                if w != s:
+                    centrality[w] += delta[w]
+        return centrality
+
+
+def _zscores(values):
+    """Like R's scale() via safe_scale(): sample SD, zeros if constant."""
+    n = len(values)
+    if n < 2:
+        return [0.0] * n
+    mean = math.fsum(values) / n
+    sd = math.sqrt(math.fsum((v - mean) ** 2 for v in values) / (n - 1))
+    if sd == 0:
+        return [0.0] * n
+    return [(v - mean) / sd for v in values]
+
+
+def context_graph(ctx):
+    """(SparseGraph, {element: category}) for one context dict."""
+    categories = {}
+    for cat in CATEGORIES:
+        entries = ctx.get(cat, [])
+        for entry in entries if isinstance(entries, list) else []:
+            name = element_name(entry)
+            if name:
+                categories.setdefault(name, cat)
+
+    edges = []
+    for conn in ctx.get("connections", []):
+        if isinstance(conn, dict):
+            src, dst = conn.get("from", ""), conn.get("to", "")
+            if src and dst and isinstance(src, str) and isinstance(dst, str):
+                edges.append((src, dst, connection_weight(conn)))
+    nodes = sorted(set(categories) | {e[0] for e in edges} | {e[1] for e in edges})
+    return SparseGraph(nodes, edges), categories
+
+
+def context_metrics(ctx):
+    """One row per element of a context, ranked by leverage_score."""
+    graph, categories = context_graph(ctx)
+    if not len(graph):
+        return []
+    columns = {
+        "in_degree": graph.degrees(graph.in_ptr),
+        "out_degree": graph.degrees(graph.out_ptr),
+        "in_strength": graph.strengths(graph.in_ptr, graph.in_w),
+        "out_strength": graph.strengths(graph.out_ptr, graph.out_w),
+        "betweenness": graph.betweenness(),
+        "pagerank": graph.pagerank(),
+        "weighted_pagerank": graph.pagerank(weighted=True),
+    }
+    scores = zip(
+        _zscores(columns["betweenness"]),
+        _zscores(columns["pagerank"]),
+        _zscores(columns["out_strength"]),
+    )
+    columns["leverage_score"] = [math.fsum(parts) for parts in scores]
+
+    rows = []
+    for i, node in enumerate(graph.nodes):
+        row = {"element": node, "category": categories.get(node, "")}
+        for metric in METRICS:
+            value = columns[metric][i]
+            row[metric] = value if isinstance(value, int) else round(value, 10)
+        rows.append(row)
+    rows.sort(key=lambda r: (-r["leverage_score"], r["element"]))
+    for rank, row in enumerate(rows, 1):
+        row["rank"] = rank
+    return rows
+
+
+# ── Cached runs over whole KBs ────────────────────────────────────────────
+
+
+def _code_fingerprint():
+    return hashlib.sha256(inspect.getsource(sys.modules[__name__]).encode("utf-8")).hexdigest()
+
+
+def load_metrics_cache(path):
+    """Cached {kb file: {context: {"hash", "rows"}}}, or {} if missing or stale."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != CACHE_VERSION or cache.get("code") != _code_fingerprint():
+        return {}
+    return cache.get("files", {})
+
+
+def save_metrics_cache(path, files):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(
+            {"version": CACHE_VERSION, "code": _code_fingerprint(), "files": files},
+            f, ensure_ascii=False, separators=(",", ":"),
+        )
+    os.replace(tmp, path)
+
+
+def metrics_for_kb(kb, cached=None):
+    """
+    {context: rows} for every context of ``kb``, plus the cache entry to
+    store and the number of contexts recomputed.
+
+    Args:
+        kb: KnowledgeBase
+        cached: this KB's previous cache entry ({context: {"hash", "rows"}})
+
+    Returns:
+        (results, entry, recomputed)
+    """
+    cached = cached or {}
+    fingerprints = context_fingerprints(kb)
+    results = {}
+    entry = {}
+    recomputed = 0
+    for ctx_name, ctx in kb.iter_contexts():
+        digest = fingerprints[ctx_name]["hash"]
+        hit = cached.get(ctx_name)
+        if hit and hit.get("hash") == digest:
+            rows = hit["rows"]
+        else:
+            rows = context_metrics(ctx)
+            recomputed += 1
+        results[ctx_name] = rows
+        entry[ctx_name] = {"hash": digest, "rows": rows}
+    return results, entry, recomputed
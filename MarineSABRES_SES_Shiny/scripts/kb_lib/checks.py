@@ -0,0 +1,594 @@
+"""
+Validation checks for the knowledge base files.
+
+Structural checks from validate_kb.py, the manual-review flags from
+kb_audit/audit_kb_quality.py and the WP5 mechanism checks from
+kb_audit/audit_wp5_mechanisms.py, rewritten as visitors for the engine in
+kb_lib.validation, plus per-context graph checks. Severities follow the
+original scripts: anything that made them exit 1 is FAIL, their warnings
+are WARN, and audit flags for manual review are INFO.
+"""
+
+import re
+from collections import defaultdict
+
+from .graph import strongly_connected_components
+from .keyword_matcher import load_rules
+from .knowledge_base import CATEGORIES, element_name
+from .near_duplicates import duplicate_text_groups
+from .validation import (
+    KIND_MECHANISMS,
+    SCOPE_GLOBAL,
+    Check,
+    GraphCheck,
+    issue,
+    merge_counts,
+    register_check,
+)
+
+# Valid connection flows expressed as (from_type, to_type); validate_kb.py imports these
+VALID_FLOWS = {
+    ("drivers", "activities"),       # D -> A
+    ("activities", "pressures"),     # A -> P
+    ("pressures", "states"),         # P -> S
+    ("states", "impacts"),           # S -> I
+    ("impacts", "welfare"),          # I -> W
+    ("welfare", "drivers"),          # W -> D
+    ("responses", "activities"),     # R -> A
+    ("responses", "pressures"),      # R -> P
+    ("responses", "drivers"),        # R -> D
+    ("states", "states"),            # S -> S
+    ("pressures", "pressures"),      # P -> P
+    ("activities", "activities"),    # A -> A
+}
+
+# Valid transitions after Rules 17-18 + ExUP exception, as in audit_kb_quality.py
+VALID_TRANSITIONS = {
+    ("drivers", "activities"), ("activities", "pressures"),
+    ("pressures", "states"), ("states", "impacts"),
+    ("impacts", "welfare"), ("welfare", "responses"),
+    ("welfare", "measures"),
+    ("welfare", "drivers"),
+    ("responses", "drivers"), ("responses", "activities"),
+    ("responses", "pressures"), ("responses", "states"),
+    ("measures", "drivers"), ("measures", "activities"),
+    ("measures", "pressures"), ("measures", "states"),
+    ("measures", "responses"),
+    ("responses", "responses"),
+    ("drivers", "welfare"),
+    ("states", "states"),
+    ("pressures", "pressures"),
+    ("activities", "activities"),
+    ("drivers", "pressures"),
+}
+
+VALID_REVERSIBILITY = {"reversible", "partially_reversible", "irreversible"}
+VALID_TEMPORAL_LAG = {"immediate", "short-term", "medium-term", "long-term"}
+
+RESEARCH_PATTERN = re.compile(r"\b(research|monitoring|surveys)\b", re.IGNORECASE)
+PHYSICAL_IMPACT_PATTERN = re.compile(
+    r"\b(sediment|sampling|drilling|dredging|coring)\b", re.IGNORECASE
+)
+
+CANONICAL_DAS = {"macaronesia", "tuscan", "arctic"}
+REQUIRED_ATTRS = [
+    "id", "name", "cost_profile", "what_it_funds", "finance_flow",
+    "design_parameters", "evidence_base", "transferable_lessons",
+    "applies_to_DAs", "success_metrics", "risks_and_guardrails",
+    "use_in_impact_assessment", "references",
+]
+COMPLETENESS_ATTRS = [
+    "name", "cost_profile", "what_it_funds", "finance_flow",
+    "design_parameters", "evidence_base", "transferable_lessons",
+    "use_in_impact_assessment", "references",
+]
+
+# Categories a complete causal chain runs through, in order
+CHAIN_CATEGORIES = ["drivers", "activities", "pressures", "states", "impacts", "welfare"]
+
+
+def connection_fields(ctx_name, idx, conn):
+    """Location fields shared by every connection-level issue."""
+    return {
+        "context": ctx_name,
+        "index": idx,
+        "from": conn.get("from", ""),
+        "to": conn.get("to", ""),
+    }
+
+
+def is_populated(value):
+    """Return True if a JSON value carries non-trivial content."""
+    if value is None:
+        return False
+    if isinstance(value, str):
+        return bool(value.strip())
+    if isinstance(value, (list, dict)):
+        return bool(value)
+    return True
+
+
+# ── Structural checks (validate_kb.py) ───────────────────────────────────
+
+
+@register_check
+class CrossCategoryConflicts(Check):
+    name = "cross_category_conflicts"
+    title = "Cross-category conflicts"
+    scope = SCOPE_GLOBAL
+    depends_on = ("elements",)
+
+    def begin(self, kb):
+        self.categories = defaultdict(set)
+
+    def visit_element(self, ctx_name, category, entry, name):
+        if name:
+            self.categories[name].add(category)
+
+    def finish(self, kb):
+        for name, cats in sorted(self.categories.items()):
+            if len(cats) > 1:
+                self.report(
+                    "FAIL", f'"{name}" appears in categories: {", ".join(sorted(cats))}',
+                    element=name, categories=sorted(cats),
+                )
+
+
+@register_check
+class ConnectionFlows(Check):
+    name = "connection_flows"
+    title = "Connection flow validity"
+
+    def visit_connection(self, ctx_name, idx, conn):
+        flow = (conn.get("from_type"), conn.get("to_type"))
+        if flow not in VALID_FLOWS:
+            self.report(
+                "FAIL",
+                f'#{idx} {flow[0]} -> {flow[1]}: "{conn.get("from", "")}" -> "{conn.get("to", "")}"',
+                **connection_fields(ctx_name, idx, conn),
+            )
+
+
+@register_check
+class OrphanElements(Check):
+    name = "orphan_elements"
+    title = "Orphan elements"
+
+    def begin(self, kb):
+        self.listed = defaultdict(dict)
+        self.connected = defaultdict(set)
+
+    def visit_element(self, ctx_name, category, entry, name):
+        if name:
+            self.listed[ctx_name].setdefault(name, category)
+
+    def visit_connection(self, ctx_name, idx, conn):
+        self.connected[ctx_name].add(conn.get("from", ""))
+        self.connected[ctx_name].add(conn.get("to", ""))
+
+    def finish(self, kb):
+        total_elements = total_orphans = 0
+        for ctx_name in sorted(self.listed):
+            elements = self.listed[ctx_name]
+            orphans = {n: c for n, c in elements.items() if n not in self.connected[ctx_name]}
+            total_elements += len(elements)
+            total_orphans += len(orphans)
+            for name, cat in sorted(orphans.items(), key=lambda x: x[1]):
+                self.report("WARN", f"[{cat}] {name}", ctx_name, element=name, category=cat)
+        self.stats = {"elements": total_elements, "orphans": total_orphans}
+
+
+class VocabularyCheck(Check):
+    """Connection field restricted to a fixed vocabulary; records the distribution."""
+
+    field = None
+    allowed = set()
+
+    def begin(self, kb):
+        self.values = defaultdict(int)
+
+    def is_valid(self, value):
+        return isinstance(value, str) and value in self.allowed
+
+    def visit_connection(self, ctx_name, idx, conn):
+        value = conn.get(self.field)
+        if value is None:
+            return
+        self.values[str(value)] += 1
+        if not self.is_valid(value):
+            self.report(
+                "WARN",
+                f'"{conn.get("from", "")}" -> "{conn.get("to", "")}": {self.field} "{value}"',
+                value=value, **connection_fields(ctx_name, idx, conn),
+            )
+
+    def finish(self, kb):
+        self.stats = {
+            "allowed": sorted(self.allowed),
+            "distribution": dict(self.values),
+        }
+
+    @classmethod
+    def merge_stats(cls, parts):
+        merged = merge_counts(parts)
+        merged["distribution"] = dict(
+            sorted(merged.get("distribution", {}).items(), key=lambda x: -x[1])
+        )
+        return merged
+
+
+@register_check
+class ReversibilityVocabulary(VocabularyCheck):
+    name = "reversibility"
+    title = "Reversibility vocabulary"
+    field = "reversibility"
+    allowed = VALID_REVERSIBILITY
+
+
+@register_check
+class TemporalLagFormat(VocabularyCheck):
+    name = "temporal_lag"
+    title = "Temporal lag format"
+    field = "temporal_lag"
+    allowed = VALID_TEMPORAL_LAG
+
+
+@register_check
+class ConfidenceRange(Check):
+    name = "confidence"
+    title = "Confidence range"
+
+    def begin(self, kb):
+        self.counts = defaultdict(int)
+
+    def visit_connection(self, ctx_name, idx, conn):
+        value = conn.get("confidence")
+        if value is None:
+            return
+        self.counts[str(value)] += 1
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not 1 <= value <= 5:
+            self.report(
+                "WARN",
+                f'"{conn.get("from", "")}" -> "{conn.get("to", "")}": confidence {value!r} outside 1-5',
+                value=value, **connection_fields(ctx_name, idx, conn),
+            )
+
+    def finish(self, kb):
+        self.stats = {"distribution": dict(self.counts)}
+
+    @classmethod
+    def merge_stats(cls, parts):
+        merged = merge_counts(parts)
+        merged["distribution"] = dict(sorted(merged.get("distribution", {}).items()))
+        return merged
+
+
+@register_check
+class DuplicateConnections(Check):
+    name = "duplicate_connections"
+    title = "Duplicate connections"
+
+    def begin(self, kb):
+        self.seen = {}
+
+    def visit_connection(self, ctx_name, idx, conn):
+        key = (ctx_name, conn.get("from", ""), conn.get("to", ""))
+        first = self.seen.setdefault(key, idx)
+        if first != idx:
+            self.report(
+                "WARN",
+                f'#{idx} repeats #{first}: "{key[1]}" -> "{key[2]}"',
+                first_index=first, **connection_fields(ctx_name, idx, conn),
+            )
+
+
+@register_check
+class CrossEcosystemLinks(Check):
+    name = "cross_ecosystem_links"
+    title = "Cross-ecosystem link endpoints"
+    scope = SCOPE_GLOBAL
+    depends_on = ("elements", "links")
+
+    @classmethod
+    def needs_rerun(cls, kb, changes):
+        """Only element changes in a context some link points into matter."""
+        if changes["links"]:
+            return True
+        linked = set()
+        for link in kb.data.get("cross_ecosystem_links", []):
+            linked.update((link.get("from_context"), link.get("to_context")))
+        return bool(changes["elements"] & linked)
+
+    def finish(self, kb):
+        for i, link in enumerate(kb.data.get("cross_ecosystem_links", [])):
+            for side in ("from", "to"):
+                ctx_name = link.get(f"{side}_context")
+                elem = link.get(f"{side}_element")
+                if ctx_name not in kb.contexts:
+                    self.report("WARN", f"link #{i}: unknown {side}_context '{ctx_name}'", link=i)
+                elif kb.element_category(ctx_name, elem) is None:
+                    self.report(
+                        "WARN", f'link #{i}: {side}_element "{elem}" not listed in context',
+                        ctx_name, link=i, element=elem,
+                    )
+
+
+# ── Manual-review flags (kb_audit/audit_kb_quality.py) ───────────────────
+
+
+@register_check
+class HalpernOnlyReferences(Check):
+    name = "halpern_only"
+    title = "Halpern-only references"
+
+    def visit_connection(self, ctx_name, idx, conn):
+        refs = conn.get("references", [])
+        if isinstance(refs, list) and refs and all("halpern" in str(r).lower() for r in refs):
+            self.report("INFO", f'#{idx} "{conn.get("from", "")}" -> "{conn.get("to", "")}"',
+                        **connection_fields(ctx_name, idx, conn))
+
+
+class RationaleMarkerCheck(Check):
+    """Flags connections whose rationale carries the ``marker`` label of rules/audit_markers.json."""
+
+    marker = None
+
+    def begin(self, kb):
+        self.markers = load_rules("audit_markers")
+
+    def visit_connection(self, ctx_name, idx, conn):
+        if self.marker in self.markers.matched(conn.get("rationale", "").lower()):
+            self.report("INFO", f'#{idx} "{conn.get("from", "")}" -> "{conn.get("to", "")}"',
+                        **connection_fields(ctx_name, idx, conn))
+
+
+@register_check
+class ChainCompletionConnections(RationaleMarkerCheck):
+    name = "chain_completion"
+    title = "Chain-completion (auto-generated)"
+    marker = "chain_completion"
+
+
+@register_check
+class BridgeConnections(RationaleMarkerCheck):
+    name = "bridge_connections"
+    title = "Bridge connections"
+    marker = "bridge"
+
+
+@register_check
+class SingleReference(Check):
+    name = "single_reference"
+    title = "Single-reference connections"
+
+    def visit_connection(self, ctx_name, idx, conn):
+        refs = conn.get("references", [])
+        single = isinstance(refs, list) and len(refs) == 1
+        if isinstance(refs, str) and refs.strip():
+            single = ";" not in refs and "," not in refs
+        if single:
+            self.report("INFO", f'#{idx} "{conn.get("from", "")}" -> "{conn.get("to", "")}"',
+                        **connection_fields(ctx_name, idx, conn))
+
+
+@register_check
+class NonFrameworkTransitions(Check):
+    name = "non_framework_transitions"
+    title = "Non-framework transitions"
+
+    def visit_connection(self, ctx_name, idx, conn):
+        from_type = conn.get("from_type", "").lower()
+        to_type = conn.get("to_type", "").lower()
+        if from_type and to_type and (from_type, to_type) not in VALID_TRANSITIONS:
+            self.report("INFO", f"#{idx} {from_type} -> {to_type}",
+                        **connection_fields(ctx_name, idx, conn))
+
+
+@register_check
+class DuplicateRationale(Check):
+    name = "duplicate_rationale"
+    title = "Duplicate rationale"
+    scope = SCOPE_GLOBAL
+    depends_on = ("connections",)
+
+    def begin(self, kb):
+        self.rationales = defaultdict(list)
+
+    def visit_connection(self, ctx_name, idx, conn):
+        rationale = conn.get("rationale", "")
+        if rationale.strip() and len(rationale) > 50:
+            self.rationales[rationale.strip()].append(connection_fields(ctx_name, idx, conn))
+
+    def finish(self, kb):
+        # Near-identical (templated or copy-pasted) rationales count as one
+        for texts, similarity in duplicate_text_groups(self.rationales):
+            entries = [e for text in texts for e in self.rationales[text]]
+            if len(entries) < 3:
+                continue
+            pairs = {(e["from"], e["to"]) for e in entries}
+            if len(pairs) > 1:
+                prefix = max(texts, key=lambda text: len(self.rationales[text]))[:200]
+                self.report(
+                    "INFO", f'{len(entries)}x ({len(pairs)} pairs, {len(texts)} variants): "{prefix[:80]}..."',
+                    rationale_prefix=prefix, count=len(entries),
+                    distinct_pairs=len(pairs), variants=len(texts),
+                    min_similarity=similarity, connections=entries[:5],
+                )
+
+
+@register_check
+class ResearchElements(Check):
+    name = "research_elements"
+    title = "Research elements (needs review)"
+
+    def visit_element(self, ctx_name, category, entry, name):
+        if category != "activities" or not name:
+            return
+        if RESEARCH_PATTERN.search(name) and not PHYSICAL_IMPACT_PATTERN.search(name):
+            self.report("INFO", name[:80], ctx_name, element_name=name)
+
+
+# ── Per-context graph checks ─────────────────────────────────────────────
+
+
+def _context_graph(ctx):
+    """(element -> category, adjacency, reverse adjacency) for one context."""
+    categories = {}
+    for cat in CATEGORIES:
+        entries = ctx.get(cat, [])
+        for entry in entries if isinstance(entries, list) else []:
+            name = element_name(entry)
+            if name:
+                categories.setdefault(name, cat)
+
+    succ = defaultdict(set)
+    pred = defaultdict(set)
+    for conn in ctx.get("connections", []):
+        if isinstance(conn, dict):
+            src, dst = conn.get("from", ""), conn.get("to", "")
+            succ[src].add(dst)
+            pred[dst].add(src)
+    return categories, succ, pred
+
+
+def _reachable(starts, adjacency):
+    seen = set(starts)
+    stack = list(starts)
+    while stack:
+        node = stack.pop()
+        for nxt in adjacency.get(node, ()):
+            if nxt not in seen:
+                seen.add(nxt)
+                stack.append(nxt)
+    return seen
+
+
+@register_check
+class CausalChainCoverage(GraphCheck):
+    name = "causal_chain_coverage"
+    title = "Causal chain coverage"
+
+    @staticmethod
+    def run_context(ctx_name, ctx):
+        """Connected D-W elements that no driver reaches or that reach no welfare element."""
+        categories, succ, pred = _context_graph(ctx)
+        drivers = [n for n, c in categories.items() if c == "drivers"]
+        welfare = [n for n, c in categories.items() if c == "welfare"]
+        from_drivers = _reachable(drivers, succ)
+        to_welfare = _reachable(welfare, pred)
+
+        issues = []
+        on_chain = 0
+        for name, cat in categories.items():
+            if cat not in CHAIN_CATEGORIES or (name not in succ and name not in pred):
+                continue
+            on_chain += name in from_drivers and name in to_welfare
+            missing = []
+            if name not in from_drivers:
+                missing.append("not reached from any driver")
+            if name not in to_welfare:
+                missing.append("reaches no welfare element")
+            if missing:
+                issues.append(issue(
+                    "INFO", f"[{cat}] {name}: {', '.join(missing)}",
+                    ctx_name, element=name, category=cat,
+                ))
+        return issues, {"on_full_chain": on_chain, "partial_chain": len(issues)}
+
+
+@register_check
+class FeedbackLoops(GraphCheck):
+    name = "feedback_loops"
+    title = "Feedback loops"
+
+    @staticmethod
+    def run_context(ctx_name, ctx):
+        """Counts strongly connected components; a context with none has no feedback."""
+        _, succ, pred = _context_graph(ctx)
+        nodes = sorted(set(succ) | set(pred))
+        loops = [c for c in strongly_connected_components(nodes, succ) if len(c) > 1]
+
+        issues = []
+        if nodes and not loops:
+            issues.append(issue("INFO", "no feedback loop (graph is acyclic)", ctx_name))
+        stats = {
+            "loops": len(loops),
+            "largest_loop": max((len(c) for c in loops), default=0),
+        }
+        return issues, stats
+
+
+# ── WP5 mechanism checks (kb_audit/audit_wp5_mechanisms.py) ──────────────
+
+
+@register_check
+class MechanismCompleteness(Check):
+    name = "mechanism_completeness"
+    title = "Mechanism attributes"
+    kinds = (KIND_MECHANISMS,)
+
+    def begin(self, kb):
+        self.seen_ids = {}
+        for da_name in kb.data.get("demonstration_areas", {}):
+            if da_name not in CANONICAL_DAS:
+                self.report("FAIL", f"demonstration_areas: non-canonical key '{da_name}'")
+
+    def visit_mechanism(self, da_name, mech):
+        mid = mech.get("id", "<missing-id>")
+        where = f"{da_name}/{mid}"
+
+        for attr in REQUIRED_ATTRS:
+            if attr not in mech:
+                self.report("FAIL", f"{where}: missing required attribute '{attr}'", da_name)
+
+        if mid in self.seen_ids:
+            self.report("FAIL", f"{mid}: duplicate id (also appears in {self.seen_ids[mid]})", da_name)
+        else:
+            self.seen_ids[mid] = da_name
+
+        populated = sum(1 for a in COMPLETENESS_ATTRS if is_populated(mech.get(a)))
+        if populated < 8:
+            self.report(
+                "FAIL", f"{where}: only {populated}/9 completeness attrs populated; spec floor is 8",
+                da_name,
+            )
+
+        ff = mech.get("finance_flow") or {}
+        if not ff.get("payer"):
+            self.report("FAIL", f"{where}: finance_flow.payer is empty", da_name)
+        if not ff.get("receiver"):
+            self.report("FAIL", f"{where}: finance_flow.receiver is empty", da_name)
+
+        for da in mech.get("applies_to_DAs", []):
+            if da not in CANONICAL_DAS:
+                self.report("FAIL", f"{where}: applies_to_DAs contains non-canonical '{da}'", da_name)
+
+
+@register_check
+class MechanismEvidence(Check):
+    name = "mechanism_evidence"
+    title = "Mechanism evidence"
+    kinds = (KIND_MECHANISMS,)
+
+    def visit_mechanism(self, da_name, mech):
+        where = f"{da_name}/{mech.get('id', '<missing-id>')}"
+        if not mech.get("references"):
+            self.report("WARN", f"{where}: references array is empty", da_name)
+        if not mech.get("evidence_base"):
+            self.report("WARN", f"{where}: evidence_base array is empty", da_name)
+
+
+@register_check
+class ValuationBands(Check):
+    name = "valuation_bands"
+    title = "Valuation unit values"
+    kinds = (KIND_MECHANISMS,)
+
+    def finish(self, kb):
+        pos = kb.data.get("valuation_unit_values", {}).get("posidonia_oceanica", {})
+        for service, vals in pos.items():
+            where = f"valuation_unit_values.posidonia_oceanica.{service}"
+            if not all(k in vals for k in ("low", "central", "high", "unit", "method")):
+                self.report("FAIL", f"{where}: missing low/central/high/unit/method")
+            elif not (vals["low"] <= vals["central"] <= vals["high"]):
+                self.report("FAIL", f"{where}: bands not ordered low <= central <= high")
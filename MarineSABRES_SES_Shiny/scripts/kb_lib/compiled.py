@@ -0,0 +1,790 @@
+"""
+Compiled binary KB artifact (.kbc) and its memory-mapped loader.
+
+``compile_kb(path)`` turns a KB JSON file into data/<stem>.kbc:
+
+  header     magic, format version, byte order, section count, SHA-256 of
+             the source JSON and of the payload
+  sections   named, 8-byte aligned little-endian arrays:
+    strings / string_offsets   every distinct string, sorted, UTF-8
+    meta                       JSON: enum tables, row layouts, per-context
+                               scalars, every top-level entry but contexts
+    ctx_* / elem_* / conn_*    columnar context, element and connection
+                               tables (string ids, integer codes for
+                               category, type, polarity and strength)
+    ref_*                      flattened reference lists plus a by-string
+                               permutation for citation lookups
+    node_* / out_* / in_*      per-context CSR adjacency over element names
+
+CompiledKB maps the file read-only (so processes share one copy through
+the page cache), checks the payload digest and then reads columns in
+place with memoryview.cast(); nothing is decoded until asked for. It
+offers the same lookup API as KnowledgeBase, answering name lookups by
+binary search over the sorted string table, and materialises connection
+and context dicts per context on first use.
+
+Rows that don't fit the column layout (unexpected fields or types) are
+stored as JSON text and decoded as-is, so ``CompiledKB.data`` always
+equals the source document.
+"""
+
+import hashlib
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections import defaultdict
+from collections.abc import Mapping
+from pathlib import Path
+
+from .knowledge_base import CATEGORIES, KB_PATH, element_name, load_kb
+from .transaction import write_bytes_atomic
+
+MAGIC = b"SESKBC\r\n"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sIIII32s32s")     # magic, version, byteorder, sections, reserved, source, payload
+SECTION = struct.Struct("<24sQQ4s")         # name, offset, length, typecode
+NONE = 0xFFFFFFFF
+LITTLE = 1
+
+# Connection fields with their own column; anything else makes a row raw JSON
+_STRING_FIELDS = ("from", "to", "rationale", "temporal_lag", "reversibility")
+_ENUM_FIELDS = {"from_type": "type", "to_type": "type", "polarity": "polarity", "strength": "strength"}
+_CONN_COLUMNS = (
+    "ctx", "layout", "from", "to", "from_type", "to_type", "polarity", "strength",
+    "rationale", "temporal_lag", "reversibility", "refs_start", "refs_end", "raw",
+)
+_ELEM_COLUMNS = ("ctx", "cat", "name", "layout", "raw")
+
+
+def default_artifact_path(kb_path):
+    """data/ses_knowledge_db.json -> data/ses_knowledge_db.kbc"""
+    return Path(kb_path).with_suffix(".kbc")
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool) and -(1 << 63) <= value < (1 << 63)
+
+
+def _is_float(value):
+    return isinstance(value, float) or _is_int(value)
+
+
+# ── Compilation ─────────────────────────────────────────────────────────
+
+
+class _Compiler:
+    def __init__(self, data):
+        self.data = data
+        self.strings = {}
+        self.enums = {"type": list(CATEGORIES), "polarity": [], "strength": []}
+        self.layouts = {"connection": [], "element": []}
+        self._layout_ids = {"connection": {}, "element": {}}
+        self.conn = {col: [] for col in _CONN_COLUMNS}
+        self.confidence = []
+        self.elem = {col: [] for col in _ELEM_COLUMNS}
+        self.relevance = []
+        self.ref_conn = []
+        self.ref_str = []
+        self.ctx_meta = []
+        self.ctx_name = []
+        self.cat_ptr = []
+        self.conn_ptr = [0]
+
+    def sid(self, text):
+        # Placeholder ids; remapped to sorted order in finish()
+        return self.strings.setdefault(text, len(self.strings))
+
+    def enum(self, kind, value):
+        values = self.enums[kind]
+        if value not in values:
+            values.append(value)
+        return values.index(value)
+
+    def layout(self, kind, keys):
+        keys = tuple(keys)
+        ids = self._layout_ids[kind]
+        if keys not in ids:
+            ids[keys] = len(self.layouts[kind])
+            self.layouts[kind].append(list(keys))
+        return ids[keys]
+
+    # Rows
+
+    def add_element(self, ctx_idx, cat_idx, entry):
+        name = element_name(entry)
+        key = self.sid(name) if name else NONE
+        standard = (
+            isinstance(entry, dict)
+            and isinstance(entry.get("name"), str) and entry["name"]
+            and set(entry) <= {"name", "relevance"}
+            and (entry.get("relevance") is None or _is_float(entry["relevance"]))
+        )
+        row = self.elem
+        row["ctx"].append(ctx_idx)
+        row["cat"].append(cat_idx)
+        row["name"].append(key)
+        if standard:
+            relevance = entry.get("relevance")
+            kinds = [
+                k if k == "name" else f"relevance:{'none' if relevance is None else 'int' if _is_int(relevance) else 'float'}"
+                for k in entry
+            ]
+            row["layout"].append(self.layout("element", kinds))
+            row["raw"].append(NONE)
+            self.relevance.append(float(relevance) if relevance is not None else 0.0)
+        else:
+            row["layout"].append(NONE)
+            row["raw"].append(self.sid(json.dumps(entry, ensure_ascii=False)))
+            self.relevance.append(0.0)
+
+    def _standard_connection(self, conn):
+        for field, value in conn.items():
+            if field in _STRING_FIELDS or field in _ENUM_FIELDS:
+                if not isinstance(value, str):
+                    return False
+            elif field == "confidence":
+                if not _is_int(value):
+                    return False
+            elif field == "references":
+                if not isinstance(value, list) or not all(isinstance(r, str) for r in value):
+                    return False
+            else:
+                return False
+        return "from" in conn and "to" in conn
+
+    def add_connection(self, ctx_idx, conn):
+        row_idx = len(self.conn["ctx"])
+        row = self.conn
+        row["ctx"].append(ctx_idx)
+        indexed = isinstance(conn, dict)
+        if indexed:
+            src, dst = conn.get("from", ""), conn.get("to", "")
+            if not isinstance(src, str) or not isinstance(dst, str):
+                raise ValueError(f"cannot compile connection with non-string endpoints: {src!r} -> {dst!r}")
+        else:
+            src = dst = None
+        row["from"].append(self.sid(src) if indexed else NONE)
+        row["to"].append(self.sid(dst) if indexed else NONE)
+
+        # Index references exactly as KnowledgeBase.reindex does
+        refs_start = len(self.ref_str)
+        if indexed:
+            refs = conn.get("references", [])
+            if isinstance(refs, str):
+                refs = [refs] if refs.strip() else []
+            for ref in refs if isinstance(refs, list) else []:
+                if isinstance(ref, str):
+                    self.ref_conn.append(row_idx)
+                    self.ref_str.append(self.sid(ref))
+        row["refs_start"].append(refs_start)
+        row["refs_end"].append(len(self.ref_str))
+
+        if indexed and self._standard_connection(conn):
+            row["layout"].append(self.layout("connection", conn))
+            row["raw"].append(NONE)
+            for field in ("rationale", "temporal_lag", "reversibility"):
+                row[field].append(self.sid(conn[field]) if field in conn else NONE)
+            for field, kind in _ENUM_FIELDS.items():
+                row[field].append(self.enum(kind, conn[field]) if field in conn else NONE)
+            self.confidence.append(conn.get("confidence", 0))
+        else:
+            row["layout"].append(NONE)
+            row["raw"].append(self.sid(json.dumps(conn, ensure_ascii=False)))
+            for field in ("rationale", "temporal_lag", "reversibility", *_ENUM_FIELDS):
+                row[field].append(NONE)
+            self.confidence.append(0)
+
+    def add_context(self, name, ctx):
+        ctx_idx = len(self.ctx_name)
+        self.ctx_name.append(self.sid(name))
+        if not isinstance(ctx, dict):
+            self.ctx_meta.append({"raw": ctx})
+            self.cat_ptr.extend([len(self.elem["ctx"])] * len(CATEGORIES))
+            self.conn_ptr.append(len(self.conn["ctx"]))
+            return
+
+        tabled = [cat for cat in CATEGORIES if isinstance(ctx.get(cat), list)]
+        if isinstance(ctx.get("connections"), list):
+            tabled.append("connections")
+        self.ctx_meta.append({
+            "keys": list(ctx),
+            "tabled": tabled,
+            "other": {k: v for k, v in ctx.items() if k not in tabled},
+        })
+        for cat_idx, cat in enumerate(CATEGORIES):
+            self.cat_ptr.append(len(self.elem["ctx"]))
+            if cat in tabled:
+                for entry in ctx[cat]:
+                    self.add_element(ctx_idx, cat_idx, entry)
+        if "connections" in tabled:
+            for conn in ctx["connections"]:
+                self.add_connection(ctx_idx, conn)
+        self.conn_ptr.append(len(self.conn["ctx"]))
+
+    # Output
+
+    def compile(self):
+        contexts = self.data.get("contexts")
+        if isinstance(contexts, dict):
+            for name, ctx in contexts.items():
+                self.add_context(name, ctx)
+        return self.finish()
+
+    def finish(self):
+        # Sorted string table, so lookups can binary-search it
+        ordered = sorted(self.strings)
+        remap = array("I", bytes(4 * len(ordered)))
+        for new_id, text in enumerate(ordered):
+            remap[self.strings[text]] = new_id
+
+        def ids(values):
+            return array("I", (v if v == NONE else remap[v] for v in values))
+
+        blob = bytearray()
+        offsets = array("I", [0])
+        for text in ordered:
+            blob += text.encode("utf-8")
+            offsets.append(len(blob))
+
+        sections = {"strings": bytes(blob), "string_offsets": offsets}
+        sections["ctx_name"] = ids(self.ctx_name)
+        sections["ctx_cat_ptr"] = array("I", self.cat_ptr + [len(self.elem["ctx"])])
+        sections["ctx_conn_ptr"] = array("I", self.conn_ptr)
+
+        for col in _ELEM_COLUMNS:
+            values = self.elem[col]
+            sections[f"elem_{col}"] = ids(values) if col in ("name", "raw") else array("I", values)
+        sections["elem_relevance"] = array("d", self.relevance)
+        elem_names = sections["elem_name"]
+        sections["elem_by_name"] = array("I", sorted(
+            (i for i in range(len(elem_names)) if elem_names[i] != NONE), key=elem_names.__getitem__,
+        ))
+
+        string_cols = {"from", "to", "rationale", "temporal_lag", "reversibility", "raw"}
+        for col in _CONN_COLUMNS:
+            values = self.conn[col]
+            sections[f"conn_{col}"] = ids(values) if col in string_cols else array("I", values)
+        sections["conn_confidence"] = array("q", self.confidence)
+
+        ref_str = ids(self.ref_str)
+        sections["ref_conn"] = array("I", self.ref_conn)
+        sections["ref_str"] = ref_str
+        sections["ref_by_str"] = array("I", sorted(range(len(ref_str)), key=ref_str.__getitem__))
+
+        sections.update(self._adjacency(sections))
+
+        top_keys = list(self.data)
+        meta = {
+            "format": FORMAT_VERSION,
+            "keys": top_keys,
+            "global": {k: v for k, v in self.data.items() if k != "contexts" or not isinstance(v, dict)},
+            "contexts_tabled": isinstance(self.data.get("contexts"), dict),
+            "contexts": self.ctx_meta,
+            "enums": self.enums,
+            "layouts": self.layouts,
+        }
+        sections["meta"] = json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return sections
+
+    def _adjacency(self, sections):
+        """Per-context CSR over endpoint names, nodes sorted by string id."""
+        conn_from, conn_to = sections["conn_from"], sections["conn_to"]
+        conn_ptr = self.conn_ptr
+        node_str = array("I")
+        node_ptr = array("I", [0])
+        out_ptr, out_idx = array("I", [0]), array("I")
+        in_ptr, in_idx = array("I", [0]), array("I")
+        for ctx_idx in range(len(self.ctx_name)):
+            start, end = conn_ptr[ctx_idx], conn_ptr[ctx_idx + 1]
+            outs = defaultdict(list)
+            ins = defaultdict(list)
+            for row in range(start, end):
+                if conn_from[row] == NONE:
+                    continue
+                outs[conn_from[row]].append(row - start)
+                ins[conn_to[row]].append(row - start)
+            for node in sorted(set(outs) | set(ins)):
+                node_str.append(node)
+                out_idx.extend(outs.get(node, ()))
+                out_ptr.append(len(out_idx))
+                in_idx.extend(ins.get(node, ()))
+                in_ptr.append(len(in_idx))
+            node_ptr.append(len(node_str))
+        return {
+            "node_str": node_str, "node_ptr": node_ptr,
+            "out_ptr": out_ptr, "out_idx": out_idx,
+            "in_ptr": in_ptr, "in_idx": in_idx,
+        }
+
+
+def _source_digest(text):
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+def compile_kb(kb_path=KB_PATH, out_path=None):
+    """Compile a KB JSON file to its .kbc artifact; returns the artifact path."""
+    kb_path = Path(kb_path)
+    out_path = Path(out_path) if out_path is not None else default_artifact_path(kb_path)
+    with open(kb_path, "r", encoding="utf-8") as f:
+        text = f.read()
+    sections = _Compiler(json.loads(text)).compile()
+
+    table_size = HEADER.size + SECTION.size * len(sections)
+    payload = bytearray()
+    entries = []
+    for name, value in sections.items():
+        if isinstance(value, array):
+            if sys.byteorder != "little":
+                value = array(value.typecode, value)
+                value.byteswap()
+            typecode, raw = value.typecode, value.tobytes()
+        else:
+            typecode, raw = "B", bytes(value)
+        payload += b"\0" * (-(table_size + len(payload)) % 8)
+        entries.append(SECTION.pack(name.encode("ascii"), table_size + len(payload), len(raw), typecode.encode("ascii")))
+        payload += raw
+    body = b"".join(entries) + bytes(payload)
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, LITTLE, len(sections), 0,
+        _source_digest(text), hashlib.sha256(body).digest(),
+    )
+
+    write_bytes_atomic(out_path, header + body)
+    return out_path
+
+
+# ── Loading ─────────────────────────────────────────────────────────────
+
+
+class ArtifactError(ValueError):
+    """A .kbc file is malformed, from another format version, or corrupt."""
+
+
+class _Contexts(Mapping):
+    """Read-only {context: dict} view that materialises contexts on access."""
+
+    def __init__(self, kb):
+        self._kb = kb
+
+    def __getitem__(self, ctx_name):
+        return self._kb.context(ctx_name)
+
+    def __iter__(self):
+        return iter(self._kb.context_names)
+
+    def __len__(self):
+        return len(self._kb.context_names)
+
+
+class CompiledKB:
+    """
+    Memory-mapped .kbc artifact with the lookup API of KnowledgeBase.
+
+    Returned dicts and lists are shared, cached decodes of the artifact;
+    treat them as read-only (edit the JSON KB through KBTransaction).
+    """
+
+    def __init__(self, path, verify=True):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = memoryview(self._mmap)
+        if len(buf) < HEADER.size:
+            raise ArtifactError(f"{self.path}: truncated header")
+        magic, version, order, n_sections, _, source, payload = HEADER.unpack_from(buf)
+        if magic != MAGIC:
+            raise ArtifactError(f"{self.path}: not a compiled KB artifact")
+        if version != FORMAT_VERSION or order != LITTLE:
+            raise ArtifactError(f"{self.path}: unsupported artifact format {version}; recompile it")
+        if verify and hashlib.sha256(buf[HEADER.size:]).digest() != payload:
+            raise ArtifactError(f"{self.path}: payload checksum mismatch")
+        self.source_sha256 = source.hex()
+
+        swap = sys.byteorder != "little"
+        self._sections = {}
+        for i in range(n_sections):
+            name, offset, length, typecode = SECTION.unpack_from(buf, HEADER.size + i * SECTION.size)
+            name = name.rstrip(b"\0").decode("ascii")
+            typecode = typecode.rstrip(b"\0").decode("ascii")
+            view = buf[offset:offset + length]
+            if typecode != "B":
+                if swap:
+                    view = array(typecode, view.tobytes())
+                    view.byteswap()
+                else:
+                    view = view.cast(typecode)
+            self._sections[name] = view
+
+        s = self._sections
+        self._offsets = s["string_offsets"]
+        self._blob = s["strings"]
+        self._meta = json.loads(bytes(s["meta"]))
+        self._strings = {}
+        self._context_cache = {}
+        self._conn_cache = {}
+        self._data = None
+        self._lazy = {}
+
+        self.context_names = [self._str(sid) for sid in s["ctx_name"]]
+        self._ctx_index = {name: i for i, name in enumerate(self.context_names)}
+
+    # ── String table ─────────────────────────────────────────────────────
+
+    def _str(self, sid):
+        text = self._strings.get(sid)
+        if text is None:
+            text = self._strings[sid] = bytes(self._blob[self._offsets[sid]:self._offsets[sid + 1]]).decode("utf-8")
+        return text
+
+    def _sid(self, text):
+        """String id of ``text``, or None if the artifact doesn't contain it."""
+        if not isinstance(text, str):
+            return None
+        lo, hi = 0, len(self._offsets) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._str(mid) < text:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < len(self._offsets) - 1 and self._str(lo) == text else None
+
+    def _range(self, column, ids, key, lo=0, hi=None):
+        """[lo, hi) of the run of ``ids`` (a permutation) whose column value is ``key``."""
+        hi = len(ids) if hi is None else hi
+        first, last = lo, hi
+        while first < last:
+            mid = (first + last) // 2
+            if column[ids[mid]] < key:
+                first = mid + 1
+            else:
+                last = mid
+        end, last = first, hi
+        while end < last:
+            mid = (end + last) // 2
+            if column[ids[mid]] <= key:
+                end = mid + 1
+            else:
+                last = mid
+        return first, end
+
+    # ── Row decoding ─────────────────────────────────────────────────────
+
+    def _element(self, row):
+        s = self._sections
+        layout = s["elem_layout"][row]
+        if layout == NONE:
+            return json.loads(self._str(s["elem_raw"][row]))
+        entry = {}
+        for key in self._meta["layouts"]["element"][layout]:
+            if key == "name":
+                entry["name"] = self._str(s["elem_name"][row])
+            else:
+                kind = key.split(":", 1)[1]
+                value = s["elem_relevance"][row]
+                entry["relevance"] = None if kind == "none" else int(value) if kind == "int" else value
+        return entry
+
+    def _connection(self, row):
+        s = self._sections
+        layout = s["conn_layout"][row]
+        if layout == NONE:
+            return json.loads(self._str(s["conn_raw"][row]))
+        enums = self._meta["enums"]
+        conn = {}
+        for field in self._meta["layouts"]["connection"][layout]:
+            if field in _ENUM_FIELDS:
+                conn[field] = enums[_ENUM_FIELDS[field]][s[f"conn_{field}"][row]]
+            elif field == "confidence":
+                conn[field] = s["conn_confidence"][row]
+            elif field == "references":
+                ref_str = s["ref_str"]
+                conn[field] = [self._str(ref_str[i]) for i in range(s["conn_refs_start"][row], s["conn_refs_end"][row])]
+            else:
+                conn[field] = self._str(s[f"conn_{field}"][row])
+        return conn
+
+    def context(self, ctx_name):
+        """One context dict, decoded on first access."""
+        ctx = self._context_cache.get(ctx_name)
+        if ctx is not None:
+            return ctx
+        ctx_idx = self._ctx_index[ctx_name]
+        meta = self._meta["contexts"][ctx_idx]
+        if "raw" in meta:
+            ctx = meta["raw"]
+        else:
+            cat_ptr = self._sections["ctx_cat_ptr"]
+            ctx = {}
+            for key in meta["keys"]:
+                if key not in meta["tabled"]:
+                    ctx[key] = meta["other"][key]
+                elif key == "connections":
+                    ctx[key] = self.connections(ctx_name)
+                else:
+                    pos = ctx_idx * len(CATEGORIES) + CATEGORIES.index(key)
+                    ctx[key] = [self._element(row) for row in range(cat_ptr[pos], cat_ptr[pos + 1])]
+        self._context_cache[ctx_name] = ctx
+        return ctx
+
+    @property
+    def data(self):
+        """The full KB document (decoded once, then cached)."""
+        if self._data is None:
+            meta = self._meta
+            document = {}
+            for key in meta["keys"]:
+                if key == "contexts" and meta["contexts_tabled"]:
+                    document[key] = {name: self.context(name) for name in self.context_names}
+                else:
+                    document[key] = meta["global"][key]
+            self._data = document
+        return self._data
+
+    def is_current(self, kb_path):
+        """True if ``kb_path`` is the JSON this artifact was compiled from."""
+        with open(kb_path, "r", encoding="utf-8") as f:
+            return _source_digest(f.read()).hex() == self.source_sha256
+
+    def close(self):
+        self._sections = {}
+        self._offsets = self._blob = None
+        self._mmap.close()
+
+    # ── Iteration (KnowledgeBase API) ────────────────────────────────────
+
+    @property
+    def contexts(self):
+        return _Contexts(self)
+
+    def iter_contexts(self):
+        """Yield (context name, context dict), skipping malformed entries."""
+        for ctx_name in self.context_names:
+            ctx = self.context(ctx_name)
+            if isinstance(ctx, dict):
+                yield ctx_name, ctx
+
+    def iter_elements(self, categories=CATEGORIES):
+        """Yield (context, category, entry) for every category list entry."""
+        for ctx_name, ctx in self.iter_contexts():
+            for cat in categories:
+                entries = ctx.get(cat, [])
+                if isinstance(entries, list):
+                    for entry in entries:
+                        yield ctx_name, cat, entry
+
+    def iter_connections(self):
+        """Yield (context, index, connection) for every connection dict."""
+        for ctx_name in self.context_names:
+            for idx, conn in enumerate(self.connections(ctx_name)):
+                if isinstance(conn, dict):
+                    yield ctx_name, idx, conn
+
+    def connections(self, ctx_name):
+        conns = self._conn_cache.get(ctx_name)
+        if conns is None:
+            ctx_idx = self._ctx_index.get(ctx_name)
+            if ctx_idx is None or "connections" not in self._meta["contexts"][ctx_idx].get("tabled", ()):
+                return []
+            ptr = self._sections["ctx_conn_ptr"]
+            conns = self._conn_cache[ctx_name] = [
+                self._connection(row) for row in range(ptr[ctx_idx], ptr[ctx_idx + 1])
+            ]
+        return conns
+
+    def total_connections(self):
+        ptr = self._sections["ctx_conn_ptr"]
+        return sum(
+            ptr[i + 1] - ptr[i] for i, meta in enumerate(self._meta["contexts"])
+            if "connections" in meta.get("tabled", ())
+        )
+
+    # ── Element lookups ──────────────────────────────────────────────────
+
+    def _element_rows(self, name):
+        sid = self._sid(name)
+        if sid is None:
+            return []
+        ids = self._sections["elem_by_name"]
+        lo, hi = self._range(self._sections["elem_name"], ids, sid)
+        return [ids[i] for i in range(lo, hi)]
+
+    def categories_of(self, name):
+        """Set of categories an element name appears in, across all contexts."""
+        cat = self._sections["elem_cat"]
+        return {CATEGORIES[cat[row]] for row in self._element_rows(name)}
+
+    def contexts_of(self, name):
+        ctx = self._sections["elem_ctx"]
+        return [self.context_names[ctx[row]] for row in self._element_rows(name)]
+
+    def element_category(self, ctx_name, name):
+        ctx_idx = self._ctx_index.get(ctx_name)
+        s = self._sections
+        for row in self._element_rows(name):
+            if s["elem_ctx"][row] == ctx_idx:
+                return CATEGORIES[s["elem_cat"][row]]
+        return None
+
+    def element_names(self, ctx_name):
+        return set(self.context_elements.get(ctx_name, {}))
+
+    def connected_names(self, ctx_name):
+        """Element names used as a connection endpoint in a context."""
+        ctx_idx = self._ctx_index.get(ctx_name)
+        if ctx_idx is None:
+            return set()
+        s = self._sections
+        return {self._str(s["node_str"][n]) for n in range(s["node_ptr"][ctx_idx], s["node_ptr"][ctx_idx + 1])}
+
+    def orphans(self, ctx_name):
+        """{name: category} for elements listed in a context but never connected."""
+        connected = self.connected_names(ctx_name)
+        return {
+            name: cat for name, cat in self.context_elements.get(ctx_name, {}).items()
+            if name not in connected
+        }
+
+    # ── Connection lookups ───────────────────────────────────────────────
+
+    def _node(self, ctx_name, name):
+        ctx_idx = self._ctx_index.get(ctx_name)
+        sid = self._sid(name)
+        if ctx_idx is None or sid is None:
+            return None
+        s = self._sections
+        lo, hi = s["node_ptr"][ctx_idx], s["node_ptr"][ctx_idx + 1]
+        node_str = s["node_str"]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if node_str[mid] < sid:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < s["node_ptr"][ctx_idx + 1] and node_str[lo] == sid else None
+
+    def _adjacent(self, ctx_name, name, direction):
+        node = self._node(ctx_name, name)
+        if node is None:
+            return []
+        ptr, idx = self._sections[f"{direction}_ptr"], self._sections[f"{direction}_idx"]
+        return list(idx[ptr[node]:ptr[node + 1]])
+
+    def find_connections(self, ctx_name, src, dst):
+        """[(index, connection), ...] for every src -> dst connection in a context."""
+        conns = self.connections(ctx_name)
+        return [
+            (idx, conns[idx]) for idx in self._adjacent(ctx_name, src, "out")
+            if conns[idx].get("to", "") == dst
+        ]
+
+    def get_connection(self, ctx_name, src, dst):
+        """First src -> dst connection in a context, or None."""
+        matches = self.find_connections(ctx_name, src, dst)
+        return matches[0][1] if matches else None
+
+    def successors(self, ctx_name, name):
+        conns = self.connections(ctx_name)
+        return [conns[idx]["to"] for idx in self._adjacent(ctx_name, name, "out")]
+
+    def predecessors(self, ctx_name, name):
+        conns = self.connections(ctx_name)
+        return [conns[idx]["from"] for idx in self._adjacent(ctx_name, name, "in")]
+
+    def connections_citing(self, reference):
+        """[(context, index, connection), ...] listing ``reference`` verbatim."""
+        sid = self._sid(reference)
+        if sid is None:
+            return []
+        s = self._sections
+        ids = s["ref_by_str"]
+        lo, hi = self._range(s["ref_str"], ids, sid)
+        result = []
+        for i in range(lo, hi):
+            row = s["ref_conn"][ids[i]]
+            ctx_idx = s["conn_ctx"][row]
+            ctx_name = self.context_names[ctx_idx]
+            idx = row - s["ctx_conn_ptr"][ctx_idx]
+            result.append((ctx_name, idx, self.connections(ctx_name)[idx]))
+        return result
+
+    # ── Index dicts (built on first use, as KnowledgeBase exposes them) ──
+
+    def _build_element_indexes(self):
+        s = self._sections
+        element_index = defaultdict(list)
+        context_elements = {name: {} for name, _ in self.iter_contexts()}
+        for row in range(len(s["elem_name"])):
+            sid = s["elem_name"][row]
+            if sid == NONE:
+                continue
+            name = self._str(sid)
+            ctx_name = self.context_names[s["elem_ctx"][row]]
+            cat = CATEGORIES[s["elem_cat"][row]]
+            element_index[name].append((ctx_name, cat))
+            context_elements[ctx_name].setdefault(name, cat)
+        self._lazy["element_index"] = dict(element_index)
+        self._lazy["context_elements"] = context_elements
+
+    def _build_edge_indexes(self):
+        s = self._sections
+        out_edges, in_edges, edge_index = {}, {}, defaultdict(list)
+        for ctx_idx, ctx_name in enumerate(self.context_names):
+            if not isinstance(self.context(ctx_name), dict):
+                continue
+            outs, ins = {}, {}
+            conns = self.connections(ctx_name)
+            for node in range(s["node_ptr"][ctx_idx], s["node_ptr"][ctx_idx + 1]):
+                name = self._str(s["node_str"][node])
+                if s["out_ptr"][node + 1] > s["out_ptr"][node]:
+                    outs[name] = list(s["out_idx"][s["out_ptr"][node]:s["out_ptr"][node + 1]])
+                if s["in_ptr"][node + 1] > s["in_ptr"][node]:
+                    ins[name] = list(s["in_idx"][s["in_ptr"][node]:s["in_ptr"][node + 1]])
+            for idx, conn in enumerate(conns):
+                if isinstance(conn, dict):
+                    edge_index[(ctx_name, conn.get("from", ""), conn.get("to", ""))].append(idx)
+            out_edges[ctx_name] = outs
+            in_edges[ctx_name] = ins
+        self._lazy.update(out_edges=out_edges, in_edges=in_edges, edge_index=dict(edge_index))
+
+    def _build_reference_index(self):
+        s = self._sections
+        reference_index = defaultdict(list)
+        for i in range(len(s["ref_str"])):
+            row = s["ref_conn"][i]
+            ctx_idx = s["conn_ctx"][row]
+            reference_index[self._str(s["ref_str"][i])].append(
+                (self.context_names[ctx_idx], row - s["ctx_conn_ptr"][ctx_idx])
+            )
+        self._lazy["reference_index"] = dict(reference_index)
+
+    def _index(self, name, builder):
+        if name not in self._lazy:
+            builder()
+        return self._lazy[name]
+
+    element_index = property(lambda self: self._index("element_index", self._build_element_indexes))
+    context_elements = property(lambda self: self._index("context_elements", self._build_element_indexes))
+    out_edges = property(lambda self: self._index("out_edges", self._build_edge_indexes))
+    in_edges = property(lambda self: self._index("in_edges", self._build_edge_indexes))
+    edge_index = property(lambda self: self._index("edge_index", self._build_edge_indexes))
+    reference_index = property(lambda self: self._index("reference_index", self._build_reference_index))
+
+
+def load_compiled(kb_path=KB_PATH, artifact_path=None, verify=True):
+    """
+    CompiledKB for ``kb_path`` if its artifact exists and is up to date,
+    otherwise the JSON-backed KnowledgeBase from load_kb(); both offer the
+    same read API.
+    """
+    artifact_path = Path(artifact_path) if artifact_path is not None else default_artifact_path(kb_path)
+    if artifact_path.exists():
+        try:
+            compiled = CompiledKB(artifact_path, verify=verify)
+        except ArtifactError:
+            compiled = None
+        if compiled is not None and compiled.is_current(kb_path):
+            return compiled
+    return load_kb(kb_path)
@@ -0,0 +1,303 @@
+"""
+Compact, column-oriented in-memory form of a KB's connections.
+
+A loaded KB holds every connection as a dict that repeats long element
+names, type and enum strings and reference strings. ConnectionTable keeps
+one row per connection in typed ``array`` columns instead:
+
+  ctx, index                  context id and position in its list
+  src, dst                    interned element-name ids
+  from_type ... reversibility small-int codes into per-field vocabularies
+  confidence                  signed int
+  rationale                   interned text id
+  ref_ptr / ref_ids           references as a CSR list of interned ids
+  layout                      which fields the row has, in which order
+
+Strings live once in StringPool objects, so equal names, rationales and
+references share one id and can be compared or grouped as integers. The
+columns support the buffer protocol (``numpy.asarray(table.column("src"))``
+is a zero-copy view) and ``row(i)`` / iteration give ConnectionRow views
+with dict-style ``get``/``[]`` access. ``to_dict`` / ``to_contexts``
+convert back to the original dicts, key order included. Rows with fields
+or value types outside this layout keep their original dict.
+"""
+
+from array import array
+
+from .graph import adjacency
+
+ENUM_FIELDS = ("from_type", "to_type", "polarity", "strength", "temporal_lag", "reversibility")
+MISSING = -1
+
+_STR_FIELDS = ("from", "to", "rationale", *ENUM_FIELDS)
+_KNOWN_FIELDS = set(_STR_FIELDS) | {"confidence", "references"}
+_RAW = 0   # layout id of rows stored as their original dict
+
+
+def _pack(values, signed=False):
+    """Smallest array typecode holding every value."""
+    lo = min(values, default=0)
+    hi = max(values, default=0)
+    for code in ("bhiq" if signed else "BHIQ"):
+        a = array(code)
+        bits = a.itemsize * 8
+        low, high = (-(1 << bits - 1), (1 << bits - 1) - 1) if signed else (0, (1 << bits) - 1)
+        if low <= lo and hi <= high:
+            a.extend(values)
+            return a
+    raise OverflowError("value out of 64-bit range")
+
+
+class StringPool:
+    """Interned strings: ``intern(text)`` -> id, ``pool[id]`` -> text."""
+
+    __slots__ = ("strings", "ids")
+
+    def __init__(self):
+        self.strings = []
+        self.ids = {}
+
+    def intern(self, text):
+        sid = self.ids.get(text)
+        if sid is None:
+            sid = self.ids[text] = len(self.strings)
+            self.strings.append(text)
+        return sid
+
+    def get(self, text):
+        """Id of ``text``, or None if it was never interned."""
+        return self.ids.get(text)
+
+    def __getitem__(self, sid):
+        return self.strings[sid]
+
+    def __len__(self):
+        return len(self.strings)
+
+
+class ConnectionRow:
+    """Lightweight view of one table row."""
+
+    __slots__ = ("table", "row")
+
+    def __init__(self, table, row):
+        self.table = table
+        self.row = row
+
+    @property
+    def context(self):
+        return self.table.contexts[self.table.column("ctx")[self.row]]
+
+    @property
+    def index(self):
+        return self.table.column("index")[self.row]
+
+    @property
+    def src_id(self):
+        return self.table.column("src")[self.row]
+
+    @property
+    def dst_id(self):
+        return self.table.column("dst")[self.row]
+
+    @property
+    def ref_ids(self):
+        ptr = self.table.column("ref_ptr")
+        return self.table.column("ref_ids")[ptr[self.row]:ptr[self.row + 1]]
+
+    def code(self, field):
+        """Vocabulary code of an enum field (MISSING if absent)."""
+        return self.table.column(field)[self.row]
+
+    def get(self, field, default=None):
+        return self.table.value(self.row, field, default)
+
+    def __getitem__(self, field):
+        value = self.table.value(self.row, field, _ABSENT)
+        if value is _ABSENT:
+            raise KeyError(field)
+        return value
+
+    def __contains__(self, field):
+        return self.table.value(self.row, field, _ABSENT) is not _ABSENT
+
+    def to_dict(self):
+        return self.table.to_dict(self.row)
+
+    def __repr__(self):
+        return f"ConnectionRow({self.context}[{self.index}]: {self.get('from')} -> {self.get('to')})"
+
+
+_ABSENT = object()
+
+
+class ConnectionTable:
+    """Column-oriented table of every connection dict in a KB."""
+
+    def __init__(self, context_connections):
+        """
+        Args:
+            context_connections: iterable of (context name, [connection, ...])
+        """
+        self.contexts = []
+        self.elements = StringPool()
+        self.texts = StringPool()
+        self.references = StringPool()
+        self.vocab = {field: StringPool() for field in ENUM_FIELDS}
+        self.layouts = [None]          # layout id -> tuple of field names; 0 = raw
+        self.raw = {}                  # row -> original dict for raw rows
+        self._context_rows = {}
+
+        layout_ids = {}
+        cols = {name: [] for name in ("ctx", "index", "src", "dst", "rationale", "layout", *ENUM_FIELDS)}
+        confidence = []
+        ref_ptr = [0]
+        ref_ids = []
+
+        for ctx_name, conns in context_connections:
+            ctx_id = len(self.contexts)
+            self.contexts.append(ctx_name)
+            first = len(cols["ctx"])
+            for idx, conn in enumerate(conns):
+                if not isinstance(conn, dict):
+                    continue
+                row = len(cols["ctx"])
+                cols["ctx"].append(ctx_id)
+                cols["index"].append(idx)
+                src, dst = conn.get("from", ""), conn.get("to", "")
+                cols["src"].append(self.elements.intern(src if isinstance(src, str) else str(src)))
+                cols["dst"].append(self.elements.intern(dst if isinstance(dst, str) else str(dst)))
+
+                refs = conn.get("references", [])
+                standard = (
+                    set(conn) <= _KNOWN_FIELDS
+                    and all(isinstance(conn[f], str) for f in _STR_FIELDS if f in conn)
+                    and (
+                        "confidence" not in conn
+                        or (isinstance(conn["confidence"], int) and not isinstance(conn["confidence"], bool))
+                    )
+                    and isinstance(refs, list) and all(isinstance(r, str) for r in refs)
+                )
+                if standard:
+                    keys = tuple(conn)
+                    layout = layout_ids.get(keys)
+                    if layout is None:
+                        layout = layout_ids[keys] = len(self.layouts)
+                        self.layouts.append(keys)
+                    cols["layout"].append(layout)
+                    for field in ENUM_FIELDS:
+                        cols[field].append(self.vocab[field].intern(conn[field]) if field in conn else MISSING)
+                    cols["rationale"].append(self.texts.intern(conn["rationale"]) if "rationale" in conn else MISSING)
+                    confidence.append(conn.get("confidence", 0))
+                    ref_ids.extend(self.references.intern(r) for r in refs)
+                else:
+                    cols["layout"].append(_RAW)
+                    self.raw[row] = conn
+                    for field in ENUM_FIELDS:
+                        cols[field].append(MISSING)
+                    cols["rationale"].append(MISSING)
+                    confidence.append(0)
+                ref_ptr.append(len(ref_ids))
+            self._context_rows[ctx_name] = range(first, len(cols["ctx"]))
+
+        self._columns = {
+            name: _pack(values, signed=name in ENUM_FIELDS or name == "rationale")
+            for name, values in cols.items()
+        }
+        self._columns["confidence"] = _pack(confidence, signed=True)
+        self._columns["ref_ptr"] = _pack(ref_ptr)
+        self._columns["ref_ids"] = _pack(ref_ids)
+
+    @classmethod
+    def from_kb(cls, kb):
+        """Table over a KnowledgeBase (or CompiledKB), in context order."""
+        return cls((ctx_name, kb.connections(ctx_name)) for ctx_name, _ in kb.iter_contexts())
+
+    # ── Columns ──────────────────────────────────────────────────────────
+
+    def __len__(self):
+        return len(self._columns["ctx"])
+
+    def column(self, name):
+        """A typed array column (see the module docstring for names)."""
+        return self._columns[name]
+
+    def code(self, field, value):
+        """Code of ``value`` in an enum field's vocabulary, or None."""
+        return self.vocab[field].get(value)
+
+    def rows(self, ctx_name=None):
+        """Row numbers, optionally for one context."""
+        if ctx_name is None:
+            return range(len(self))
+        return self._context_rows.get(ctx_name, range(0))
+
+    def where(self, ctx_name=None, **criteria):
+        """
+        Rows whose enum fields equal the given values, e.g.
+        ``where(polarity="-", strength="strong")``; compared as codes.
+        """
+        rows = self.rows(ctx_name)
+        for field, value in criteria.items():
+            code = self.code(field, value)
+            if code is None:
+                return []
+            col = self._columns[field]
+            rows = [r for r in rows if col[r] == code]
+        return list(rows)
+
+    def edges(self, ctx_name=None):
+        """(src id, dst id) per row."""
+        src, dst = self._columns["src"], self._columns["dst"]
+        return [(src[r], dst[r]) for r in self.rows(ctx_name)]
+
+    def adjacency(self, ctx_name):
+        """{src id: set(dst ids)} for one context, for kb_lib.graph."""
+        return adjacency(self.edges(ctx_name))
+
+    def nbytes(self):
+        """Bytes held by the columns (excluding the string pools)."""
+        return sum(col.itemsize * len(col) for col in self._columns.values())
+
+    # ── Rows and dicts ───────────────────────────────────────────────────
+
+    def row(self, r):
+        return ConnectionRow(self, r)
+
+    def __iter__(self):
+        for r in range(len(self)):
+            yield ConnectionRow(self, r)
+
+    def value(self, r, field, default=None):
+        """One field of one row, as it appears in the connection dict."""
+        if self._columns["layout"][r] == _RAW:
+            return self.raw[r].get(field, default)
+        if field not in self.layouts[self._columns["layout"][r]]:
+            return default
+        if field == "from":
+            return self.elements[self._columns["src"][r]]
+        if field == "to":
+            return self.elements[self._columns["dst"][r]]
+        if field == "rationale":
+            return self.texts[self._columns["rationale"][r]]
+        if field == "confidence":
+            return self._columns["confidence"][r]
+        if field == "references":
+            ptr = self._columns["ref_ptr"]
+            refs = self._columns["ref_ids"]
+            return [self.references[i] for i in refs[ptr[r]:ptr[r + 1]]]
+        return self.vocab[field][self._columns[field][r]]
+
+    def to_dict(self, r):
+        """The connection dict of row ``r``, with its original key order."""
+        layout = self._columns["layout"][r]
+        if layout == _RAW:
+            return dict(self.raw[r])
+        return {field: self.value(r, field) for field in self.layouts[layout]}
+
+    def to_dicts(self, ctx_name=None):
+        return [self.to_dict(r) for r in self.rows(ctx_name)]
+
+    def to_contexts(self):
+        """{context: [connection dict, ...]} for every context in the table."""
+        return {ctx_name: self.to_dicts(ctx_name) for ctx_name in self.contexts}
@@ -0,0 +1,198 @@
+"""
+Batch application of connection corrections keyed by endpoint substrings.
+
+KB maintenance scripts identify the connection to fix by context plus a
+substring of its ``from`` and ``to`` element names::
+
+    {"context": "arctic_fjord",
+     "from_substr": "Escaped farmed salmon",
+     "to_substr": "Wild Atlantic salmon",
+     "changes": {"reversibility": "irreversible", ...}}
+
+Rather than lowercasing and scanning every connection per correction,
+``EndpointIndex`` folds each distinct endpoint name once and, for large
+contexts, indexes the names by character trigrams; a lookup intersects
+the posting sets of the query's trigrams and only verifies the few
+surviving names. All corrections are resolved before anything is
+modified, so strict mode can refuse to touch the KB when a correction
+matches zero or several connections, and dry-run mode can report the
+diff without applying it.
+"""
+
+from collections import defaultdict
+
+NGRAM = 3
+# Below this many distinct names per side a plain scan of the pre-folded
+# names beats building trigram postings
+SCAN_LIMIT = 256
+
+
+class CorrectionError(Exception):
+    """Raised in strict mode when corrections don't resolve to one connection each."""
+
+    def __init__(self, problems):
+        self.problems = problems
+        super().__init__(
+            f"{len(problems)} correction(s) did not resolve to exactly one connection:\n"
+            + "\n".join(f"  {p['message']}" for p in problems)
+        )
+
+
+class EndpointIndex:
+    """Folded-name (and, for large contexts, trigram) index over the ``from`` and ``to`` names of one context's connections."""
+
+    def __init__(self, connections, case_sensitive=False):
+        self.case_sensitive = case_sensitive
+        self._sides = {side: self._build(connections, side) for side in ("from", "to")}
+
+    def _fold(self, text):
+        return text if self.case_sensitive else text.lower()
+
+    def _build(self, connections, side):
+        names = defaultdict(set)   # folded name -> connection indices
+        for idx, conn in enumerate(connections):
+            if isinstance(conn, dict):
+                names[self._fold(conn.get(side, ""))].add(idx)
+        if len(names) <= SCAN_LIMIT:
+            return names, None
+        grams = defaultdict(set)   # trigram -> folded names containing it
+        for name in names:
+            for i in range(len(name) - NGRAM + 1):
+                grams[name[i:i + NGRAM]].add(name)
+        return names, grams
+
+    def lookup(self, side, substr):
+        """Indices of connections whose ``side`` name contains ``substr``."""
+        names, grams = self._sides[side]
+        query = self._fold(substr)
+        if grams is None or len(query) < NGRAM:
+            candidates = names
+        else:
+            postings = sorted(
+                (grams.get(g, ()) for g in {query[i:i + NGRAM] for i in range(len(query) - NGRAM + 1)}),
+                key=len,
+            )
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                if not candidates:
+                    break
+                candidates &= posting
+        found = set()
+        for name in candidates:
+            if query in name:
+                found |= names[name]
+        return found
+
+    def find(self, from_substr, to_substr):
+        """Sorted indices of connections matching both substrings."""
+        return sorted(self.lookup("from", from_substr) & self.lookup("to", to_substr))
+
+
+def resolve_corrections(kb_data, corrections, case_sensitive=False):
+    """
+    Resolve every correction against the KB in one batch.
+
+    Returns:
+        (resolved, problems): ``resolved`` pairs each correction with its
+        sorted list of matching connection indices (None if the context is
+        missing); ``problems`` lists corrections that matched zero or
+        several connections, in correction order.
+    """
+    contexts = kb_data.get("contexts", {})
+    indexes = {}
+    resolved = []
+    problems = []
+
+    for corr in corrections:
+        ctx_name = corr["context"]
+        ctx = contexts.get(ctx_name)
+        if ctx is None:
+            resolved.append((corr, None))
+            problems.append({
+                "kind": "missing_context", "correction": corr,
+                "message": f"context '{ctx_name}' not found",
+            })
+            continue
+
+        index = indexes.get(ctx_name)
+        if index is None:
+            index = indexes[ctx_name] = EndpointIndex(ctx.get("connections", []), case_sensitive)
+        matches = index.find(corr["from_substr"], corr["to_substr"])
+        resolved.append((corr, matches))
+
+        where = f"'{corr['from_substr']}' -> '{corr['to_substr']}' in {ctx_name}"
+        if not matches:
+            problems.append({"kind": "no_match", "correction": corr, "message": f"no match for {where}"})
+        elif len(matches) > 1:
+            problems.append({
+                "kind": "ambiguous", "correction": corr, "matches": matches,
+                "message": f"multiple matches ({len(matches)}) for {where}",
+            })
+
+    return resolved, problems
+
+
+def apply_corrections(kb_data, corrections, strict=False, dry_run=False, case_sensitive=False):
+    """
+    Resolve and apply corrections, returning ``(changelog, problems)``.
+
+    Without ``strict``, unresolved corrections are skipped and ambiguous
+    ones use their first match. With ``strict``, any problem raises
+    CorrectionError before the KB is touched. With ``dry_run`` the
+    changelog is computed (later corrections see earlier ones' values)
+    but nothing is written to ``kb_data``.
+
+    Each changelog entry records context, index, from, to and the
+    ``old``/``new`` values of the fields that actually changed.
+    """
+    resolved, problems = resolve_corrections(kb_data, corrections, case_sensitive)
+    if strict and problems:
+        raise CorrectionError(problems)
+
+    contexts = kb_data.get("contexts", {})
+    pending = {}     # (context, index) -> {field: new value}
+    changelog = []
+
+    for corr, matches in resolved:
+        if not matches:
+            continue
+        ctx_name = corr["context"]
+        idx = matches[0]
+        conn = contexts[ctx_name]["connections"][idx]
+        updates = pending.setdefault((ctx_name, idx), {})
+
+        old_vals = {}
+        new_vals = {}
+        for field, new_val in corr["changes"].items():
+            old_val = updates.get(field, conn.get(field))
+            if old_val != new_val:
+                old_vals[field] = old_val
+                new_vals[field] = new_val
+                updates[field] = new_val
+
+        if old_vals:
+            changelog.append({
+                "context": ctx_name,
+                "index": idx,
+                "from": conn["from"],
+                "to": conn["to"],
+                "old": old_vals,
+                "new": new_vals,
+            })
+
+    if not dry_run:
+        for (ctx_name, idx), updates in pending.items():
+            contexts[ctx_name]["connections"][idx].update(updates)
+
+    return changelog, problems
+
+
+def format_diff(changelog, width=100):
+    """Unified-diff style lines describing a changelog."""
+    lines = []
+    for entry in changelog:
+        lines.append(f"@@ {entry['context']}[{entry['index']}] {entry['from'][:40]} -> {entry['to'][:40]}")
+        for field, old in entry["old"].items():
+            lines.append(f"-  {field}: {str(old)[:width]}")
+            lines.append(f"+  {field}: {str(entry['new'][field])[:width]}")
+    return lines
@@ -0,0 +1,124 @@
+"""
+Keyword classification with one compiled Aho-Corasick automaton.
+
+A rule table maps labels (topics, paper themes, audit markers) to keyword
+lists; a text gets every label one of whose keywords occurs in it as a
+substring, the same result as ``any(kw in text for kw in keywords)`` per
+label, but found in a single scan of the text however many rules there
+are.
+
+Rule tables live as JSON files in kb_lib/rules/::
+
+    {"description": "...", "rules": {"label": ["keyword", ...], ...}}
+
+Matching is case-sensitive and does not transform the text; callers
+lowercase text themselves, exactly as the scripts did before. Keywords
+are matched verbatim too, so a keyword containing capitals can only match
+text that kept them.
+"""
+
+import json
+from collections import deque
+from pathlib import Path
+
+RULES_DIR = Path(__file__).resolve().parent / "rules"
+
+_MATCHERS = {}
+
+
+class KeywordMatcher:
+    """Labels -> keyword lists, compiled into a deterministic automaton."""
+
+    def __init__(self, rules):
+        """
+        Args:
+            rules: {label: [keyword, ...]}; label order is kept in results
+        """
+        self.labels = list(rules)
+        self._rank = {label: i for i, label in enumerate(self.labels)}
+        self._build({label: list(keywords) for label, keywords in rules.items()})
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f)["rules"])
+
+    def _build(self, rules):
+        # Keyword trie; out[state] = labels of keywords ending at that state
+        goto = [{}]
+        out = [set()]
+        for label, keywords in rules.items():
+            for keyword in keywords:
+                state = 0
+                for ch in keyword:
+                    nxt = goto[state].get(ch)
+                    if nxt is None:
+                        goto.append({})
+                        out.append(set())
+                        nxt = goto[state][ch] = len(goto) - 1
+                    state = nxt
+                out[state].add(label)
+
+        # Failure links in BFS order, folding each state's suffix matches
+        # into its output set
+        fail = [0] * len(goto)
+        order = []
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            order.append(state)
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] |= out[fail[nxt]]
+
+        # Full transition table (only non-root targets stored), so scanning
+        # is one dict lookup per character with no failure-link walks
+        alphabet = {ch for trie in goto for ch in trie}
+        delta = [dict() for _ in goto]
+        delta[0] = dict(goto[0])
+        for state in order:
+            row = delta[state]
+            for ch in alphabet:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = delta[fail[state]].get(ch, 0)
+                if nxt:
+                    row[ch] = nxt
+
+        self._delta = delta
+        self._out = [frozenset(labels) for labels in out]
+
+    def matched(self, text):
+        """Set of labels with at least one keyword in ``text``."""
+        delta = self._delta
+        out = self._out
+        found = set()
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+        return found
+
+    def match(self, text):
+        """Matched labels in rule-table order."""
+        return sorted(self.matched(text), key=self._rank.__getitem__)
+
+    def match_all(self, texts):
+        """``match`` for each of ``texts``."""
+        return [self.match(text) for text in texts]
+
+    def __contains__(self, label):
+        return label in self._rank
+
+
+def load_rules(name):
+    """Shared compiled matcher for kb_lib/rules/<name>.json."""
+    matcher = _MATCHERS.get(name)
+    if matcher is None:
+        matcher = _MATCHERS[name] = KeywordMatcher.from_file(RULES_DIR / f"{name}.json")
+    return matcher
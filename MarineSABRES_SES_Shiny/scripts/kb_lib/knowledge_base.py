@@ -0,0 +1,215 @@
+"""
+Indexed, load-once access to the DAPSI(W)R(M) knowledge base JSON files.
+
+A KnowledgeBase wraps the parsed JSON document (``kb.data`` is the plain
+dict, so scripts can still mutate and dump it) and builds lookup indexes
+in a single pass over all contexts:
+
+  element_index     element name -> [(context, category), ...]
+  context_elements  context -> {element name: category}
+  out_edges         context -> {from name: [connection index, ...]}
+  in_edges          context -> {to name: [connection index, ...]}
+  edge_index        (context, from, to) -> [connection index, ...]
+  reference_index   reference string -> [(context, connection index), ...]
+
+``load_kb(path)`` returns one shared instance per file (re-read only when
+the file changes on disk). Scripts that mutate ``kb.data`` in place should
+call ``kb.reindex()`` before relying on the indexes again.
+"""
+
+import json
+from collections import defaultdict
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DATA_DIR = PROJECT_ROOT / "data"
+KB_PATH = DATA_DIR / "ses_knowledge_db.json"
+OFFSHORE_WIND_KB_PATH = DATA_DIR / "ses_knowledge_db_offshore_wind.json"
+WP5_KB_PATH = DATA_DIR / "ses_knowledge_db_wp5_mechanisms.json"
+
+# Category keys in the KB, in DAPSI(W)R(M) order
+CATEGORIES = ["drivers", "activities", "pressures", "states", "impacts", "welfare", "responses"]
+
+
+def element_name(entry):
+    """Name of a category list entry ({name, relevance} dict or bare string)."""
+    if isinstance(entry, dict):
+        return entry.get("name") or entry.get("element_name")
+    if isinstance(entry, str):
+        return entry
+    return None
+
+
+class KnowledgeBase:
+    """Parsed KB document plus element, adjacency and reference indexes."""
+
+    def __init__(self, data, path=None):
+        self.data = data
+        self.path = Path(path) if path is not None else None
+        self.reindex()
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f), path)
+
+    # ── Index construction ───────────────────────────────────────────────
+
+    def reindex(self):
+        """(Re)build every index from ``self.data`` in one pass."""
+        self.element_index = defaultdict(list)
+        self.context_elements = {}
+        self.out_edges = {}
+        self.in_edges = {}
+        self.edge_index = defaultdict(list)
+        self.reference_index = defaultdict(list)
+
+        for ctx_name, ctx in self.iter_contexts():
+            elements = {}
+            for cat in CATEGORIES:
+                entries = ctx.get(cat, [])
+                if not isinstance(entries, list):
+                    continue
+                for entry in entries:
+                    name = element_name(entry)
+                    if not name:
+                        continue
+                    self.element_index[name].append((ctx_name, cat))
+                    elements.setdefault(name, cat)
+            self.context_elements[ctx_name] = elements
+
+            out_edges = defaultdict(list)
+            in_edges = defaultdict(list)
+            for idx, conn in enumerate(self.connections(ctx_name)):
+                if not isinstance(conn, dict):
+                    continue
+                src, dst = conn.get("from", ""), conn.get("to", "")
+                out_edges[src].append(idx)
+                in_edges[dst].append(idx)
+                self.edge_index[(ctx_name, src, dst)].append(idx)
+                refs = conn.get("references", [])
+                if isinstance(refs, str):
+                    refs = [refs] if refs.strip() else []
+                for ref in refs if isinstance(refs, list) else []:
+                    self.reference_index[ref].append((ctx_name, idx))
+            self.out_edges[ctx_name] = dict(out_edges)
+            self.in_edges[ctx_name] = dict(in_edges)
+
+        self.element_index = dict(self.element_index)
+        self.edge_index = dict(self.edge_index)
+        self.reference_index = dict(self.reference_index)
+
+    # ── Iteration ────────────────────────────────────────────────────────
+
+    @property
+    def contexts(self):
+        contexts = self.data.get("contexts", {})
+        return contexts if isinstance(contexts, dict) else {}
+
+    def iter_contexts(self):
+        """Yield (context name, context dict), skipping malformed entries."""
+        for ctx_name, ctx in self.contexts.items():
+            if isinstance(ctx, dict):
+                yield ctx_name, ctx
+
+    def iter_elements(self, categories=CATEGORIES):
+        """Yield (context, category, entry) for every category list entry."""
+        for ctx_name, ctx in self.iter_contexts():
+            for cat in categories:
+                entries = ctx.get(cat, [])
+                if isinstance(entries, list):
+                    for entry in entries:
+                        yield ctx_name, cat, entry
+
+    def iter_connections(self):
+        """Yield (context, index, connection) for every connection dict."""
+        for ctx_name, _ in self.iter_contexts():
+            for idx, conn in enumerate(self.connections(ctx_name)):
+                if isinstance(conn, dict):
+                    yield ctx_name, idx, conn
+
+    def connections(self, ctx_name):
+        conns = self.contexts.get(ctx_name, {}).get("connections", [])
+        return conns if isinstance(conns, list) else []
+
+    def total_connections(self):
+        return sum(len(self.connections(ctx_name)) for ctx_name, _ in self.iter_contexts())
+
+    # ── Element lookups ──────────────────────────────────────────────────
+
+    def categories_of(self, name):
+        """Set of categories an element name appears in, across all contexts."""
+        return {cat for _, cat in self.element_index.get(name, [])}
+
+    def contexts_of(self, name):
+        return [ctx_name for ctx_name, _ in self.element_index.get(name, [])]
+
+    def element_category(self, ctx_name, name):
+        return self.context_elements.get(ctx_name, {}).get(name)
+
+    def element_names(self, ctx_name):
+        return set(self.context_elements.get(ctx_name, {}))
+
+    def connected_names(self, ctx_name):
+        """Element names used as a connection endpoint in a context."""
+        return set(self.out_edges.get(ctx_name, {})) | set(self.in_edges.get(ctx_name, {}))
+
+    def orphans(self, ctx_name):
+        """{name: category} for elements listed in a context but never connected."""
+        out_edges = self.out_edges.get(ctx_name, {})
+        in_edges = self.in_edges.get(ctx_name, {})
+        return {
+            name: cat for name, cat in self.context_elements.get(ctx_name, {}).items()
+            if name not in out_edges and name not in in_edges
+        }
+
+    # ── Connection lookups ───────────────────────────────────────────────
+
+    def find_connections(self, ctx_name, src, dst):
+        """[(index, connection), ...] for every src -> dst connection in a context."""
+        conns = self.connections(ctx_name)
+        return [(idx, conns[idx]) for idx in self.edge_index.get((ctx_name, src, dst), [])]
+
+    def get_connection(self, ctx_name, src, dst):
+        """First src -> dst connection in a context, or None."""
+        matches = self.edge_index.get((ctx_name, src, dst))
+        return self.connections(ctx_name)[matches[0]] if matches else None
+
+    def successors(self, ctx_name, name):
+        conns = self.connections(ctx_name)
+        return [conns[idx]["to"] for idx in self.out_edges.get(ctx_name, {}).get(name, [])]
+
+    def predecessors(self, ctx_name, name):
+        conns = self.connections(ctx_name)
+        return [conns[idx]["from"] for idx in self.in_edges.get(ctx_name, {}).get(name, [])]
+
+    def connections_citing(self, reference):
+        """[(context, index, connection), ...] listing ``reference`` verbatim."""
+        return [
+            (ctx_name, idx, self.connections(ctx_name)[idx])
+            for ctx_name, idx in self.reference_index.get(reference, [])
+        ]
+
+
+_LOADED = {}
+
+
+def load_kb(path=KB_PATH, reload=False):
+    """
+    Load a KB file once per process and return the shared KnowledgeBase.
+
+    The cached instance is reused until the file's size or mtime changes,
+    so several checks and helper modules share one parse and one set of
+    indexes. Pass ``reload=True`` to force a fresh parse.
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _LOADED.get(path)
+    if cached is not None and not reload and cached[0] == stamp:
+        return cached[1]
+
+    kb = KnowledgeBase.from_file(path)
+    _LOADED[path] = (stamp, kb)
+    return kb
@@ -0,0 +1,172 @@
+"""
+Feedback loop enumeration over KB connection graphs.
+
+The Python counterpart of the loop detection in functions/network_analysis.R
+(``find_all_cycles`` / ``classify_loop_type``), for audits over every
+context at once:
+
+  simple_cycles   Johnson's algorithm with the length bound of Gupta &
+                  Suzumura (2021): a blocked node carries the shortest
+                  distance still worth retrying from it, so cut-off
+                  branches are not re-explored. The search runs inside one
+                  strongly connected component at a time, starting from its
+                  smallest node, which is then dropped and the rest of the
+                  component re-split. Every cycle comes out exactly once,
+                  rotated to start at its smallest node.
+  loop_polarity   Reinforcing / Balancing from the number of "-" links,
+                  as in classify_loop_type
+  iter_loops      stream of loop dicts for a whole KB
+
+Cycles are yielded one at a time, so callers can stop early or write them
+out without holding every loop in memory.
+"""
+
+from collections import defaultdict
+
+from .graph import adjacency, strongly_connected_components
+
+REINFORCING = "Reinforcing"
+BALANCING = "Balancing"
+UNDETERMINED = "Undetermined"
+
+
+def _cycles_through(start, succ, max_length):
+    """Simple cycles through ``start`` in ``succ`` of at most ``max_length`` links."""
+    path = [start]
+    lock = {start: 0}           # v -> path length below which v may be re-entered
+    blocked_by = defaultdict(set)
+    stack = [iter(succ[start])]
+    # Per path node: closing distance found beneath it, for unblocking
+    back = [max_length]
+
+    while stack:
+        for w in stack[-1]:
+            if w == start:
+                yield list(path)
+                back[-1] = 1
+            elif len(path) < lock.get(w, max_length):
+                path.append(w)
+                lock[w] = len(path)
+                stack.append(iter(succ[w]))
+                back.append(max_length)
+                break
+        else:
+            stack.pop()
+            v = path.pop()
+            dist = back.pop()
+            if back:
+                back[-1] = min(back[-1], dist)
+            if dist < max_length:
+                # v reaches start in ``dist`` links: unblock it (and what it
+                # blocked) for any path short enough to still close the loop
+                relax = [(dist, v)]
+                while relax:
+                    dist, u = relax.pop()
+                    if lock.get(u, max_length) < max_length - dist + 1:
+                        lock[u] = max_length - dist + 1
+                        relax.extend((dist + 1, x) for x in blocked_by[u] if x not in path)
+            else:
+                for w in succ[v]:
+                    blocked_by[w].add(v)
+
+
+def simple_cycles(succ, max_length=None):
+    """
+    Yield every simple cycle of an adjacency dict as a list of nodes.
+
+    Args:
+        succ: {node: set(successors)}, e.g. from ``adjacency()``
+        max_length: longest cycle to report, in links (None = no bound)
+
+    Each cycle starts at its smallest node (nodes must be orderable) and
+    is reported once; a self-connection is a cycle of length 1.
+    """
+    if max_length is not None and max_length < 1:
+        return
+    nodes = sorted(set(succ) | {v for targets in succ.values() for v in targets})
+    for node in nodes:
+        if node in succ.get(node, ()):
+            yield [node]
+    if max_length == 1:
+        return
+    bound = len(nodes) if max_length is None else max_length
+
+    components = [
+        c for c in strongly_connected_components(nodes, succ) if len(c) > 1
+    ]
+    while components:
+        component = components.pop()
+        members = set(component)
+        start = min(component)
+        local = {
+            u: [v for v in sorted(succ.get(u, ())) if v in members and v != u]
+            for u in component
+        }
+        yield from _cycles_through(start, local, min(bound, len(component)))
+
+        members.discard(start)
+        rest = sorted(members)
+        local = {u: [v for v in local[u] if v != start] for u in rest}
+        components.extend(
+            c for c in strongly_connected_components(rest, local) if len(c) > 1
+        )
+
+
+def edge_polarities(connections):
+    """{(from, to): set of polarity values} over a context's connections."""
+    polarities = defaultdict(set)
+    for conn in connections:
+        if isinstance(conn, dict):
+            src, dst = conn.get("from", ""), conn.get("to", "")
+            if src and dst:
+                polarities[(src, dst)].add(conn.get("polarity"))
+    return dict(polarities)
+
+
+def loop_polarity(nodes, polarities):
+    """
+    (polarity, number of negative links) of the cycle ``nodes``.
+
+    An even number of "-" links is Reinforcing, an odd number Balancing.
+    If a link's polarity is missing, not "+"/"-", or differs between
+    parallel connections, the loop is Undetermined (negatives counts the
+    unambiguous "-" links only).
+    """
+    negatives = 0
+    determined = True
+    for i, src in enumerate(nodes):
+        values = polarities.get((src, nodes[(i + 1) % len(nodes)]), set())
+        if values == {"-"}:
+            negatives += 1
+        elif values != {"+"}:
+            determined = False
+    if not determined:
+        return UNDETERMINED, negatives
+    return (BALANCING if negatives % 2 else REINFORCING), negatives
+
+
+def context_loops(ctx_name, connections, max_length=None):
+    """Yield one loop dict per simple cycle in a context's connection graph."""
+    conns = [c for c in connections if isinstance(c, dict)]
+    succ = adjacency((c.get("from", ""), c.get("to", "")) for c in conns)
+    polarities = edge_polarities(conns)
+    for nodes in simple_cycles(succ, max_length):
+        polarity, negatives = loop_polarity(nodes, polarities)
+        yield {
+            "context": ctx_name,
+            "length": len(nodes),
+            "polarity": polarity,
+            "negative_links": negatives,
+            "elements": nodes,
+        }
+
+
+def iter_loops(kb, max_length=None, contexts=None):
+    """
+    Stream the loops of every context of a KnowledgeBase (or CompiledKB),
+    optionally only the named ``contexts``.
+    """
+    for ctx_name, _ in kb.iter_contexts():
+        if contexts is not None and ctx_name not in contexts:
+            continue
+        yield from context_loops(ctx_name, kb.connections(ctx_name), max_length)
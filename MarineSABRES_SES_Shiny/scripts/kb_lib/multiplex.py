@@ -0,0 +1,247 @@
+"""
+One graph across all KB contexts: intra-context connections plus the
+``cross_ecosystem_links`` that join elements of different contexts.
+
+Nodes are (context, element) pairs. Each context keeps its own
+precomputed Reachability bitsets (kb_lib.graph); a query for paths into a
+target set first marks, per context, which cross-link exits can still
+lead to a target (a fixed point over the few cross links), after which
+"can this node reach a target?" is one bitset AND. Path searches only
+step onto nodes that pass that test, so they never wander into dead ends.
+
+  select()          nodes by context / category / element name
+  reaches()         is there any path from a node to another?
+  all_paths()       every simple path into the targets within a depth
+  shortest_paths()  the k shortest simple paths (Yen's algorithm over BFS)
+
+A path ends at the first target it reaches. Paths are dicts with the
+nodes, each hop's kind ("connection" or "cross_link") and polarity, and
+the overall polarity (the product of the hop signs, or None when a hop
+has no single +/- polarity).
+"""
+
+import heapq
+from collections import defaultdict, deque
+
+from .graph import Reachability, adjacency
+from .knowledge_base import element_name
+
+
+class MultiplexGraph:
+    """Connections of one or more KnowledgeBases joined by cross-ecosystem links."""
+
+    def __init__(self, *kbs):
+        self.kb_of = {}                     # context -> KnowledgeBase
+        self.categories = {}                # node -> category
+        self.succ = defaultdict(dict)       # node -> {node: [polarity, ...]}
+        self.kinds = {}                     # (node, node) -> "connection" / "cross_link"
+        self.cross_links = []               # [(from node, to node)]
+        self.reach = {}                     # context -> Reachability
+
+        for kb in kbs:
+            for ctx_name, _ in kb.iter_contexts():
+                if ctx_name in self.kb_of:
+                    raise ValueError(f"context '{ctx_name}' appears in more than one KB")
+                self.kb_of[ctx_name] = kb
+
+        for kb in kbs:
+            for ctx_name, cat, entry in kb.iter_elements():
+                name = element_name(entry)
+                if name:
+                    self.categories.setdefault((ctx_name, name), cat)
+            for ctx_name, _ in kb.iter_contexts():
+                edges = []
+                for conn in kb.connections(ctx_name):
+                    if isinstance(conn, dict) and conn.get("from") and conn.get("to"):
+                        edges.append((conn["from"], conn["to"]))
+                        self._add((ctx_name, conn["from"]), (ctx_name, conn["to"]),
+                                  conn.get("polarity"), "connection")
+                self.reach[ctx_name] = Reachability(adjacency(edges))
+
+            links = kb.data.get("cross_ecosystem_links", [])
+            for link in links if isinstance(links, list) else []:
+                if not isinstance(link, dict):
+                    continue
+                src = (link.get("from_context"), link.get("from_element"))
+                dst = (link.get("to_context"), link.get("to_element"))
+                if all(src) and all(dst):
+                    if (src, dst) not in self.kinds:
+                        self.cross_links.append((src, dst))
+                    self._add(src, dst, link.get("polarity"), "cross_link")
+
+    def _add(self, src, dst, polarity, kind):
+        self.succ[src].setdefault(dst, []).append(polarity)
+        self.kinds.setdefault((src, dst), kind)
+
+    @property
+    def nodes(self):
+        nodes = dict.fromkeys(self.categories)
+        for src, targets in self.succ.items():
+            nodes[src] = None
+            nodes.update(dict.fromkeys(targets))
+        return list(nodes)
+
+    def select(self, context=None, category=None, element=None, contains=None):
+        """
+        Nodes matching every given filter; ``contains`` is a
+        case-insensitive substring of the element name.
+        """
+        needle = contains.casefold() if contains else None
+        return [
+            node for node in self.nodes
+            if (context is None or node[0] == context)
+            and (category is None or self.categories.get(node) == category)
+            and (element is None or node[1] == element)
+            and (needle is None or needle in node[1].casefold())
+        ]
+
+    # ── Reachability ─────────────────────────────────────────────────────
+
+    def _bit(self, node):
+        reach = self.reach.get(node[0])
+        i = reach.index.get(node[1]) if reach else None
+        return 0 if i is None else 1 << i
+
+    def _local_hits(self, node, members, masks):
+        """True if ``node`` is in ``members`` or reaches one in its own context."""
+        if node in members:
+            return True
+        reach = self.reach.get(node[0])
+        return bool(reach and reach.bits.get(node[1], 0) & masks.get(node[0], 0))
+
+    def target_filter(self, targets):
+        """
+        Predicate: can a node reach any of ``targets`` (or is one)?
+
+        Exits (cross-link sources) whose link leads, within the next
+        context, to a target or to another useful exit are added to the
+        per-context masks until nothing changes.
+        """
+        members = set(targets)
+        masks = defaultdict(int)
+        for node in members:
+            masks[node[0]] |= self._bit(node)
+        changed = True
+        while changed:
+            changed = False
+            for src, dst in self.cross_links:
+                if src not in members and self._local_hits(dst, members, masks):
+                    members.add(src)
+                    masks[src[0]] |= self._bit(src)
+                    changed = True
+        return lambda node: self._local_hits(node, members, masks)
+
+    def reaches(self, src, dst):
+        """True if a path (possibly across contexts) leads from src to dst."""
+        return self.target_filter([dst])(src)
+
+    # ── Paths ────────────────────────────────────────────────────────────
+
+    def _path(self, nodes):
+        hops = []
+        negatives = 0
+        determined = True
+        for src, dst in zip(nodes, nodes[1:]):
+            values = set(self.succ[src][dst])
+            polarity = values.pop() if len(values) == 1 else None
+            if polarity == "-":
+                negatives += 1
+            elif polarity != "+":
+                determined = False
+            hops.append({"kind": self.kinds[(src, dst)], "polarity": polarity})
+        return {
+            "nodes": list(nodes),
+            "hops": hops,
+            "length": len(hops),
+            "contexts": list(dict.fromkeys(ctx for ctx, _ in nodes)),
+            "polarity": ("-" if negatives % 2 else "+") if determined else None,
+        }
+
+    def all_paths(self, sources, targets, max_depth=6):
+        """Yield every simple path from a source into the targets, up to max_depth hops."""
+        targets = set(targets)
+        useful = self.target_filter(targets)
+        for source in sources:
+            if not useful(source):
+                continue
+            if source in targets:
+                yield self._path([source])
+                continue
+            path = [source]
+            on_path = {source}
+            stack = [iter(self.succ.get(source, ()))]
+            while stack:
+                for node in stack[-1]:
+                    if node in on_path or not useful(node):
+                        continue
+                    if node in targets:
+                        yield self._path(path + [node])
+                    elif len(path) < max_depth:
+                        path.append(node)
+                        on_path.add(node)
+                        stack.append(iter(self.succ.get(node, ())))
+                        break
+                else:
+                    stack.pop()
+                    on_path.discard(path.pop())
+
+    def _bfs(self, starts, targets, useful, banned_nodes, banned_edges):
+        parent = {}
+        queue = deque()
+        for start in starts:
+            if start not in parent and start not in banned_nodes:
+                parent[start] = None
+                queue.append(start)
+        while queue:
+            node = queue.popleft()
+            if node in targets:
+                path = [node]
+                while parent[path[-1]] is not None:
+                    path.append(parent[path[-1]])
+                return path[::-1]
+            for nxt in self.succ.get(node, ()):
+                if nxt in parent or nxt in banned_nodes or (node, nxt) in banned_edges or not useful(nxt):
+                    continue
+                parent[nxt] = node
+                queue.append(nxt)
+        return None
+
+    def shortest_paths(self, sources, targets, k=5):
+        """The ``k`` shortest simple paths (fewest hops) from a source into the targets."""
+        targets = set(targets)
+        useful = self.target_filter(targets)
+        sources = [s for s in dict.fromkeys(sources) if useful(s)]
+        first = self._bfs(sources, targets, useful, set(), set())
+        if first is None:
+            return []
+
+        found = [first]
+        seen = {tuple(first)}
+        candidates = []
+        counter = 0
+        while len(found) < k:
+            prev = found[-1]
+            # Spur from the virtual root (other sources) and from each node of prev
+            for i in range(-1, len(prev) - 1):
+                root = prev[:i + 1]
+                banned_edges = set()
+                banned_first = set()
+                for path in found:
+                    if path[:i + 1] == root:
+                        if i < 0:
+                            banned_first.add(path[0])
+                        else:
+                            banned_edges.add((path[i], path[i + 1]))
+                starts = [s for s in sources if s not in banned_first] if i < 0 else [prev[i]]
+                spur = self._bfs(starts, targets, useful, set(root[:-1]), banned_edges)
+                if spur is None:
+                    continue
+                candidate = root[:-1] + spur if i >= 0 else spur
+                if tuple(candidate) not in seen:
+                    seen.add(tuple(candidate))
+                    counter += 1
+                    heapq.heappush(candidates, (len(candidate), counter, candidate))
+            if not candidates:
+                break
+            found.append(heapq.heappop(candidates)[2])
+        return [self._path(path) for path in found]
@@ -0,0 +1,257 @@
+"""
+Near-duplicate element names and rationales via MinHash LSH.
+
+Every distinct element name is reduced to a set of shingles (character
+trigrams of its normalised words) and a MinHash signature of NUM_PERM
+values. Locality-sensitive hashing splits each signature into BANDS bands;
+names sharing any whole band land in the same bucket and become candidate
+pairs, so only names likely to be similar are ever compared (near-linear
+in the number of names instead of all pairs). Each candidate pair is then
+scored with the exact Jaccard similarity of the shingle sets, and pairs
+at or above the threshold are joined into clusters with union-find.
+
+With 21 bands of 3 rows a pair is proposed with probability
+1 - (1 - s^3)^21 at similarity s: about 0.94 at 0.5 and over 0.99 from
+0.6 up, while pairs below 0.25 are rarely proposed at all.
+
+Clusters are candidates for review (e.g. as merges for kb_lib.refactor),
+not merges in themselves: "Agricultural intensification in catchment"
+and "Agricultural production demand in catchment" are similar names for
+different things as often as they are the same thing.
+
+similar_text_groups() applies the same index to longer texts such as
+connection rationales: shingles are word bigrams and candidate pairs are
+verified by the cosine similarity of their bigram counts, which finds
+boilerplate sentences pasted after different opening words.
+"""
+
+import hashlib
+import json
+import math
+import random
+import re
+from collections import Counter, defaultdict
+
+from .knowledge_base import DATA_DIR, element_name
+
+NUM_PERM = 63
+BANDS = 21
+SHINGLE = 3
+DEFAULT_THRESHOLD = 0.5
+TOKEN_SHINGLE = 2
+TEXT_THRESHOLD = 0.7
+
+TEMPLATE_GLOB = "*_SES_Template.json"
+# Template sections with a different name from the KB category
+TEMPLATE_CATEGORIES = {
+    "marine_processes": "states",
+    "ecosystem_services": "impacts",
+    "goods_benefits": "welfare",
+    "measures": "responses",
+}
+
+_MERSENNE = (1 << 61) - 1
+_rng = random.Random(20240901)   # fixed, so signatures are reproducible
+_PERMS = [(_rng.randrange(1, _MERSENNE), _rng.randrange(0, _MERSENNE)) for _ in range(NUM_PERM)]
+_WORD = re.compile(r"[^\W_]+")
+
+
+def normalise(name):
+    """Casefolded words of a name joined by single spaces."""
+    return " ".join(_WORD.findall(name.casefold()))
+
+
+def shingles(name, k=SHINGLE):
+    """Character k-grams of the normalised name (the whole name if shorter)."""
+    text = normalise(name)
+    if len(text) <= k:
+        return {text}
+    return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+
+def token_shingles(text, k=TOKEN_SHINGLE):
+    """Counts of the word k-grams of the normalised text."""
+    words = normalise(text).split()
+    if len(words) <= k:
+        return Counter([" ".join(words)])
+    return Counter(" ".join(words[i:i + k]) for i in range(len(words) - k + 1))
+
+
+def _hash(shingle):
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def minhash(shingle_set):
+    """MinHash signature: per permutation the minimum of (a*x + b) mod p."""
+    hashes = [_hash(s) for s in shingle_set]
+    return tuple(min((a * x + b) % _MERSENNE for x in hashes) for a, b in _PERMS)
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def cosine(a, b):
+    """Cosine similarity of two Counters."""
+    if len(a) > len(b):
+        a, b = b, a
+    dot = sum(n * b[key] for key, n in a.items() if key in b)
+    norm = math.sqrt(sum(n * n for n in a.values()) * sum(n * n for n in b.values()))
+    return dot / norm if norm else 0.0
+
+
+def lsh_candidates(signatures, bands=BANDS):
+    """Pairs (i, j), i < j, of signatures sharing at least one band."""
+    rows = len(signatures[0]) // bands if signatures else 0
+    pairs = set()
+    for band in range(bands):
+        buckets = defaultdict(list)
+        for i, sig in enumerate(signatures):
+            buckets[sig[band * rows:(band + 1) * rows]].append(i)
+        for members in buckets.values():
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    pairs.add((members[x], members[y]))
+    return pairs
+
+
+def _group_pairs(n, pairs):
+    """Union-find over scored pairs: [[(i, j, score), ...] per connected group]."""
+    parent = list(range(n))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j, _ in pairs:
+        parent[find(i)] = find(j)
+
+    groups = defaultdict(list)
+    for i, j, score in pairs:
+        groups[find(i)].append((i, j, score))
+    return list(groups.values())
+
+
+def similar_text_groups(texts, threshold=TEXT_THRESHOLD):
+    """
+    Groups of near-identical texts.
+
+    Returns [(sorted member indices, lowest verified similarity), ...] for
+    every group of two or more texts whose bigram cosine similarity links
+    them at or above ``threshold``.
+    """
+    vectors = [token_shingles(text) for text in texts]
+    signatures = [minhash(set(v)) for v in vectors]
+    pairs = []
+    for i, j in lsh_candidates(signatures):
+        score = cosine(vectors[i], vectors[j])
+        if score >= threshold:
+            pairs.append((i, j, score))
+    return [
+        (sorted({i for i, _, _ in group} | {j for _, j, _ in group}),
+         min(score for _, _, score in group))
+        for group in _group_pairs(len(texts), pairs)
+    ]
+
+
+def duplicate_text_groups(occurrences, threshold=TEXT_THRESHOLD):
+    """
+    Group a {text: [occurrence, ...]} mapping into near-duplicate texts.
+
+    Returns [(texts, similarity), ...] covering every text once, in
+    first-seen order: ``texts`` lists a group's texts in first-seen order
+    and ``similarity`` is its lowest verified pair similarity (1.0 for a
+    text with no near duplicate).
+    """
+    texts = list(occurrences)
+    grouped = set()
+    groups = []
+    for members, similarity in similar_text_groups(texts, threshold):
+        grouped.update(members)
+        groups.append((members, round(similarity, 3)))
+    groups.extend(([i], 1.0) for i in range(len(texts)) if i not in grouped)
+    groups.sort(key=lambda g: g[0][0])
+    return [([texts[i] for i in members], similarity) for members, similarity in groups]
+
+
+# ── Collecting element names ─────────────────────────────────────────────
+
+
+def kb_occurrences(kb, source):
+    """Yield (name, occurrence dict) for every element of a KnowledgeBase."""
+    for ctx_name, cat, entry in kb.iter_elements():
+        name = element_name(entry)
+        if name:
+            yield name, {"source": source, "context": ctx_name, "category": cat}
+
+
+def template_occurrences(path):
+    """Yield (name, occurrence dict) for every element of an SES template file."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    framework = data.get("dapsiwrm_framework", {})
+    for section, entries in framework.items() if isinstance(framework, dict) else ():
+        for entry in entries if isinstance(entries, list) else []:
+            name = element_name(entry)
+            if name:
+                yield name, {
+                    "source": path.name,
+                    "context": data.get("template_name", path.stem),
+                    "category": TEMPLATE_CATEGORIES.get(section, section),
+                }
+
+
+def template_paths(data_dir=DATA_DIR):
+    return sorted(data_dir.glob(TEMPLATE_GLOB))
+
+
+# ── Clustering ───────────────────────────────────────────────────────────
+
+
+def find_near_duplicates(occurrences, threshold=DEFAULT_THRESHOLD):
+    """
+    Cluster near-identical element names.
+
+    Args:
+        occurrences: iterable of (name, occurrence dict)
+        threshold: minimum shingle Jaccard similarity for a pair
+
+    Returns:
+        (clusters, stats). Each cluster is a dict with ``names`` (name ->
+        occurrence list, most frequent first), ``pairs`` (name, name,
+        similarity), ``min_similarity`` and ``categories``; clusters come
+        most-similar first. ``stats`` counts names, candidate pairs and
+        verified pairs.
+    """
+    where = defaultdict(list)
+    for name, occurrence in occurrences:
+        where[name].append(occurrence)
+    names = sorted(where)
+    sets = [shingles(name) for name in names]
+    signatures = [minhash(s) for s in sets]
+
+    candidates = lsh_candidates(signatures)
+    pairs = []
+    for i, j in candidates:
+        score = jaccard(sets[i], sets[j])
+        if score >= threshold:
+            pairs.append((i, j, score))
+
+    clusters = []
+    for group in _group_pairs(len(names), pairs):
+        members = sorted({i for i, _, _ in group} | {j for _, j, _ in group},
+                         key=lambda i: (-len(where[names[i]]), names[i]))
+        clusters.append({
+            "names": {names[i]: where[names[i]] for i in members},
+            "pairs": sorted(
+                ([names[i], names[j], round(score, 3)] for i, j, score in group),
+                key=lambda p: (-p[2], p[0], p[1]),
+            ),
+            "min_similarity": round(min(score for _, _, score in group), 3),
+            "categories": sorted({o["category"] for i in members for o in where[names[i]]}),
+        })
+    clusters.sort(key=lambda c: (-c["min_similarity"], next(iter(c["names"]))))
+    stats = {"names": len(names), "candidate_pairs": len(candidates), "similar_pairs": len(pairs)}
+    return clusters, stats
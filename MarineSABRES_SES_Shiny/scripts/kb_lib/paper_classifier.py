@@ -0,0 +1,145 @@
+"""
+Batch keyword classification of a paper corpus, parallel and memoized.
+
+classify_papers() tags each paper (a dict with title / abstract / doi, as
+returned by the KB builders' parse_bibtex) with the labels of a rule table
+from kb_lib/rules/. It
+
+  * looks every paper up in a memo keyed by DOI (or a hash of the title
+    when there is none); a hit is reused if the paper's text and the rule
+    table are unchanged, so adding papers to a bibliography only
+    classifies the new ones;
+  * classifies the rest in batches across a process pool; the compiled
+    KeywordMatcher is sent to each worker once, in the pool initializer,
+    instead of being rebuilt or pickled per batch;
+  * returns per-paper tags in input order plus stats (papers classified
+    vs reused, throughput, tag counts).
+
+Small workloads run inline: spawning workers costs more than scanning a
+few hundred abstracts.
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from .keyword_matcher import RULES_DIR, load_rules
+from .knowledge_base import DATA_DIR
+from .near_duplicates import normalise
+from .transaction import write_json_atomic
+from .validation_cache import file_digest
+
+CACHE_VERSION = 1
+CACHE_DIR = DATA_DIR / "cache" / "paper_tags"
+BATCH_SIZE = 256
+# Below this many papers to classify, a worker pool is not worth starting
+MIN_PARALLEL = 2 * BATCH_SIZE
+
+_worker_matcher = None
+
+
+def paper_text(entry):
+    """Lowercased "title abstract" text the rule tables are matched against."""
+    return (entry.get("title", "") + " " + entry.get("abstract", "")).lower()
+
+
+def paper_key(entry):
+    """Memo key: the normalised DOI, else a hash of the normalised title."""
+    doi = entry.get("doi", "").strip().lower()
+    for prefix in ("https://doi.org/", "http://dx.doi.org/", "doi:"):
+        if doi.startswith(prefix):
+            doi = doi[len(prefix):]
+    if doi:
+        return f"doi:{doi}"
+    title = normalise(entry.get("title", ""))
+    return "title:" + hashlib.sha256(title.encode("utf-8")).hexdigest()[:16]
+
+
+def _text_digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _init_worker(matcher):
+    global _worker_matcher
+    _worker_matcher = matcher
+
+
+def _classify_batch(texts):
+    return [_worker_matcher.match(text) for text in texts]
+
+
+def _load_memo(path, rules_digest):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            memo = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if memo.get("version") != CACHE_VERSION or memo.get("rules") != rules_digest:
+        return {}
+    return memo.get("papers", {})
+
+
+def classify_papers(papers, rules, jobs=None, batch_size=BATCH_SIZE, cache_dir=CACHE_DIR):
+    """
+    Tag each paper with the labels of rule table ``rules``.
+
+    Args:
+        papers: list of paper dicts (title, abstract, doi)
+        rules: rule table name in kb_lib/rules/ (e.g. "offshore_wind_paper_themes")
+        jobs: worker processes; None = CPU count, <= 1 classifies inline
+        batch_size: papers per worker task
+        cache_dir: memo directory (one file per rule table); None disables it
+
+    Returns:
+        (tags, stats): ``tags[i]`` lists the labels of ``papers[i]`` in
+        rule-table order; ``stats`` has papers, classified, reused,
+        seconds, papers_per_second and tag_counts.
+    """
+    started = time.perf_counter()
+    matcher = load_rules(rules)
+    rules_digest = file_digest(RULES_DIR / f"{rules}.json")
+    cache_path = cache_dir / f"{rules}.json" if cache_dir is not None else None
+    memo = _load_memo(cache_path, rules_digest) if cache_path else {}
+
+    tags = [None] * len(papers)
+    texts = [paper_text(p) for p in papers]
+    keys = [paper_key(p) for p in papers]
+    digests = [_text_digest(text) for text in texts]
+    pending = []
+    for i, (key, digest) in enumerate(zip(keys, digests)):
+        hit = memo.get(key)
+        if hit is not None and hit["text"] == digest:
+            tags[i] = hit["tags"]
+        else:
+            pending.append(i)
+
+    jobs = (os.cpu_count() or 1) if jobs is None else jobs
+    batches = [pending[n:n + batch_size] for n in range(0, len(pending), batch_size)]
+    if jobs <= 1 or len(pending) < MIN_PARALLEL:
+        results = [[matcher.match(texts[i]) for i in batch] for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(batches)),
+                                 initializer=_init_worker, initargs=(matcher,)) as executor:
+            results = list(executor.map(_classify_batch, [[texts[i] for i in batch] for batch in batches]))
+    for batch, batch_tags in zip(batches, results):
+        for i, labels in zip(batch, batch_tags):
+            tags[i] = labels
+            memo[keys[i]] = {"text": digests[i], "tags": labels}
+
+    if cache_path and pending:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        write_json_atomic(cache_path, {"version": CACHE_VERSION, "rules": rules_digest, "papers": memo})
+
+    elapsed = time.perf_counter() - started
+    stats = {
+        "papers": len(papers),
+        "classified": len(pending),
+        "reused": len(papers) - len(pending),
+        "seconds": round(elapsed, 3),
+        "papers_per_second": round(len(papers) / elapsed) if elapsed else None,
+        "tag_counts": dict(Counter(label for labels in tags for label in labels).most_common()),
+    }
+    return tags, stats
@@ -0,0 +1,352 @@
+"""
+Batch element refactoring: rename, move, merge and remove KB elements.
+
+Operations are plain dicts, applied in order::
+
+    {"op": "rename", "name": old, "to": new, "category": "drivers"}
+    {"op": "move",   "name": n, "from": "pressures", "to": "states",
+     "replacement": {"name": ..., "category": "drivers", "relevance": 0.8}}
+    {"op": "merge",  "name": alt, "into": canonical, "category": "impacts"}
+    {"op": "remove", "name": n, "category": "welfare"}
+
+Each may carry ``"contexts": [...]`` (default: every context under
+``contexts``; ``generic_fallback`` is only touched when named) and a
+``"label"`` used to group the summary. ``category`` is optional for
+rename and remove.
+
+The semantics are those of the old per-operation helpers: a rename or
+merge redirects every connection endpoint with that name in the context
+(and matching cross_ecosystem_links endpoints); a move retypes endpoints
+whose from_type/to_type was the old category; a remove drops the element,
+its connections and its cross-ecosystem links.
+
+Instead of scanning every context's lists and connections per operation,
+an occurrence index finds the contexts each operation touches. List
+edits are simulated on copies, and every connection of an affected
+context and every cross-ecosystem link is then rewritten once, through a
+per-context name/type transform that composes all of that context's
+operations. Conflicts are found before anything is modified.
+"""
+
+from collections import defaultdict
+
+from .knowledge_base import CATEGORIES, element_name
+
+FALLBACK = "generic_fallback"
+
+
+class RefactorError(ValueError):
+    """Raised in strict mode when a batch has conflicts; nothing is modified."""
+
+    def __init__(self, conflicts):
+        self.conflicts = conflicts
+        super().__init__(
+            f"{len(conflicts)} refactoring conflict(s):\n"
+            + "\n".join(f"  {c['message']}" for c in conflicts)
+        )
+
+
+def _scopes(data):
+    """{scope: dict holding category lists (and maybe connections)}."""
+    scopes = {}
+    contexts = data.get("contexts", {})
+    if isinstance(contexts, dict):
+        for ctx_name, ctx in contexts.items():
+            if isinstance(ctx, dict):
+                scopes[ctx_name] = ctx
+    if isinstance(data.get(FALLBACK), dict):
+        scopes[FALLBACK] = data[FALLBACK]
+    return scopes
+
+
+def build_occurrence_index(data):
+    """element name -> set of scopes listing it in a category list."""
+    index = defaultdict(set)
+    for scope, ctx in _scopes(data).items():
+        for cat in CATEGORIES:
+            entries = ctx.get(cat, [])
+            for entry in entries if isinstance(entries, list) else []:
+                name = element_name(entry)
+                if name:
+                    index[name].add(scope)
+    return index
+
+
+class _Scope:
+    """Working copy of one context's category lists plus its op history."""
+
+    def __init__(self, name, ctx):
+        self.name = name
+        self.ctx = ctx
+        self.lists = {}
+        self.ops = []          # (kind, args) in order, for endpoint transforms
+        self.log = []
+
+    def entries(self, cat):
+        if cat not in self.lists:
+            entries = self.ctx.get(cat, [])
+            self.lists[cat] = list(entries) if isinstance(entries, list) else []
+        return self.lists[cat]
+
+    def find(self, cat, name):
+        for i, entry in enumerate(self.entries(cat)):
+            if element_name(entry) == name:
+                return i
+        return None
+
+    def locate(self, name, category=None):
+        """(category, position) of ``name``, first category in DAPSI(W)R(M) order."""
+        for cat in [category] if category else CATEGORIES:
+            i = self.find(cat, name)
+            if i is not None:
+                return cat, i
+        return None, None
+
+    def add_if_missing(self, cat, entry):
+        if self.find(cat, element_name(entry)) is None:
+            self.entries(cat).append(entry)
+            return True
+        return False
+
+
+def _renamed(entry, new_name):
+    if isinstance(entry, dict):
+        entry = dict(entry)
+        entry["name" if "name" in entry or "element_name" not in entry else "element_name"] = new_name
+        return entry
+    return new_name
+
+
+class _Batch:
+    def __init__(self, data):
+        self.data = data
+        self.all_scopes = _scopes(data)
+        self.index = build_occurrence_index(data)
+        self.scopes = {}
+        self.conflicts = []
+        self.skipped = []
+        self.applied = defaultdict(int)
+
+    def scope(self, name):
+        if name not in self.scopes:
+            self.scopes[name] = _Scope(name, self.all_scopes[name])
+        return self.scopes[name]
+
+    def candidates(self, op, name):
+        allowed = op.get("contexts")
+        found = self.index.get(name, set())
+        if allowed is None:
+            found = {s for s in found if s != FALLBACK}
+        else:
+            found = found & set(allowed)
+        # Context order, not set order, so logs are deterministic
+        return [s for s in self.all_scopes if s in found]
+
+    def conflict(self, op, scope, message):
+        self.conflicts.append({"op": op, "context": scope, "message": f"{scope}: {message}"})
+
+    # Operations; each returns True if it applied in ``scope``
+
+    def rename(self, op, sc):
+        cat, i = sc.locate(op["name"], op.get("category"))
+        if cat is None:
+            return False
+        new = op["to"]
+        other_cat, _ = sc.locate(new)
+        if other_cat is not None:
+            self.conflict(op, sc.name, f"cannot rename '{op['name']}' to '{new}': already listed in {other_cat} (merge instead)")
+            return False
+        sc.entries(cat)[i] = _renamed(sc.entries(cat)[i], new)
+        sc.ops.append(("name", op["name"], new))
+        self.index[new].add(sc.name)
+        sc.log.append(f"  Renamed '{op['name']}' -> '{new}' in {cat}")
+        return True
+
+    def move(self, op, sc):
+        name, src, dst = op["name"], op["from"], op["to"]
+        i = sc.find(src, name)
+        if i is None:
+            return False
+        entry = sc.entries(src).pop(i)
+        sc.add_if_missing(dst, entry)
+        sc.ops.append(("type", name, src, dst))
+        sc.log.append(f"  Moved '{name}' from {src} to {dst}")
+        replacement = op.get("replacement")
+        if replacement:
+            rep = {"name": replacement["name"], "relevance": replacement.get("relevance", 0.8)}
+            sc.add_if_missing(replacement["category"], rep)
+            self.index[rep["name"]].add(sc.name)
+            sc.log.append(f"  Added replacement {replacement['category'][:-1]} '{rep['name']}'")
+        return True
+
+    def merge(self, op, sc):
+        alt, canonical, cat = op["name"], op["into"], op["category"]
+        i = sc.find(cat, alt)
+        if i is None:
+            return False
+        other_cat, _ = sc.locate(canonical)
+        if other_cat is not None and other_cat != cat:
+            self.conflict(op, sc.name, f"cannot merge '{alt}' into '{canonical}': target is listed in {other_cat}, not {cat}")
+            return False
+        removed = sc.entries(cat).pop(i)
+        relevance = removed.get("relevance", 0.8) if isinstance(removed, dict) else 0.8
+        sc.add_if_missing(cat, {"name": canonical, "relevance": relevance})
+        sc.ops.append(("name", alt, canonical))
+        self.index[canonical].add(sc.name)
+        sc.log.append(f"  Merged '{alt}' -> '{canonical}' in {cat}")
+        return True
+
+    def remove(self, op, sc):
+        cat, i = sc.locate(op["name"], op.get("category"))
+        if cat is None:
+            return False
+        sc.entries(cat).pop(i)
+        sc.ops.append(("remove", op["name"]))
+        sc.log.append(f"  Removed '{op['name']}' from {cat}")
+        return True
+
+    def run(self, operations):
+        handlers = {"rename": self.rename, "move": self.move, "merge": self.merge, "remove": self.remove}
+        for op in operations:
+            handler = handlers.get(op.get("op"))
+            if handler is None:
+                raise ValueError(f"unknown refactoring operation: {op!r}")
+            hits = 0
+            for scope in self.candidates(op, op["name"]):
+                if handler(op, self.scope(scope)):
+                    hits += 1
+            self.applied[op.get("label", op["op"])] += hits
+            if not hits:
+                self.skipped.append(op)
+
+
+def _transform(ops):
+    """
+    Compose a context's operations into one endpoint transform:
+    (name, type) -> (name, type), or None if the endpoint was removed.
+    """
+    cache = {}
+
+    def apply(name, typ):
+        key = (name, typ)
+        if key not in cache:
+            for op in ops:
+                if op[0] == "name":
+                    if name == op[1]:
+                        name = op[2]
+                elif op[0] == "type":
+                    if name == op[1] and typ == op[2]:
+                        typ = op[3]
+                elif name == op[1]:
+                    cache[key] = None
+                    break
+            else:
+                cache[key] = (name, typ)
+        return cache[key]
+
+    return apply
+
+
+def plan_refactor(data, operations):
+    """Simulate a batch without modifying ``data``; returns the batch state."""
+    batch = _Batch(data)
+    batch.run(operations)
+
+    # Connection-level conflicts: merges/renames creating self-loops
+    for scope, sc in batch.scopes.items():
+        transform = _transform(sc.ops)
+        conns = sc.ctx.get("connections", [])
+        for idx, conn in enumerate(conns if isinstance(conns, list) else []):
+            if not isinstance(conn, dict):
+                continue
+            src = transform(conn.get("from", ""), None)
+            dst = transform(conn.get("to", ""), None)
+            if src and dst and src[0] == dst[0] and conn.get("from") != conn.get("to"):
+                batch.conflict(None, scope, f"connection {idx} '{conn.get('from')}' -> '{conn.get('to')}' becomes a self-loop on '{src[0]}'")
+    return batch
+
+
+def apply_refactor(data, operations, strict=True):
+    """
+    Apply a batch of operations to a KB document in place.
+
+    With ``strict`` any conflict raises RefactorError before the document
+    is touched; otherwise conflicting steps are skipped and reported, and
+    connections that a merge or rename would turn into self-loops are
+    dropped (counted as ``self_loops_removed``).
+
+    Returns a summary dict: per-label applied counts, per-context change
+    log, endpoint/type/removal counts for connections and cross-ecosystem
+    links, skipped operations and conflicts.
+    """
+    batch = plan_refactor(data, operations)
+    if strict and batch.conflicts:
+        raise RefactorError(batch.conflicts)
+
+    stats = defaultdict(int)
+    transforms = {}
+    for scope, sc in batch.scopes.items():
+        for cat, entries in sc.lists.items():
+            sc.ctx[cat] = entries
+        transform = transforms[scope] = _transform(sc.ops)
+
+        conns = sc.ctx.get("connections")
+        if not isinstance(conns, list) or not sc.ops:
+            continue
+        kept = []
+        for conn in conns:
+            if not isinstance(conn, dict):
+                kept.append(conn)
+                continue
+            src = transform(conn.get("from", ""), conn.get("from_type"))
+            dst = transform(conn.get("to", ""), conn.get("to_type"))
+            if src is None or dst is None:
+                stats["connections_removed"] += 1
+                continue
+            if src[0] == dst[0] and conn.get("from") != conn.get("to"):
+                # Reported as a conflict by plan_refactor; only reached when not strict
+                stats["self_loops_removed"] += 1
+                continue
+            for side, (name, typ) in (("from", src), ("to", dst)):
+                if side in conn and conn[side] != name:
+                    conn[side] = name
+                    stats["endpoints_renamed"] += 1
+                if f"{side}_type" in conn and conn[f"{side}_type"] != typ:
+                    conn[f"{side}_type"] = typ
+                    stats["endpoint_types_changed"] += 1
+            kept.append(conn)
+        if len(kept) != len(conns):
+            sc.ctx["connections"] = kept
+
+    links = data.get("cross_ecosystem_links")
+    if isinstance(links, list) and transforms:
+        kept = []
+        for link in links:
+            if not isinstance(link, dict):
+                kept.append(link)
+                continue
+            removed = False
+            for side in ("from", "to"):
+                transform = transforms.get(link.get(f"{side}_context"))
+                if transform is None:
+                    continue
+                result = transform(link.get(f"{side}_element", ""), None)
+                if result is None:
+                    removed = True
+                elif result[0] != link.get(f"{side}_element", ""):
+                    link[f"{side}_element"] = result[0]
+                    stats["link_endpoints_renamed"] += 1
+            if removed:
+                stats["links_removed"] += 1
+            else:
+                kept.append(link)
+        if len(kept) != len(links):
+            data["cross_ecosystem_links"] = kept
+
+    return {
+        "applied": dict(batch.applied),
+        "changes": {scope: sc.log for scope, sc in batch.scopes.items() if sc.log},
+        "connections": dict(stats),
+        "skipped": batch.skipped,
+        "conflicts": batch.conflicts,
+    }
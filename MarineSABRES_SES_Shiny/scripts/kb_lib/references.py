@@ -0,0 +1,369 @@
+"""
+Reference registry: connection ``references`` normalised to citation keys.
+
+References are free text, so one work appears under several spellings
+("HELCOM 2018", "HELCOM 2018 State of the Baltic Sea", "Börger et al.
+2014" / "Borger et al., 2014"). parse_citation() splits a string into
+authors, year and venue (the title or journal after the year) and derives
+a base key from the first author's surname (accents folded) and the year,
+e.g. ``halpern-2008``, ``de-groot-2014``, ``helcom-2018``; strings
+without an author are keyed by their whole folded text, so no key is a
+bare year.
+
+One author-year base can still name several works (HELCOM 2021 Baltic Sea
+Action Plan vs HELCOM 2021 Marine Litter). When the references sharing a
+base carry venues that differ (neither is a word prefix of the other),
+the registry keys each venue separately, e.g.
+``helcom-2021-baltic-sea-action-plan`` and ``helcom-2021-marine-litter``;
+references without a venue keep the base key, since they could be either.
+
+ReferenceRegistry indexes a KB once:
+
+  citations          key -> first author, authors, year, venues, variants
+  index              key -> [(context, connection index), ...]
+  by_author          author slug -> [key, ...]
+  only_author        author slug -> connections whose every reference is
+                     by that first author (e.g. "supported only by Halpern")
+  context_stats      per-context connection, citation and coverage counts
+  coverage_ranking   contexts, least cited first
+
+so each of these queries is a dict lookup. save() persists the registry
+next to the KB (data/<kb>.references.json) with the KB's digest, and
+load_registry() reuses it while the KB is unchanged.
+"""
+
+import json
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from .knowledge_base import KnowledgeBase
+from .transaction import write_json_atomic
+from .validation_cache import file_digest
+
+FORMAT = 2
+# Words of a venue kept in a disambiguated citation key
+VENUE_KEY_WORDS = 6
+
+_YEAR = re.compile(r"\b(1[89]\d{2}|20\d{2})([a-z]?)\b")
+_ET_AL = re.compile(r"\bet\.?\s*al\.?", re.IGNORECASE)
+_AUTHOR_SPLIT = re.compile(r"\s*(?:,|&|\band\b)\s*")
+_STRIP = " \t,;:.()[]\"'“”‘’"
+
+
+def slug(text):
+    """ASCII-folded, lowercased words joined by hyphens."""
+    folded = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]+", "-", folded.lower()).strip("-")
+
+
+def _venue_key(venue):
+    """Slug of a venue without a leading article ("The State of ..." = "State of ...")."""
+    return re.sub(r"^(?:the|an?)-", "", slug(venue)) or None
+
+
+def parse_citation(text):
+    """
+    Split a reference string into its parts.
+
+    Returns a dict with ``key`` (the base key), ``authors`` (list, as
+    written), ``first_author`` (slug), ``et_al``, ``year`` (str or None),
+    ``venue`` (text after the year, or None) and ``venue_key`` (its slug,
+    minus a leading article; None without an author).
+    """
+    match = _YEAR.search(text)
+    if not match:
+        return {
+            "key": slug(text), "authors": [], "first_author": None,
+            "et_al": False, "year": None, "venue": None, "venue_key": None,
+        }
+
+    head = text[:match.start()].strip(_STRIP)
+    venue = text[match.end():].strip(_STRIP) or None
+    et_al = bool(_ET_AL.search(head))
+    names = [
+        name.strip(_STRIP)
+        for name in _AUTHOR_SPLIT.split(_ET_AL.split(head)[0] if et_al else head)
+    ]
+    authors = [name for name in names if name]
+    first = slug(authors[0]) if authors else ""
+    year = match.group(1) + match.group(2)
+    if first:
+        key = f"{first}-{year}"
+    else:
+        # "2019 national report": the whole text, never the bare year
+        key = slug(text) if venue else f"anonymous-{year}"
+    return {
+        "key": key,
+        "authors": authors,
+        "first_author": first or None,
+        "et_al": et_al,
+        "year": year,
+        "venue": venue,
+        "venue_key": _venue_key(venue) if venue and first else None,
+    }
+
+
+def _same_venue(venue_key, representative):
+    """True if ``representative`` equals ``venue_key`` or is a word prefix of it."""
+    return venue_key == representative or venue_key.startswith(representative + "-")
+
+
+def venue_groups(venue_keys):
+    """
+    Group the venue slugs of one base key into works.
+
+    Returns {venue slug: representative}, the representative being the
+    shortest slug of its group; a slug joins a group when the group's
+    representative is a word prefix of it ("quality-status-report" and
+    "quality-status-report-for-the-north-east-atlantic").
+    """
+    groups = {}
+    representatives = []
+    for venue_key in sorted(set(venue_keys), key=lambda v: (v.count("-"), v)):
+        for rep in representatives:
+            if _same_venue(venue_key, rep):
+                groups[venue_key] = rep
+                break
+        else:
+            representatives.append(venue_key)
+            groups[venue_key] = venue_key
+    return groups
+
+
+def _representative(venue_key, representatives):
+    """The representative grouping ``venue_key``, itself if none; None without a split."""
+    if not representatives or not venue_key:
+        return None
+    return next((rep for rep in representatives if _same_venue(venue_key, rep)), venue_key)
+
+
+def citation_key(parsed, representatives=()):
+    """
+    Registry key of a parsed citation.
+
+    Args:
+        parsed: parse_citation() result
+        representatives: venue representatives of its base key when that
+            base names several works, else empty
+
+    Returns:
+        The base key, or ``<base>-<venue>`` if the base is split and the
+        citation has a venue.
+    """
+    rep = _representative(parsed["venue_key"], representatives)
+    if rep is None:
+        return parsed["key"]
+    return f"{parsed['key']}-{'-'.join(rep.split('-')[:VENUE_KEY_WORDS])}"
+
+
+def _references(conn):
+    refs = conn.get("references", [])
+    if isinstance(refs, str):
+        refs = [refs] if refs.strip() else []
+    return [r for r in refs if isinstance(r, str) and r.strip()] if isinstance(refs, list) else []
+
+
+class ReferenceRegistry:
+    """Citation keys, the reference -> connections index and coverage stats of one KB."""
+
+    def __init__(self, citations, index, context_stats, source=None, source_sha256=None):
+        self.citations = citations
+        self.index = index
+        self.context_stats = context_stats
+        self.source = source
+        self.source_sha256 = source_sha256
+
+        self.alias = {}
+        self.by_author = defaultdict(list)
+        # Base key -> venue representatives, for bases naming several works
+        self.split_bases = defaultdict(list)
+        for key, citation in citations.items():
+            if citation.get("venue_key"):
+                self.split_bases[citation["base"]].append(citation["venue_key"])
+            for variant in citation["variants"]:
+                self.alias[variant] = key
+            if citation["first_author"]:
+                self.by_author[citation["first_author"]].append(key)
+        self.by_author = dict(self.by_author)
+        self.split_bases = dict(self.split_bases)
+
+        # Connection -> keys, and connections citing a single first author
+        self.connection_keys = defaultdict(list)
+        for key, locations in index.items():
+            for location in locations:
+                self.connection_keys[location].append(key)
+        only = defaultdict(list)
+        for location, keys in self.connection_keys.items():
+            authors = {citations[key]["first_author"] for key in keys}
+            if len(authors) == 1 and None not in authors:
+                only[authors.pop()].append(location)
+        self.only_author = {author: sorted(locs) for author, locs in only.items()}
+        self.connection_keys = dict(self.connection_keys)
+        self.coverage_ranking = sorted(context_stats, key=lambda ctx: (
+            context_stats[ctx]["coverage"], context_stats[ctx]["citations_per_connection"], ctx,
+        ))
+
+    @classmethod
+    def from_kb(cls, kb, source=None, source_sha256=None):
+        """Build the registry from a KnowledgeBase (or a KB document dict)."""
+        if not isinstance(kb, KnowledgeBase):
+            kb = KnowledgeBase(kb)
+        citations = {}
+        index = defaultdict(list)
+        variants = defaultdict(Counter)
+        context_stats = {}
+
+        # Parse every reference once, then split bases whose venues differ
+        parsed_refs = {}
+        base_venues = defaultdict(set)
+        for ctx_name, _ in kb.iter_contexts():
+            for conn in kb.connections(ctx_name):
+                for ref in _references(conn) if isinstance(conn, dict) else []:
+                    if ref not in parsed_refs:
+                        parsed_refs[ref] = parse_citation(ref)
+                        if parsed_refs[ref]["venue_key"]:
+                            base_venues[parsed_refs[ref]["key"]].add(parsed_refs[ref]["venue_key"])
+        split = {}
+        for base, venue_keys in base_venues.items():
+            groups = venue_groups(venue_keys)
+            if len(set(groups.values())) > 1:
+                split[base] = sorted(set(groups.values()))
+
+        for ctx_name, _ in kb.iter_contexts():
+            conns = kb.connections(ctx_name)
+            total = cited = uses = 0
+            keys = set()
+            for idx, conn in enumerate(conns):
+                if not isinstance(conn, dict):
+                    continue
+                total += 1
+                refs = _references(conn)
+                if refs:
+                    cited += 1
+                for ref in refs:
+                    parsed = parsed_refs[ref]
+                    base = parsed["key"]
+                    key = citation_key(parsed, split.get(base, ()))
+                    variants[key][ref] += 1
+                    if key not in citations:
+                        citations[key] = {
+                            "base": base,
+                            "venue_key": _representative(parsed["venue_key"], split.get(base, ())),
+                            "first_author": parsed["first_author"],
+                            "authors": parsed["authors"],
+                            "year": parsed["year"],
+                            "venues": [],
+                        }
+                    if parsed["venue"] and parsed["venue"] not in citations[key]["venues"]:
+                        citations[key]["venues"].append(parsed["venue"])
+                    if not index[key] or index[key][-1] != (ctx_name, idx):
+                        index[key].append((ctx_name, idx))
+                        uses += 1
+                    keys.add(key)
+            context_stats[ctx_name] = {
+                "connections": total,
+                "cited_connections": cited,
+                "citations": uses,
+                "distinct_references": len(keys),
+                "coverage": round(cited / total, 4) if total else 0.0,
+                "citations_per_connection": round(uses / total, 3) if total else 0.0,
+            }
+
+        for key, counts in variants.items():
+            citations[key]["variants"] = [v for v, _ in counts.most_common()]
+            citations[key]["connections"] = len(index[key])
+        return cls(citations, dict(index), context_stats, source, source_sha256)
+
+    # ── Lookups ──────────────────────────────────────────────────────────
+
+    def key_of(self, reference):
+        """Citation key of a reference string (parsed if not seen in the KB)."""
+        key = self.alias.get(reference)
+        if key is not None:
+            return key
+        parsed = parse_citation(reference)
+        return citation_key(parsed, self.split_bases.get(parsed["key"], ()))
+
+    def connections_citing(self, reference):
+        """[(context, index), ...] citing the work a key or reference string denotes."""
+        key = reference if reference in self.index else self.key_of(reference)
+        return self.index.get(key, [])
+
+    def works_by(self, author):
+        """Citation keys whose first author is ``author`` (any spelling)."""
+        return self.by_author.get(slug(author), [])
+
+    def connections_only_by(self, author):
+        """[(context, index), ...] whose every reference has ``author`` as first author."""
+        return self.only_author.get(slug(author), [])
+
+    def least_cited_contexts(self, n=5):
+        """
+        The ``n`` contexts with the lowest share of cited connections
+        (ties broken by fewest citations per connection).
+        """
+        return [(ctx, self.context_stats[ctx]) for ctx in self.coverage_ranking[:n]]
+
+    def most_cited(self, n=10):
+        return sorted(self.index, key=lambda key: (-len(self.index[key]), key))[:n]
+
+    # ── Persistence ──────────────────────────────────────────────────────
+
+    def to_dict(self):
+        return {
+            "format": FORMAT,
+            "source": self.source,
+            "source_sha256": self.source_sha256,
+            "citations": self.citations,
+            "index": {key: [list(loc) for loc in locs] for key, locs in self.index.items()},
+            "context_stats": self.context_stats,
+        }
+
+    def save(self, path):
+        write_json_atomic(path, self.to_dict())
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("format") != FORMAT:
+            raise ValueError(f"unsupported reference registry format: {data.get('format')!r}")
+        index = {key: [tuple(loc) for loc in locs] for key, locs in data["index"].items()}
+        return cls(data["citations"], index, data["context_stats"], data.get("source"), data.get("source_sha256"))
+
+    def is_current(self, kb_path):
+        return self.source_sha256 == file_digest(kb_path)
+
+
+def default_registry_path(kb_path):
+    """data/<kb stem>.references.json next to the KB file."""
+    kb_path = Path(kb_path)
+    return kb_path.with_name(f"{kb_path.stem}.references.json")
+
+
+def build_registry(kb_path, out_path=None):
+    """Build and save the registry of a KB file; returns the registry."""
+    kb_path = Path(kb_path)
+    registry = ReferenceRegistry.from_kb(
+        KnowledgeBase.from_file(kb_path), source=kb_path.name, source_sha256=file_digest(kb_path),
+    )
+    registry.save(out_path or default_registry_path(kb_path))
+    return registry
+
+
+def load_registry(kb_path, path=None, rebuild=True):
+    """
+    The saved registry of a KB file if it is still current; otherwise
+    rebuild (and re-save) it, or raise ValueError if ``rebuild`` is False.
+    """
+    path = Path(path or default_registry_path(kb_path))
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            registry = ReferenceRegistry.from_dict(json.load(f))
+        if registry.is_current(kb_path):
+            return registry
+    except (OSError, ValueError, KeyError):
+        pass
+    if not rebuild:
+        raise ValueError(f"{path} is missing or stale for {kb_path}")
+    return build_registry(kb_path, path)
@@ -0,0 +1,263 @@
+"""
+Sharded storage of a KB file: one JSON file per context plus a manifest.
+
+The monolithic KB JSON stays the source of truth (the Shiny app and the
+maintenance scripts read it); a shard directory is a derived layout for
+consumers that only need a few contexts::
+
+    ses_knowledge_db.shards/
+      manifest.json         format, source digest, top-level key order,
+                            per-shard file name, digest and sizes
+      global.json           every top-level entry except the sharded section
+      index.json            element -> [[context, category], ...] and
+                            from -> [[to, context, index], ...]
+      contexts/<name>.json  one context each
+
+The sharded section is ``contexts`` (``demonstration_areas`` for the WP5
+mechanism KB). Shards are written in the KB file format, so joining them
+back reproduces the source file byte for byte. ShardedKB reads the
+manifest up front and everything else on first use.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from urllib.parse import quote
+
+from .knowledge_base import CATEGORIES, KnowledgeBase, element_name
+from .transaction import dumps_kb, write_text_atomic
+
+SHARD_FORMAT = 1
+SHARDED_SECTIONS = ("contexts", "demonstration_areas")
+MANIFEST = "manifest.json"
+GLOBAL = "global.json"
+INDEX = "index.json"
+SHARD_DIR = "contexts"
+
+
+def default_shard_dir(kb_path):
+    """data/ses_knowledge_db.json -> data/ses_knowledge_db.shards/"""
+    kb_path = Path(kb_path)
+    return kb_path.with_name(kb_path.stem + ".shards")
+
+
+def _sha256(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _section_key(data):
+    for key in SHARDED_SECTIONS:
+        if isinstance(data.get(key), dict):
+            return key
+    raise ValueError(f"no shardable section ({', '.join(SHARDED_SECTIONS)}) in KB document")
+
+
+def build_index(section):
+    """Element and connection index over a section's contexts."""
+    elements = {}
+    connections = {}
+    for ctx_name, ctx in section.items():
+        if not isinstance(ctx, dict):
+            continue
+        for cat in CATEGORIES:
+            entries = ctx.get(cat, [])
+            for entry in entries if isinstance(entries, list) else []:
+                name = element_name(entry)
+                if name:
+                    elements.setdefault(name, []).append([ctx_name, cat])
+        conns = ctx.get("connections", [])
+        for idx, conn in enumerate(conns if isinstance(conns, list) else []):
+            if isinstance(conn, dict) and conn.get("from"):
+                connections.setdefault(conn["from"], []).append([conn.get("to", ""), ctx_name, idx])
+    return {"elements": elements, "connections": connections}
+
+
+def _write_if_changed(path, text):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if f.read() == text:
+                return False
+    except OSError:
+        pass
+    write_text_atomic(path, text)
+    return True
+
+
+def split_kb(kb_path, out_dir=None):
+    """
+    Write the shard layout of a KB file and return the manifest.
+
+    Unchanged shards are left alone, shards of removed contexts are
+    deleted, and the manifest is written last, so a reader never sees a
+    manifest pointing at missing files.
+    """
+    kb_path = Path(kb_path)
+    out_dir = Path(out_dir) if out_dir is not None else default_shard_dir(kb_path)
+    with open(kb_path, "r", encoding="utf-8") as f:
+        text = f.read()
+    data = json.loads(text)
+    section = _section_key(data)
+
+    shard_root = out_dir / SHARD_DIR
+    shard_root.mkdir(parents=True, exist_ok=True)
+
+    shards = {}
+    for ctx_name, ctx in data[section].items():
+        shard_text = dumps_kb(ctx)
+        file_name = f"{SHARD_DIR}/{quote(ctx_name, safe='')}.json"
+        _write_if_changed(out_dir / file_name, shard_text)
+        shards[ctx_name] = {
+            "file": file_name,
+            "sha256": _sha256(shard_text),
+            "elements": sum(len(ctx.get(cat, [])) for cat in CATEGORIES) if isinstance(ctx, dict) else 0,
+            "connections": len(ctx.get("connections", [])) if isinstance(ctx, dict) else 0,
+        }
+
+    live = {Path(entry["file"]).name for entry in shards.values()}
+    for stale in shard_root.glob("*.json"):
+        if stale.name not in live:
+            stale.unlink()
+
+    global_data = {key: value for key, value in data.items() if key != section}
+    _write_if_changed(out_dir / GLOBAL, dumps_kb(global_data))
+    _write_if_changed(out_dir / INDEX, json.dumps(build_index(data[section]), ensure_ascii=False, separators=(",", ":")))
+
+    manifest = {
+        "format": SHARD_FORMAT,
+        "source": kb_path.name,
+        "source_sha256": _sha256(text),
+        "section": section,
+        "keys": list(data),
+        "shards": shards,
+    }
+    _write_if_changed(out_dir / MANIFEST, dumps_kb(manifest))
+    return manifest
+
+
+def join_kb(shard_dir, out_path=None):
+    """
+    Reassemble the monolithic KB from a shard directory (atomically).
+
+    Returns the output path; by default the manifest's source file next
+    to the shard directory.
+    """
+    sharded = ShardedKB(shard_dir)
+    if out_path is None:
+        out_path = Path(shard_dir).parent / sharded.manifest["source"]
+    write_text_atomic(out_path, dumps_kb(sharded.to_document(verify=True)))
+    return Path(out_path)
+
+
+class ShardedKB:
+    """Read-only, lazily loaded view of a shard directory."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        with open(self.directory / MANIFEST, "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("format") != SHARD_FORMAT:
+            raise ValueError(f"{self.directory}: unsupported shard format {self.manifest.get('format')!r}")
+        self.section = self.manifest["section"]
+        self._contexts = {}
+        self._global = None
+        self._index = None
+
+    def _read(self, name):
+        with open(self.directory / name, "r", encoding="utf-8") as f:
+            return f.read()
+
+    # ── Contexts ─────────────────────────────────────────────────────────
+
+    @property
+    def context_names(self):
+        return list(self.manifest["shards"])
+
+    def __contains__(self, ctx_name):
+        return ctx_name in self.manifest["shards"]
+
+    def context(self, ctx_name, verify=False):
+        """One context's dict, read from its shard on first access."""
+        ctx = self._contexts.get(ctx_name)
+        if ctx is None:
+            entry = self.manifest["shards"][ctx_name]
+            text = self._read(entry["file"])
+            if verify and _sha256(text) != entry["sha256"]:
+                raise ValueError(f"{self.directory / entry['file']}: digest does not match the manifest")
+            ctx = self._contexts[ctx_name] = json.loads(text)
+        return ctx
+
+    def iter_contexts(self, names=None):
+        """Yield (name, context) for ``names`` (default: every context)."""
+        for ctx_name in self.context_names if names is None else names:
+            yield ctx_name, self.context(ctx_name)
+
+    # ── Everything else ──────────────────────────────────────────────────
+
+    @property
+    def global_data(self):
+        """Top-level entries other than the sharded section."""
+        if self._global is None:
+            self._global = json.loads(self._read(GLOBAL))
+        return self._global
+
+    def get(self, key, default=None):
+        if key == self.section:
+            return dict(self.iter_contexts())
+        return self.global_data.get(key, default)
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = json.loads(self._read(INDEX))
+        return self._index
+
+    def contexts_of(self, name):
+        """Contexts listing an element, from the index (no shard reads)."""
+        return [ctx_name for ctx_name, _ in self.index["elements"].get(name, [])]
+
+    def connections_from(self, name):
+        """[(to, context, index), ...] for connections leaving ``name``, from the index."""
+        return [tuple(item) for item in self.index["connections"].get(name, [])]
+
+    # ── Conversion ───────────────────────────────────────────────────────
+
+    def to_document(self, contexts=None, verify=False):
+        """
+        The KB document in its original key order. With ``contexts`` only
+        those contexts are read and included.
+        """
+        names = self.context_names if contexts is None else [c for c in self.context_names if c in set(contexts)]
+        global_data = self.global_data
+        document = {}
+        for key in self.manifest["keys"]:
+            if key == self.section:
+                document[key] = {name: self.context(name, verify) for name in names}
+            else:
+                document[key] = global_data[key]
+        return document
+
+    def knowledge_base(self, contexts=None):
+        """KnowledgeBase over the requested contexts only."""
+        return KnowledgeBase(self.to_document(contexts), self.directory)
+
+    def is_current(self, kb_path=None):
+        """True if the source KB file still matches the digest it was split from."""
+        kb_path = Path(kb_path) if kb_path is not None else self.directory.parent / self.manifest["source"]
+        if not kb_path.exists():
+            return False
+        with open(kb_path, "r", encoding="utf-8") as f:
+            return _sha256(f.read()) == self.manifest["source_sha256"]
+
+
+_OPENED = {}
+
+
+def open_shards(directory):
+    """Shared ShardedKB per directory, reopened when the manifest changes."""
+    directory = Path(directory).resolve()
+    stamp = os.stat(directory / MANIFEST).st_mtime_ns
+    cached = _OPENED.get(directory)
+    if cached is None or cached[0] != stamp:
+        cached = _OPENED[directory] = (stamp, ShardedKB(directory))
+    return cached[1]
@@ -0,0 +1,284 @@
+"""
+Atomic, transactional writes of the KB JSON files.
+
+Scripts that edit a KB in place open a transaction instead of dumping the
+file themselves::
+
+    with KBTransaction(KB_PATH, "Tasks 10-12") as tx:
+        with tx.step("task 10"):
+            task_10(tx.data)
+        with tx.step("task 11"):
+            task_11(tx.data)
+
+All mutations inside the ``with`` block are written in one go when it
+exits normally; if it raises (including sys.exit), nothing is written. A
+failing ``step`` is rolled back on its own before the error propagates.
+
+Writes go to a temp file in the KB's directory which then replaces the KB
+with os.replace(), so a crash can never leave a half-written file. The
+JSON is serialised exactly as the KB files are stored (indent=2, UTF-8,
+insertion key order, no trailing newline), so a git diff of the file only
+shows the entries that changed.
+
+Each committed transaction appends one line to the changelog
+(kb_audit/output/kb_changelog.jsonl by default): the file, the script,
+the before/after digests and an RFC 6902 JSON patch per step.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .knowledge_base import PROJECT_ROOT
+
+CHANGELOG_PATH = PROJECT_ROOT / "scripts" / "kb_audit" / "output" / "kb_changelog.jsonl"
+
+
+class ConcurrentModificationError(RuntimeError):
+    """The KB file changed on disk while a transaction had it open."""
+
+
+def dumps_kb(data):
+    """Serialise a KB document in the on-disk format of the KB files."""
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def _sha256(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def write_bytes_atomic(path, data):
+    """Replace ``path`` with ``data`` via a synced temp file and os.replace()."""
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            os.chmod(tmp, path.stat().st_mode & 0o7777)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def write_text_atomic(path, text):
+    """Atomically replace ``path`` with UTF-8 ``text``."""
+    write_bytes_atomic(path, text.encode("utf-8"))
+
+
+def write_json_atomic(path, data):
+    """Atomically write ``data`` to ``path`` in the KB file format."""
+    write_text_atomic(path, dumps_kb(data))
+
+
+# ── JSON patch ──────────────────────────────────────────────────────────
+
+
+def _pointer(path, key):
+    return f"{path}/{str(key).replace('~', '~0').replace('/', '~1')}"
+
+
+def json_diff(old, new, path=""):
+    """
+    RFC 6902 operations turning ``old`` into ``new``.
+
+    Dicts are compared key by key. Lists are trimmed to the span between
+    their common prefix and suffix; an equal-length span is diffed element
+    by element, otherwise it becomes removes plus adds, so deleting or
+    appending one connection is one operation rather than a rewrite of
+    every index after it.
+    """
+    if type(old) is not type(new):
+        return [{"op": "replace", "path": path, "value": new}]
+
+    if isinstance(old, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": _pointer(path, key)})
+            elif old[key] != new[key]:
+                ops.extend(json_diff(old[key], new[key], _pointer(path, key)))
+        for key in new:
+            if key not in old:
+                ops.append({"op": "add", "path": _pointer(path, key), "value": new[key]})
+        return ops
+
+    if isinstance(old, list):
+        start = 0
+        limit = min(len(old), len(new))
+        while start < limit and old[start] == new[start]:
+            start += 1
+        end_old, end_new = len(old), len(new)
+        while end_old > start and end_new > start and old[end_old - 1] == new[end_new - 1]:
+            end_old -= 1
+            end_new -= 1
+
+        ops = []
+        if end_old - start == end_new - start:
+            for i in range(start, end_old):
+                ops.extend(json_diff(old[i], new[i], _pointer(path, i)))
+            return ops
+        # Remove from the back so earlier indices stay valid
+        for i in range(end_old - 1, start - 1, -1):
+            ops.append({"op": "remove", "path": _pointer(path, i)})
+        for i in range(start, end_new):
+            ops.append({"op": "add", "path": _pointer(path, i), "value": new[i]})
+        return ops
+
+    if old != new:
+        return [{"op": "replace", "path": path, "value": new}]
+    return []
+
+
+def apply_patch(data, ops):
+    """Apply RFC 6902 add/remove/replace operations to ``data`` in place."""
+    for op in ops:
+        parts = [p.replace("~1", "/").replace("~0", "~") for p in op["path"].split("/")[1:]]
+        if not parts:
+            if op["op"] != "replace":
+                raise ValueError(f"unsupported root operation: {op['op']}")
+            data = op["value"]
+            continue
+        parent = data
+        for part in parts[:-1]:
+            parent = parent[int(part)] if isinstance(parent, list) else parent[part]
+        key = parts[-1]
+        if isinstance(parent, list):
+            key = len(parent) if key == "-" else int(key)
+            if op["op"] == "add":
+                parent.insert(key, op["value"])
+            elif op["op"] == "remove":
+                del parent[key]
+            else:
+                parent[key] = op["value"]
+        elif op["op"] == "remove":
+            del parent[key]
+        else:
+            parent[key] = op["value"]
+    return data
+
+
+# ── Transactions ────────────────────────────────────────────────────────
+
+
+class KBTransaction:
+    """
+    One batch of in-place edits to a KB file.
+
+    ``tx.data`` is the parsed document to mutate. The file is written only
+    on a clean exit from the ``with`` block, and only if the serialised
+    document actually changed.
+    """
+
+    def __init__(self, path, description="", changelog_path=CHANGELOG_PATH, dry_run=False):
+        """
+        Args:
+            path: KB file to edit
+            description: what the run does, recorded in the changelog
+            changelog_path: JSONL changelog to append to (None = no changelog)
+            dry_run: compute the patch but write neither the KB nor the changelog
+        """
+        self.path = Path(path)
+        self.description = description
+        self.changelog_path = Path(changelog_path) if changelog_path is not None else None
+        self.dry_run = dry_run
+        self.data = None
+        self.patch = []
+        self.committed = False
+        self._steps = []
+
+    def __enter__(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            self._original = f.read()
+        self._digest = _sha256(self._original)
+        self.data = json.loads(self._original)
+        self._checkpoint = self._original
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+    @contextmanager
+    def step(self, name):
+        """
+        Group the mutations made inside the block under ``name`` in the
+        changelog. If the block raises, the document is restored to its
+        state before the step and the error propagates.
+        """
+        before = self._checkpoint
+        try:
+            yield self.data
+        except BaseException:
+            self._restore(before)
+            raise
+        after = dumps_kb(self.data)
+        if after != before:
+            self._steps.append({"step": name, "patch": json_diff(json.loads(before), self.data)})
+        self._checkpoint = after
+
+    def _restore(self, text):
+        restored = json.loads(text)
+        self.data.clear()
+        self.data.update(restored)
+
+    def rollback(self):
+        """Discard every mutation since the transaction began."""
+        self._restore(self._original)
+        self._checkpoint = self._original
+        self._steps = []
+
+    def commit(self):
+        """Write the KB atomically and log the patch. Returns True if it changed."""
+        text = dumps_kb(self.data)
+        if text != self._checkpoint:
+            self._steps.append({"step": None, "patch": json_diff(json.loads(self._checkpoint), self.data)})
+            self._checkpoint = text
+        self.patch = [op for step in self._steps for op in step["patch"]]
+        if text == self._original:
+            return False
+        if self.dry_run:
+            return True
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            if _sha256(f.read()) != self._digest:
+                raise ConcurrentModificationError(
+                    f"{self.path} changed on disk during the transaction; not overwriting it"
+                )
+        write_text_atomic(self.path, text)
+        self.committed = True
+
+        if self.changelog_path is not None:
+            self._log(_sha256(text))
+        return True
+
+    def _log(self, after_digest):
+        try:
+            kb_file = str(self.path.resolve().relative_to(PROJECT_ROOT))
+        except ValueError:
+            kb_file = str(self.path)
+        entry = {
+            "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "kb_file": kb_file,
+            "script": Path(sys.argv[0]).name if sys.argv and sys.argv[0] else None,
+            "description": self.description,
+            "before": self._digest,
+            "after": after_digest,
+            "operations": len(self.patch),
+            "steps": self._steps,
+        }
+        self.changelog_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.changelog_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
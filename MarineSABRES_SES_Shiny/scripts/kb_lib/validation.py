@@ -0,0 +1,516 @@
+"""
+Single-pass validation engine for the knowledge base files.
+
+Checks are small visitor classes registered with ``@register_check``. For
+each KB file the engine walks the document once, handing every element,
+connection and (for the WP5 file) mechanism to the checks that implement
+the matching ``visit_*`` hook. Checks that need a context's whole graph
+subclass ``GraphCheck``; their ``run_context`` is fanned out per context
+to a process pool so the expensive ones run side by side.
+
+Each check ends up as a result dict::
+
+    {"title": ..., "status": "PASS" | "WARN" | "FAIL",
+     "issues": [{"severity", "message", "context", ...}, ...],
+     "stats": {...}}
+
+A file's status is the worst status among its checks. INFO issues are
+listed for review but never change a status.
+
+Given a sidecar cache file, validation is incremental: results of
+context-scoped checks are cached per context under its content hash, so
+a rerun after editing one context only revalidates that context, and
+global (cross-context) checks are rerun only when a part of the KB they
+depend on changed.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .knowledge_base import CATEGORIES, element_name, load_kb
+from .validation_cache import (
+    checks_fingerprint,
+    context_fingerprints,
+    file_digest,
+    links_digest,
+    load_cache,
+    save_cache,
+)
+
+SEVERITIES = ("INFO", "WARN", "FAIL")
+
+# KB document kinds: contexts -> connections (main and offshore wind KBs)
+# and demonstration_areas -> mechanisms (WP5 KB)
+KIND_CONTEXTS = "contexts"
+KIND_MECHANISMS = "mechanisms"
+
+# Check scopes: a context check's result for one context depends on that
+# context alone; a global check reads across contexts
+SCOPE_CONTEXT = "context"
+SCOPE_GLOBAL = "global"
+
+_REGISTRY = []
+
+
+def register_check(cls):
+    """Class decorator adding a check to the default check set."""
+    _REGISTRY.append(cls)
+    return cls
+
+
+def registered_checks():
+    return list(_REGISTRY)
+
+
+def kb_kind(data):
+    return KIND_MECHANISMS if "demonstration_areas" in data else KIND_CONTEXTS
+
+
+def issue(severity, message, context=None, **extra):
+    """Build an issue dict; ``extra`` carries check-specific fields."""
+    entry = {"severity": severity, "message": message}
+    if context is not None:
+        entry["context"] = context
+    entry.update(extra)
+    return entry
+
+
+def worst_status(statuses):
+    statuses = set(statuses)
+    if "FAIL" in statuses:
+        return "FAIL"
+    if "WARN" in statuses:
+        return "WARN"
+    return "PASS"
+
+
+class Check:
+    """
+    Base class for a validation check.
+
+    Subclasses set ``name``, ``title`` and ``kinds`` and override only the
+    hooks they need; the engine skips hooks left at the base no-op.
+
+    A context-scoped check (the default) is instantiated once per context,
+    so ``begin``/``finish`` bracket a single context and its result can be
+    cached per context. A global check is instantiated once per file and
+    sees every context.
+    """
+
+    name = None
+    title = None
+    kinds = (KIND_CONTEXTS,)
+    scope = SCOPE_CONTEXT
+    # Parts of the KB a global check reads: "elements", "connections", "links"
+    depends_on = ()
+
+    def __init__(self):
+        self.issues = []
+        self.stats = {}
+
+    def report(self, severity, message, context=None, **extra):
+        self.issues.append(issue(severity, message, context, **extra))
+
+    def begin(self, kb):
+        """Called before the traversal (of the one context, for context checks)."""
+
+    def visit_element(self, ctx_name, category, entry, name):
+        """Called for every category entry of every context."""
+
+    def visit_connection(self, ctx_name, idx, conn):
+        """Called for every connection dict of every context."""
+
+    def visit_mechanism(self, da_name, mech):
+        """Called for every WP5 mechanism."""
+
+    def finish(self, kb):
+        """Called after the traversal and after graph jobs."""
+
+    @classmethod
+    def needs_rerun(cls, kb, changes):
+        """
+        Whether a cached result of this global check is stale. ``changes``
+        maps "elements" and "connections" to the set of contexts whose part
+        changed, and "links" to whether cross_ecosystem_links changed.
+        """
+        return any(changes[part] for part in cls.depends_on)
+
+    @classmethod
+    def merge_stats(cls, parts):
+        """Combine the per-context stats of a context check."""
+        return merge_counts(parts)
+
+    def result(self):
+        return {
+            "title": self.title,
+            "status": worst_status(i["severity"] for i in self.issues),
+            "issues": self.issues,
+            "stats": self.stats,
+        }
+
+
+class GraphCheck(Check):
+    """
+    Check that analyses one context's connection graph at a time.
+
+    ``run_context`` must be a staticmethod so it can be pickled by
+    reference and executed in a worker process; it returns a list of
+    issue dicts and a stats dict for that context.
+    """
+
+    @staticmethod
+    def run_context(ctx_name, ctx):
+        raise NotImplementedError
+
+    def add_context_result(self, ctx_name, issues, stats):
+        self.issues.extend(issues)
+        if stats:
+            self.stats[ctx_name] = stats
+
+
+def merge_counts(parts):
+    """
+    Merge per-context stats dicts: numbers are summed, nested dicts merged
+    recursively, anything else keeps the first value seen.
+    """
+    merged = {}
+    for part in parts:
+        for key, value in part.items():
+            if key not in merged:
+                merged[key] = value
+            elif isinstance(value, dict) and isinstance(merged[key], dict):
+                merged[key] = merge_counts([merged[key], value])
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                merged[key] += value
+    return merged
+
+
+def _overrides(check, hook):
+    return getattr(type(check), hook) is not getattr(Check, hook)
+
+
+def _hooks(checks, hook):
+    return [getattr(c, hook) for c in checks if _overrides(c, hook)]
+
+
+def _visit_context(ctx_name, ctx, on_element, on_connection):
+    if on_element:
+        for cat in CATEGORIES:
+            entries = ctx.get(cat, [])
+            if not isinstance(entries, list):
+                continue
+            for entry in entries:
+                name = element_name(entry) or ""
+                for hook in on_element:
+                    hook(ctx_name, cat, entry, name)
+    if on_connection:
+        conns = ctx.get("connections", [])
+        for idx, conn in enumerate(conns if isinstance(conns, list) else []):
+            if isinstance(conn, dict):
+                for hook in on_connection:
+                    hook(ctx_name, idx, conn)
+
+
+def traverse(kb, checks):
+    """Walk the whole of ``kb`` once, dispatching to each check's visit hooks."""
+    on_element = _hooks(checks, "visit_element")
+    on_connection = _hooks(checks, "visit_connection")
+    on_mechanism = _hooks(checks, "visit_mechanism")
+
+    for check in checks:
+        check.begin(kb)
+
+    if on_element or on_connection:
+        for ctx_name, ctx in kb.iter_contexts():
+            _visit_context(ctx_name, ctx, on_element, on_connection)
+
+    if on_mechanism:
+        for da_name, da in kb.data.get("demonstration_areas", {}).items():
+            for mech in da.get("mechanisms", []):
+                for hook in on_mechanism:
+                    hook(da_name, mech)
+
+
+class _Done:
+    """Already-computed stand-in for a Future when graph checks run inline."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def result(self):
+        return self.value
+
+
+class _FileRun:
+    """
+    Validation of one KB file, split in two so that graph jobs for every
+    file are queued (``start``) before any of them is waited on (``finish``).
+    """
+
+    def __init__(self, path, check_classes, cached):
+        self.path = Path(path)
+        self.check_classes = check_classes
+        self.cached = cached or {}
+        self.report = None
+        self.cache_entry = None
+        self.revalidated = {}
+
+    def start(self, submit):
+        self.digest = file_digest(self.path)
+        if self.cached.get("digest") == self.digest and "report" in self.cached:
+            self.report = self.cached["report"]
+            self.cache_entry = self.cached
+            self.revalidated = {"contexts": 0, "global_checks": []}
+            return
+
+        self.kb = load_kb(self.path)
+        self.kind = kb_kind(self.kb.data)
+        self.check_classes = [cls for cls in self.check_classes if self.kind in cls.kinds]
+        if self.kind == KIND_MECHANISMS:
+            self.checks = [cls() for cls in self.check_classes]
+            traverse(self.kb, self.checks)
+            self.revalidated = {"contexts": 0, "global_checks": [c.name for c in self.checks]}
+        else:
+            self._start_contexts(submit)
+
+    def _start_contexts(self, submit):
+        kb = self.kb
+        self.fingerprints = context_fingerprints(kb)
+        self.links = links_digest(kb)
+        old = self.cached.get("contexts", {})
+        removed = set(old) - set(self.fingerprints)
+        changes = {
+            part: {
+                ctx_name for ctx_name, fp in self.fingerprints.items()
+                if old.get(ctx_name, {}).get(part) != fp[part]
+            } | removed
+            for part in ("elements", "connections")
+        }
+        changes["links"] = self.cached.get("links") != self.links
+        dirty = {
+            ctx_name for ctx_name, fp in self.fingerprints.items()
+            if old.get(ctx_name, {}).get("hash") != fp["hash"]
+        }
+
+        cached_global = self.cached.get("global", {})
+        local = [cls for cls in self.check_classes if cls.scope == SCOPE_CONTEXT]
+        self.global_checks = [
+            cls() for cls in self.check_classes
+            if cls.scope == SCOPE_GLOBAL
+            and (cls.name not in cached_global or cls.needs_rerun(kb, changes))
+        ]
+        for check in self.global_checks:
+            check.begin(kb)
+        global_elements = _hooks(self.global_checks, "visit_element")
+        global_connections = _hooks(self.global_checks, "visit_connection")
+
+        # One pass over the contexts: rerun global checks see every context,
+        # context checks get a fresh instance per changed context
+        self.context_checks = {}
+        self.pending = []
+        for ctx_name, ctx in kb.iter_contexts():
+            checks = [cls() for cls in local] if ctx_name in dirty else []
+            if ctx_name in dirty:
+                # Recorded even when nothing visits it, so its cache entry
+                # is rebuilt rather than read from a cold cache
+                self.context_checks[ctx_name] = checks
+            if not checks and not global_elements and not global_connections:
+                continue
+            for check in checks:
+                check.begin(kb)
+            _visit_context(
+                ctx_name, ctx,
+                global_elements + _hooks(checks, "visit_element"),
+                global_connections + _hooks(checks, "visit_connection"),
+            )
+            for check in checks:
+                if isinstance(check, GraphCheck):
+                    job = submit(type(check).run_context, ctx_name, ctx)
+                    self.pending.append((check, ctx_name, job))
+
+        self.revalidated = {
+            "contexts": len(dirty),
+            "global_checks": [check.name for check in self.global_checks],
+        }
+
+    def finish(self):
+        if self.report is not None:
+            return
+        if self.kind == KIND_MECHANISMS:
+            for check in self.checks:
+                check.finish(self.kb)
+            results = {check.name: check.result() for check in self.checks}
+            self.cache_entry = {"digest": self.digest}
+        else:
+            results = self._finish_contexts()
+        self.report = build_report(self.path, self.kb, self.kind, results)
+        self.cache_entry["report"] = self.report
+
+    def _finish_contexts(self):
+        for check, ctx_name, job in self.pending:
+            issues, stats = job.result()
+            check.add_context_result(ctx_name, issues, stats)
+
+        old = self.cached.get("contexts", {})
+        contexts = {}
+        for ctx_name, fp in self.fingerprints.items():
+            checks = self.context_checks.get(ctx_name)
+            if checks is None:
+                partials = old[ctx_name]["results"]
+            else:
+                for check in checks:
+                    check.finish(self.kb)
+                partials = {check.name: {"issues": check.issues, "stats": check.stats} for check in checks}
+            contexts[ctx_name] = dict(fp, results=partials)
+
+        global_results = dict(self.cached.get("global", {}))
+        for check in self.global_checks:
+            check.finish(self.kb)
+            global_results[check.name] = check.result()
+
+        results = {}
+        for cls in self.check_classes:
+            if cls.scope == SCOPE_GLOBAL:
+                results[cls.name] = global_results[cls.name]
+                continue
+            partials = [ctx["results"][cls.name] for ctx in contexts.values()]
+            issues = [entry for partial in partials for entry in partial["issues"]]
+            results[cls.name] = {
+                "title": cls.title,
+                "status": worst_status(entry["severity"] for entry in issues),
+                "issues": issues,
+                "stats": cls.merge_stats([partial["stats"] for partial in partials]),
+            }
+
+        self.cache_entry = {
+            "digest": self.digest,
+            "links": self.links,
+            "contexts": contexts,
+            "global": {cls.name: results[cls.name] for cls in self.check_classes if cls.scope == SCOPE_GLOBAL},
+        }
+        return results
+
+
+def validate_kbs(paths, check_classes=None, jobs=None, cache_path=None):
+    """
+    Validate several KB files in one pass each, sharing one worker pool.
+
+    With ``cache_path``, results are cached per context in that sidecar
+    file and a rerun only revalidates contexts whose content hash changed;
+    cross-context checks are rerun when a part of the KB they depend on
+    changed. A file whose bytes are unchanged is not parsed at all.
+
+    Args:
+        paths: KB file paths
+        check_classes: Check subclasses to run; defaults to all registered
+        jobs: Worker processes for graph checks; <= 1 runs them inline
+        cache_path: Sidecar cache file; None validates from scratch
+
+    Returns:
+        List of per-file report dicts, in ``paths`` order. Each carries a
+        ``revalidated`` entry saying how much work the run actually did.
+    """
+    check_classes = registered_checks() if check_classes is None else list(check_classes)
+    jobs = (os.cpu_count() or 1) if jobs is None else jobs
+    fingerprint = checks_fingerprint(check_classes) if cache_path else None
+    cached_files = load_cache(cache_path, fingerprint) if cache_path else {}
+
+    executor = None
+
+    def submit(func, *args):
+        nonlocal executor
+        if jobs <= 1:
+            return _Done(func(*args))
+        if executor is None:
+            executor = ProcessPoolExecutor(max_workers=jobs)
+        return executor.submit(func, *args)
+
+    runs = []
+    try:
+        for path in paths:
+            key = str(Path(path).resolve())
+            run = _FileRun(path, check_classes, cached_files.get(key))
+            run.start(submit)
+            runs.append((key, run))
+        for _, run in runs:
+            run.finish()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if cache_path:
+        cached_files.update({key: run.cache_entry for key, run in runs})
+        save_cache(cache_path, fingerprint, cached_files)
+
+    return [dict(run.report, revalidated=run.revalidated) for _, run in runs]
+
+
+def build_report(path, kb, kind, results):
+    counts = {sev: 0 for sev in SEVERITIES}
+    for result in results.values():
+        for entry in result["issues"]:
+            counts[entry["severity"]] += 1
+
+    if kind == KIND_MECHANISMS:
+        areas = kb.data.get("demonstration_areas", {})
+        size = {
+            "demonstration_areas": len(areas),
+            "mechanisms": sum(len(da.get("mechanisms", [])) for da in areas.values()),
+        }
+    else:
+        size = {"contexts": len(kb.contexts), "connections": kb.total_connections()}
+
+    return {
+        "kb_file": Path(path).name,
+        "version": kb.data.get("version", "unknown"),
+        "kind": kind,
+        **size,
+        "status": worst_status(r["status"] for r in results.values()),
+        "issue_counts": counts,
+        "checks": results,
+    }
+
+
+def write_markdown(reports, output_path, run_date, max_issues=20):
+    """Write a combined human-readable summary of several file reports."""
+    lines = [
+        "# KB Validation Report",
+        "",
+        f"**Date**: {run_date}",
+        "",
+        "| File | Status | FAIL | WARN | INFO |",
+        "|------|--------|------|------|------|",
+    ]
+    for report in reports:
+        c = report["issue_counts"]
+        lines.append(
+            f"| `{report['kb_file']}` | {report['status']} | "
+            f"{c['FAIL']} | {c['WARN']} | {c['INFO']} |"
+        )
+    lines.append("")
+
+    for report in reports:
+        lines.append(f"## {report['kb_file']}")
+        lines.append("")
+        lines.append("| Check | Status | Issues |")
+        lines.append("|-------|--------|--------|")
+        for result in report["checks"].values():
+            lines.append(f"| {result['title']} | {result['status']} | {len(result['issues'])} |")
+        lines.append("")
+
+        for result in report["checks"].values():
+            issues = result["issues"]
+            if not issues:
+                continue
+            lines.append(f"### {result['title']} ({len(issues)})")
+            lines.append("")
+            for entry in issues[:max_issues]:
+                where = f"`{entry['context']}`: " if "context" in entry else ""
+                lines.append(f"- [{entry['severity']}] {where}{entry['message']}")
+            if len(issues) > max_issues:
+                lines.append(f"- ... and {len(issues) - max_issues} more")
+            lines.append("")
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
@@ -0,0 +1,153 @@
+"""
+Content hashes and the sidecar cache behind incremental KB validation.
+
+The cache is one JSON file holding, per KB file, the file digest, the
+per-context hashes and the per-context check results of the last run.
+On the next run validate_kbs() compares hashes and only revalidates
+contexts whose content changed (see kb_lib.validation).
+
+A cache written by a different set of checks, or by a different version
+of their source code or of any kb_lib module they import, is ignored, so
+editing a check or the code behind it never serves stale results.
+"""
+
+import ast
+import hashlib
+import inspect
+import json
+import os
+import sys
+from pathlib import Path
+
+from .keyword_matcher import RULES_DIR
+from .knowledge_base import CATEGORIES
+
+CACHE_VERSION = 1
+_PACKAGE_DIR = Path(__file__).resolve().parent
+
+
+def _digest(value):
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def file_digest(path):
+    """SHA-256 of a file's bytes."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def context_fingerprints(kb):
+    """
+    Per-context content hashes.
+
+    Returns {context: {"hash", "elements", "connections"}}: ``hash`` covers
+    the whole context, ``elements`` only its category lists and
+    ``connections`` only its connection list, so cross-context checks can
+    tell which part of a context changed.
+    """
+    fingerprints = {}
+    for ctx_name, ctx in kb.iter_contexts():
+        fingerprints[ctx_name] = {
+            "hash": _digest(ctx),
+            "elements": _digest([ctx.get(cat) for cat in CATEGORIES]),
+            "connections": _digest(ctx.get("connections")),
+        }
+    return fingerprints
+
+
+def links_digest(kb):
+    return _digest(kb.data.get("cross_ecosystem_links"))
+
+
+def _package_imports(path):
+    """kb_lib modules imported by the source file ``path``, as module names."""
+    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom):
+            if node.level == 1 and node.module:
+                names.add(f"{__package__}.{node.module.split('.')[0]}")
+            elif node.level == 1:
+                names.update(f"{__package__}.{alias.name}" for alias in node.names)
+            elif node.level == 0 and node.module and node.module.split(".")[0] == __package__:
+                names.add(".".join(node.module.split(".")[:2]))
+        elif isinstance(node, ast.Import):
+            names.update(".".join(alias.name.split(".")[:2]) for alias in node.names
+                         if alias.name.split(".")[0] == __package__)
+    return {name for name in names if (_PACKAGE_DIR / f"{name.split('.')[1]}.py").exists()}
+
+
+def _source_closure(module_names):
+    """
+    ``module_names`` plus every kb_lib module they import, directly or
+    transitively, as {module name: source path or None}.
+    """
+    closure = {}
+    stack = list(module_names)
+    while stack:
+        name = stack.pop()
+        if name in closure:
+            continue
+        if name.startswith(f"{__package__}."):
+            path = _PACKAGE_DIR / f"{name.split('.', 1)[1]}.py"
+        else:
+            try:
+                path = Path(inspect.getsourcefile(sys.modules.get(name)))
+            except TypeError:
+                path = None
+        closure[name] = path if path is not None and path.exists() else None
+        if closure[name] is not None:
+            stack.extend(_package_imports(closure[name]))
+    return closure
+
+
+def checks_fingerprint(check_classes):
+    """
+    Hash of the selected check names, the source of every module the checks
+    depend on and the rule tables.
+
+    The sources hashed are the checks' own modules, kb_lib.validation and
+    this module, plus every kb_lib module those import, directly or
+    transitively (graph algorithms, keyword matching, near-duplicate
+    detection, ...), so a change anywhere in that code invalidates the cache.
+    """
+    modules = {cls.__module__ for cls in check_classes} | {__name__, f"{__package__}.validation"}
+    h = hashlib.sha256()
+    h.update("\n".join(cls.name for cls in check_classes).encode("utf-8"))
+    for module_name, path in sorted(_source_closure(modules).items()):
+        h.update(module_name.encode("utf-8"))
+        if path is not None:
+            h.update(path.read_bytes())
+    # Keyword rule tables feed some checks too
+    for rules_file in sorted(RULES_DIR.glob("*.json")):
+        h.update(rules_file.read_bytes())
+    return h.hexdigest()
+
+
+def load_cache(path, fingerprint):
+    """Cached per-file entries, or {} if the cache is missing, corrupt or stale."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != CACHE_VERSION or cache.get("checks") != fingerprint:
+        return {}
+    return cache.get("files", {})
+
+
+def save_cache(path, fingerprint, files):
+    """Write the cache atomically so an interrupted run can't corrupt it."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(
+            {"version": CACHE_VERSION, "checks": fingerprint, "files": files},
+            f, ensure_ascii=False, separators=(",", ":"),
+        )
+    os.replace(tmp, path)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Find causal paths across KB contexts, following intra-context connections
+and cross_ecosystem_links (kb_lib.multiplex).
+
+Endpoints are given as CONTEXT[:CATEGORY]; use * for any context. Narrow
+them further with --from-match / --to-match (substring of the element
+name). By default the 5 shortest paths are printed; --all lists every
+simple path up to --max-depth hops.
+
+Usage:
+    micromamba run -n shiny python scripts/kb_paths.py tropical_mangrove:pressures indian_ocean_coral_reef:welfare
+    micromamba run -n shiny python scripts/kb_paths.py 'baltic_offshore:pressures' 'baltic_estuary:welfare' --all --max-depth 5
+    micromamba run -n shiny python scripts/kb_paths.py '*:pressures' north_sea_offshore:welfare --from-match herring
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from kb_lib import CATEGORIES, KB_PATH, OFFSHORE_WIND_KB_PATH, load_kb
+from kb_lib.multiplex import MultiplexGraph
+
+
+def parse_endpoint(text):
+    context, _, category = text.partition(":")
+    if category and category not in CATEGORIES:
+        raise argparse.ArgumentTypeError(f"unknown category '{category}' (one of: {', '.join(CATEGORIES)})")
+    return (None if context in ("", "*") else context), (category or None)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Query causal paths across KB contexts.")
+    parser.add_argument("source", type=parse_endpoint, help="CONTEXT[:CATEGORY] to start from")
+    parser.add_argument("target", type=parse_endpoint, help="CONTEXT[:CATEGORY] to end in")
+    parser.add_argument("--from-match", default=None, help="source element name contains this text")
+    parser.add_argument("--to-match", default=None, help="target element name contains this text")
+    parser.add_argument("--all", action="store_true", help="list every path up to --max-depth hops")
+    parser.add_argument("--max-depth", type=int, default=8, help="longest path for --all (default: 8)")
+    parser.add_argument("-k", type=int, default=5, help="number of shortest paths (default: 5)")
+    parser.add_argument("--limit", type=int, default=50, help="paths to print with --all (default: 50)")
+    parser.add_argument(
+        "--kb", action="append", type=Path, dest="kb_files",
+        help="KB file to include (repeatable; default: main and offshore wind KBs)",
+    )
+    return parser.parse_args()
+
+
+def format_path(path):
+    lines = []
+    (ctx, name), rest = path["nodes"][0], path["nodes"][1:]
+    lines.append(f"    {ctx}: {name}")
+    for (ctx, name), hop in zip(rest, path["hops"]):
+        arrow = "==>" if hop["kind"] == "cross_link" else "-->"
+        lines.append(f"      {arrow} ({hop['polarity'] or '?'}) {ctx}: {name}")
+    return "\n".join(lines)
+
+
+def main():
+    args = parse_args()
+    started = time.perf_counter()
+    graph = MultiplexGraph(*(load_kb(p) for p in args.kb_files or [KB_PATH, OFFSHORE_WIND_KB_PATH]))
+    built = time.perf_counter() - started
+
+    sources = graph.select(*args.source, contains=args.from_match)
+    targets = graph.select(*args.target, contains=args.to_match)
+    if not sources or not targets:
+        print(f"ERROR: no {'source' if not sources else 'target'} elements match")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    if args.all:
+        paths = []
+        total = 0
+        for path in graph.all_paths(sources, targets, args.max_depth):
+            total += 1
+            if len(paths) < args.limit:
+                paths.append(path)
+    else:
+        paths = graph.shortest_paths(sources, targets, args.k)
+        total = len(paths)
+    elapsed = time.perf_counter() - started
+
+    print(f"{len(sources)} source(s), {len(targets)} target(s); "
+          f"{total} path(s) in {elapsed * 1000:.1f} ms (graph built in {built * 1000:.0f} ms)")
+    for i, path in enumerate(paths, 1):
+        polarity = path["polarity"] or "undetermined"
+        print(f"\n  [{i}] {path['length']} hop(s), polarity {polarity}, "
+              f"contexts: {' -> '.join(path['contexts'])}")
+        print(format_path(path))
+    if total > len(paths):
+        print(f"\n  ... {total - len(paths)} more (raise --limit)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Query the reference registry of a KB (kb_lib.references).
+
+  build     write data/<kb>.references.json (default: main and offshore wind KBs)
+  cite      connections citing a work, by citation key or reference text
+  only      connections whose every reference has this first author
+  contexts  contexts ranked by citation coverage, least cited first
+  top       most cited works
+
+Queries load the saved registry and rebuild it first if the KB changed.
+
+Usage:
+    micromamba run -n shiny python scripts/kb_references.py build
+    micromamba run -n shiny python scripts/kb_references.py cite halpern-2008
+    micromamba run -n shiny python scripts/kb_references.py cite "HELCOM 2018 State of the Baltic Sea"
+    micromamba run -n shiny python scripts/kb_references.py only Halpern
+    micromamba run -n shiny python scripts/kb_references.py contexts -n 10
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from kb_lib import KB_PATH, OFFSHORE_WIND_KB_PATH, load_kb, load_registry
+from kb_lib.references import build_registry, default_registry_path
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Normalised KB references and their citing connections.")
+    parser.add_argument("--kb", type=Path, default=KB_PATH, help="KB file to query (default: main KB)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="write the registry next to each KB")
+    build.add_argument("kb_files", nargs="*", type=Path, help="KB files (default: main and offshore wind KBs)")
+
+    cite = sub.add_parser("cite", help="connections citing a work")
+    cite.add_argument("reference", help="citation key (e.g. halpern-2008) or reference text")
+
+    only = sub.add_parser("only", help="connections supported only by one first author")
+    only.add_argument("author", help="first author surname or organisation (e.g. Halpern, HELCOM)")
+
+    contexts = sub.add_parser("contexts", help="contexts ranked by citation coverage")
+    contexts.add_argument("-n", type=int, default=10, help="contexts to list (default: 10)")
+
+    top = sub.add_parser("top", help="most cited works")
+    top.add_argument("-n", type=int, default=20, help="works to list (default: 20)")
+    return parser.parse_args()
+
+
+def print_connections(kb, locations):
+    for ctx_name, idx in locations:
+        conn = kb.connections(ctx_name)[idx]
+        print(f"  {ctx_name}[{idx}]: {conn.get('from', '')} -> {conn.get('to', '')}")
+
+
+def main():
+    args = parse_args()
+
+    if args.command == "build":
+        for kb_path in args.kb_files or [KB_PATH, OFFSHORE_WIND_KB_PATH]:
+            started = time.perf_counter()
+            registry = build_registry(kb_path)
+            print(f"{kb_path.name}: {len(registry.alias)} reference strings -> "
+                  f"{len(registry.citations)} works, {len(registry.connection_keys)} cited connections "
+                  f"-> {default_registry_path(kb_path)} ({time.perf_counter() - started:.2f}s)")
+        return
+
+    registry = load_registry(args.kb)
+
+    if args.command == "cite":
+        key = args.reference if args.reference in registry.citations else registry.key_of(args.reference)
+        citation = registry.citations.get(key)
+        if citation is None:
+            print(f"No work with key '{key}'")
+            return
+        print(f"{key}: {len(registry.index[key])} connection(s)")
+        print(f"  written as: {' | '.join(citation['variants'])}")
+        print_connections(load_kb(args.kb), registry.index[key])
+
+    elif args.command == "only":
+        locations = registry.connections_only_by(args.author)
+        works = registry.works_by(args.author)
+        print(f"{len(locations)} connection(s) cite only {args.author} "
+              f"({len(works)} work(s): {', '.join(sorted(works)) or 'none'})")
+        print_connections(load_kb(args.kb), locations)
+
+    elif args.command == "contexts":
+        print(f"{'context':<40} {'conns':>6} {'cited':>6} {'coverage':>9} {'refs/conn':>9} {'works':>6}")
+        for ctx_name, stats in registry.least_cited_contexts(args.n):
+            print(f"{ctx_name:<40} {stats['connections']:>6} {stats['cited_connections']:>6} "
+                  f"{stats['coverage']:>9.1%} {stats['citations_per_connection']:>9.2f} "
+                  f"{stats['distinct_references']:>6}")
+
+    else:
+        for key in registry.most_cited(args.n):
+            print(f"  {len(registry.index[key]):>4}  {key:<32} {registry.citations[key]['variants'][0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Convert KB files to and from the sharded per-context layout (kb_lib.shards).
+
+  split  write data/<kb>.shards/ from a monolithic KB (default: all three KBs)
+  join   rebuild the monolithic KB from a shard directory
+  check  report whether shard directories are still in sync with their KB
+
+The monolithic JSON remains the file the app and scripts edit; re-run
+``split`` after changing it (only changed shards are rewritten).
+
+Usage:
+    micromamba run -n shiny python scripts/kb_shards.py split
+    micromamba run -n shiny python scripts/kb_shards.py join data/ses_knowledge_db.shards
+    micromamba run -n shiny python scripts/kb_shards.py check
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from kb_lib import KB_PATH, OFFSHORE_WIND_KB_PATH, WP5_KB_PATH, ShardedKB, join_kb, split_kb
+from kb_lib.shards import default_shard_dir
+
+DEFAULT_KBS = [KB_PATH, OFFSHORE_WIND_KB_PATH, WP5_KB_PATH]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Split KB files into per-context shards and back.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    split = sub.add_parser("split", help="monolithic KB -> shard directory")
+    split.add_argument("kb_files", nargs="*", type=Path, help="KB files (default: main, offshore wind, WP5)")
+    split.add_argument("--out", type=Path, default=None, help="shard directory (single KB file only)")
+
+    join = sub.add_parser("join", help="shard directory -> monolithic KB")
+    join.add_argument("shard_dir", type=Path)
+    join.add_argument("--out", type=Path, default=None, help="output file (default: the source KB)")
+
+    check = sub.add_parser("check", help="are shard directories in sync with their KB?")
+    check.add_argument("kb_files", nargs="*", type=Path, help="KB files (default: main, offshore wind, WP5)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.command == "split":
+        kb_files = args.kb_files or DEFAULT_KBS
+        if args.out is not None and len(kb_files) != 1:
+            print("ERROR: --out needs exactly one KB file")
+            sys.exit(1)
+        for kb_path in kb_files:
+            started = time.perf_counter()
+            out_dir = args.out or default_shard_dir(kb_path)
+            manifest = split_kb(kb_path, out_dir)
+            shards = manifest["shards"]
+            n_conn = sum(entry["connections"] for entry in shards.values())
+            print(f"{kb_path.name}: {len(shards)} {manifest['section']}, {n_conn} connections "
+                  f"-> {out_dir} ({time.perf_counter() - started:.2f}s)")
+
+    elif args.command == "join":
+        out_path = join_kb(args.shard_dir, args.out)
+        print(f"Wrote {out_path}")
+
+    else:
+        stale = 0
+        for kb_path in args.kb_files or DEFAULT_KBS:
+            shard_dir = default_shard_dir(kb_path)
+            if not (shard_dir / "manifest.json").exists():
+                print(f"  [MISSING] {shard_dir}")
+                stale += 1
+            elif ShardedKB(shard_dir).is_current(kb_path):
+                print(f"  [OK]      {shard_dir}")
+            else:
+                print(f"  [STALE]   {shard_dir} (re-run split)")
+                stale += 1
+        sys.exit(1 if stale else 0)
+
+
+if __name__ == "__main__":
+    main()
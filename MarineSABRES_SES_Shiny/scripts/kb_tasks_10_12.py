@@ -6,21 +6,9 @@ Tasks 10-12: KB data quality fixes for ses_knowledge_db.json
   Task 12: Improve generic fallback section
 """
 
-import json
-from pathlib import Path
 from collections import defaultdict
 
-PROJECT_ROOT = Path(__file__).resolve().parent.parent
-KB_PATH = PROJECT_ROOT / "data" / "ses_knowledge_db.json"
-
-def load_kb():
-    with open(KB_PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-def save_kb(db):
-    with open(KB_PATH, "w", encoding="utf-8") as f:
-        json.dump(db, f, indent=2, ensure_ascii=False)
-    print(f"Saved to {KB_PATH}")
+from kb_lib import KB_PATH, KBTransaction, KnowledgeBase
 
 
 # ── Task 10: Standardize reversibility and temporal_lag ──
@@ -64,20 +52,19 @@ def task_10(db):
     lag_changes = defaultdict(int)
 
     # Process all connections in all contexts
-    for ctx_name, ctx in db.get("contexts", {}).items():
-        for conn in ctx.get("connections", []):
-            # Reversibility
-            rev = conn.get("reversibility")
-            if rev in REVERSIBILITY_MAP:
-                conn["reversibility"] = REVERSIBILITY_MAP[rev]
-                rev_changes[rev] += 1
-
-            # Temporal lag
-            lag = conn.get("temporal_lag")
-            if lag is not None and is_numeric_string(lag):
-                new_val = numeric_to_temporal_lag(lag)
-                lag_changes[f"{lag} -> {new_val}"] += 1
-                conn["temporal_lag"] = new_val
+    for _, _, conn in KnowledgeBase(db).iter_connections():
+        # Reversibility
+        rev = conn.get("reversibility")
+        if rev in REVERSIBILITY_MAP:
+            conn["reversibility"] = REVERSIBILITY_MAP[rev]
+            rev_changes[rev] += 1
+
+        # Temporal lag
+        lag = conn.get("temporal_lag")
+        if lag is not None and is_numeric_string(lag):
+            new_val = numeric_to_temporal_lag(lag)
+            lag_changes[f"{lag} -> {new_val}"] += 1
+            conn["temporal_lag"] = new_val
 
     # Also process cross_ecosystem_links
     for link in db.get("cross_ecosystem_links", []):
@@ -268,16 +255,6 @@ NEW_LINKS = [
 ]
 
 
-def get_all_elements_for_context(ctx):
-    """Get all element names across all categories for a context."""
-    categories = ["drivers", "activities", "pressures", "states", "impacts", "welfare", "responses"]
-    elements = set()
-    for cat in categories:
-        for elem in ctx.get(cat, []):
-            elements.add(elem["name"])
-    return elements
-
-
 def task_11(db):
     print("=" * 70)
     print("TASK 11: Expand cross-ecosystem links")
@@ -302,11 +279,8 @@ def task_11(db):
     cross_links = deduped
     print(f"\nDuplicates removed: {dupes_removed}")
 
-    # Step 2: Build element index for validation
-    contexts = db.get("contexts", {})
-    context_elements = {}
-    for ctx_name, ctx in contexts.items():
-        context_elements[ctx_name] = get_all_elements_for_context(ctx)
+    # Step 2: Element index for validation
+    kb = KnowledgeBase(db)
 
     # Step 3: Add new links with validation
     added = 0
@@ -318,25 +292,25 @@ def task_11(db):
         te = link["to_element"]
 
         # Check from_context exists
-        if fc not in context_elements:
+        if fc not in kb.context_elements:
             print(f"  WARNING: from_context '{fc}' not found in KB. Skipping link.")
             skipped += 1
             continue
 
         # Check to_context exists
-        if tc not in context_elements:
+        if tc not in kb.context_elements:
             print(f"  WARNING: to_context '{tc}' not found in KB. Skipping link.")
             skipped += 1
             continue
 
         # Check from_element exists
-        if fe not in context_elements[fc]:
+        if kb.element_category(fc, fe) is None:
             print(f"  WARNING: from_element '{fe}' not found in context '{fc}'. Skipping link.")
             skipped += 1
             continue
 
         # Check to_element exists
-        if te not in context_elements[tc]:
+        if kb.element_category(tc, te) is None:
             print(f"  WARNING: to_element '{te}' not found in context '{tc}'. Skipping link.")
             skipped += 1
             continue
@@ -461,13 +435,18 @@ def task_12(db):
 
 
 def main():
-    db = load_kb()
-
-    task_10(db)
-    task_11(db)
-    task_12(db)
-
-    save_kb(db)
+    with KBTransaction(KB_PATH, "Tasks 10-12: vocabulary, cross-ecosystem links, generic fallback") as tx:
+        with tx.step("task 10"):
+            task_10(tx.data)
+        with tx.step("task 11"):
+            task_11(tx.data)
+        with tx.step("task 12"):
+            task_12(tx.data)
+
+    if tx.committed:
+        print(f"Saved to {KB_PATH} ({len(tx.patch)} change(s))")
+    else:
+        print(f"No changes; {KB_PATH} left untouched")
     print("All tasks complete.")
 
 
@@ -48,11 +48,17 @@ def initialize_extensions(app):
     # CORS configuration
     CORS(app, origins=app.config['CORS_ORIGINS'])
     
-    # Add proxy fix for production deployment
-    if app.config.get('ENV') == 'production':
+    # Per-client rate limiting
+    if app.config.get('RATELIMIT_ENABLED'):
+        from utils.rate_limit import RateLimiter
+        RateLimiter(app)
+    
+    # Trust X-Forwarded-* from the configured number of reverse proxies
+    proxy_hops = app.config.get('PROXY_FIX_X_FOR', 0)
+    if proxy_hops:
         app.wsgi_app = ProxyFix(
             app.wsgi_app,
-            x_for=1,
+            x_for=proxy_hops,
             x_proto=1,
             x_host=1,
             x_prefix=1
@@ -0,0 +1,361 @@
+"""
+MARBEFES BBT Database - ASGI application
+
+The upstream-bound WMS routes (/api/layers, /api/helcom-layers,
+/api/capabilities, /api/feature-info) run natively async over one shared
+httpx connection pool, so a single process can hold hundreds of requests
+waiting on EMODnet/HELCOM. Every other route is served by the regular
+Flask app, whose blocking and CPU-heavy work (GeoJSON/TopoJSON encoding,
+vector I/O) runs on at most ASGI_WSGI_THREADS threads off the event loop.
+
+Run with:
+    uvicorn asgi:create_asgi_app --factory --host 0.0.0.0 --port 5000
+"""
+import asyncio
+import contextlib
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, List, Tuple
+
+import httpx
+from asgiref.sync import ThreadSensitiveContext
+from asgiref.wsgi import WsgiToAsgi
+from starlette.applications import Starlette
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Mount, Route, request_response
+from werkzeug.exceptions import BadRequest
+
+from app import create_app
+from services.async_wms_service import AsyncWMSService
+from utils.cache import get_cache, cache_key_for_request
+from utils.compression import CompressedBody, enabled_encodings
+from utils.rate_limit import MemoryStorage, forwarded_client
+from utils.validators import validate_layer_name
+
+logger = logging.getLogger(__name__)
+
+# (body, status, mimetype) produced by a cached async view
+ViewResult = Tuple[bytes, int, str]
+
+
+class ConcurrentWsgiToAsgi:
+    """
+    asgiref's WsgiToAsgi with up to ``max_threads`` requests in flight
+
+    WsgiToAsgi runs WSGI calls in thread-sensitive mode, which by default
+    means one shared thread and would serialise the whole Flask app behind
+    a single request. Each request here runs in its own
+    ThreadSensitiveContext, and so on its own worker thread; a semaphore
+    bounds how many run at once.
+    """
+
+    def __init__(self, wsgi_application, max_threads: int):
+        self.adapter = WsgiToAsgi(wsgi_application)
+        self.slots = asyncio.Semaphore(max_threads)
+
+    async def __call__(self, scope, receive, send):
+        async with self.slots:
+            async with ThreadSensitiveContext():
+                await self.adapter(scope, receive, send)
+
+
+def _json_body(data: Any) -> bytes:
+    return json.dumps(data).encode('utf-8')
+
+
+def _error(message: str, status: int) -> JSONResponse:
+    return JSONResponse({'error': message}, status_code=status)
+
+
+def rate_limited(endpoint: str):
+    """
+    Charge an async view to the Flask app's rate limiter
+
+    Args:
+        endpoint: Flask endpoint name the view replaces; its configured
+            cost and exemption apply, and buckets are shared with Flask routes
+
+    Returns:
+        Decorated async view
+    """
+    def decorator(view: Callable[[Request], Awaitable[Response]]):
+        @wraps(view)
+        async def wrapper(request: Request) -> Response:
+            limiter = request.app.state.flask_app.extensions.get('rate_limiter')
+            if limiter is None:
+                return await view(request)
+
+            client = forwarded_client(
+                request.client.host if request.client else None,
+                request.headers.get('x-forwarded-for'),
+                request.app.state.flask_app.config.get('PROXY_FIX_X_FOR', 0)
+            )
+            if isinstance(limiter.storage, MemoryStorage):
+                result = limiter.check(client, endpoint, request.method)
+            else:
+                # Shared backends do network I/O; keep it off the event loop
+                # and out of the parse pool so slow storage never queues parsing
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(
+                    request.app.state.ratelimit_executor,
+                    limiter.check, client, endpoint, request.method
+                )
+            if result is None:
+                return await view(request)
+
+            allowed, remaining, retry_seconds = result
+            if not allowed:
+                return JSONResponse(
+                    {
+                        'error': 'Rate limit exceeded',
+                        'limit': request.app.state.flask_app.config.get('RATELIMIT_DEFAULT'),
+                        'retry_after': retry_seconds
+                    },
+                    status_code=429,
+                    headers={'Retry-After': str(retry_seconds)}
+                )
+
+            response = await view(request)
+            response.headers['X-RateLimit-Limit'] = str(limiter.capacity)
+            response.headers['X-RateLimit-Remaining'] = str(int(remaining))
+            return response
+        return wrapper
+    return decorator
+
+
+def cached_view(ttl: int = 3600, key_prefix: str = None):
+    """
+    Async counterpart of utils.compression.cached_response
+
+    Entries use the same keys and CompressedBody values as the Flask
+    decorator, so both apps share cached bodies and compressed variants.
+    Concurrent misses for one key share a single upstream fetch.
+
+    Args:
+        ttl: Time to live in seconds
+        key_prefix: Cache key prefix; must match the Flask view name to share entries
+
+    Returns:
+        Decorated async view returning (body, status, mimetype)
+    """
+    def decorator(view: Callable[[Request], Awaitable[ViewResult]]):
+        prefix = key_prefix or view.__name__
+
+        @wraps(view)
+        async def wrapper(request: Request) -> Response:
+            state = request.app.state
+            key_source = SimpleNamespace(
+                path=request.url.path, method=request.method, args=request.query_params
+            )
+            cache_key = f"{prefix}:{cache_key_for_request(key_source)}"
+            cache = get_cache(ttl)
+
+            async def produce() -> CompressedBody:
+                body, status, mimetype = await view(request)
+                produced = CompressedBody(body, status, mimetype, [])
+                if status == 200:
+                    cache.set(cache_key, produced)
+                return produced
+
+            entry = cache.get(cache_key)
+            if entry is None:
+                pending = state.inflight.get(cache_key)
+                if pending is None:
+                    pending = asyncio.ensure_future(produce())
+                    state.inflight[cache_key] = pending
+                    pending.add_done_callback(lambda _: state.inflight.pop(cache_key, None))
+                entry = await asyncio.shield(pending)
+
+            config = state.flask_app.config
+            min_size = config.get('COMPRESSION_MIN_SIZE', 1024)
+            body, encoding = entry.select(
+                request.headers.get('accept-encoding'), min_size, enabled_encodings(config)
+            )
+            response = Response(body, status_code=entry.status, media_type=entry.mimetype)
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+            if entry.is_compressible(min_size):
+                response.headers['Vary'] = 'Accept-Encoding'
+            return response
+        return wrapper
+    return decorator
+
+
+def _wms_service(request: Request, base_url_key: str, version_key: str) -> AsyncWMSService:
+    state = request.app.state
+    config = state.flask_app.config
+    return AsyncWMSService(
+        state.http_client, config[base_url_key], config[version_key],
+        executor=state.parse_executor
+    )
+
+
+@rate_limited('api.get_layers')
+@cached_view(ttl=3600, key_prefix='get_layers')
+async def get_layers(request: Request) -> ViewResult:
+    """Get available WMS layers"""
+    try:
+        wms_service = _wms_service(request, 'WMS_BASE_URL', 'WMS_VERSION')
+        layers = await wms_service.get_available_layers(
+            request.app.state.flask_app.config.get('DEFAULT_LAYERS', [])
+        )
+        return _json_body({
+            'layers': layers,
+            'count': len(layers),
+            'source': 'EMODnet'
+        }), 200, 'application/json'
+    except Exception as e:
+        logger.error(f"Error fetching layers: {e}")
+        return _json_body({'error': str(e)}), 500, 'application/json'
+
+
+@rate_limited('api.get_helcom_layers')
+@cached_view(ttl=3600, key_prefix='get_helcom_layers')
+async def get_helcom_layers(request: Request) -> ViewResult:
+    """Get available HELCOM WMS layers"""
+    try:
+        helcom_service = _wms_service(request, 'HELCOM_WMS_BASE_URL', 'HELCOM_WMS_VERSION')
+        layers = await helcom_service.get_helcom_layers()
+        return _json_body({
+            'layers': layers,
+            'count': len(layers),
+            'source': 'HELCOM'
+        }), 200, 'application/json'
+    except Exception as e:
+        logger.error(f"Error fetching HELCOM layers: {e}")
+        return _json_body({'error': str(e)}), 500, 'application/json'
+
+
+@rate_limited('api.get_capabilities')
+@cached_view(ttl=7200, key_prefix='get_capabilities')
+async def get_capabilities(request: Request) -> ViewResult:
+    """Get WMS GetCapabilities document"""
+    try:
+        wms_service = _wms_service(request, 'WMS_BASE_URL', 'WMS_VERSION')
+        return await wms_service.get_capabilities_xml(), 200, 'text/xml'
+    except Exception as e:
+        logger.error(f"Error fetching capabilities: {e}")
+        return _json_body({'error': str(e)}), 500, 'application/json'
+
+
+@rate_limited('api.get_feature_info')
+async def get_feature_info(request: Request) -> Response:
+    """Get feature information for a specific location"""
+    try:
+        try:
+            data = await request.json()
+        except ValueError as e:
+            raise BadRequest(f'Failed to decode JSON object: {e}')
+        if not isinstance(data, dict):
+            raise BadRequest('Request body must be a JSON object')
+
+        # Validate required parameters
+        required = ['layer', 'bbox', 'width', 'height', 'x', 'y']
+        missing = [field for field in required if field not in data]
+        if missing:
+            return _error(f'Missing required fields: {missing}', 400)
+
+        # Validate layer name
+        layer_name = validate_layer_name(data['layer'])
+
+        wms_service = _wms_service(request, 'WMS_BASE_URL', 'WMS_VERSION')
+        feature_info = await wms_service.get_feature_info(
+            layer_name=layer_name,
+            bbox=data['bbox'],
+            width=data['width'],
+            height=data['height'],
+            x=data['x'],
+            y=data['y']
+        )
+
+        return JSONResponse({
+            'layer': layer_name,
+            'feature_info': feature_info
+        })
+    except BadRequest as e:
+        return _error(str(e), 400)
+    except Exception as e:
+        logger.error(f"Error getting feature info: {e}")
+        return _error(str(e), 500)
+
+
+def _async_route(path: str, view: Callable, methods: List[str], cors_origins) -> Route:
+    """
+    Route for an async view with the CORS policy Flask-CORS applies to Flask routes
+
+    Args:
+        path: URL path
+        view: Async view
+        methods: Allowed methods (OPTIONS preflights are answered by the CORS layer)
+        cors_origins: CORS_ORIGINS setting ('*', one origin or a list)
+
+    Returns:
+        Starlette route
+    """
+    origins = [cors_origins] if isinstance(cors_origins, str) else list(cors_origins)
+    endpoint = CORSMiddleware(
+        request_response(view),
+        allow_origins=origins,
+        allow_methods=methods,
+        allow_headers=['*']
+    )
+    return Route(path, endpoint, methods=methods + ['OPTIONS'], name=view.__name__)
+
+
+def create_asgi_app(config_name=None) -> Starlette:
+    """
+    ASGI application factory
+
+    Args:
+        config_name: Configuration name passed to the Flask app factory
+
+    Returns:
+        Starlette application; the wrapped Flask app is ``app.state.flask_app``
+    """
+    flask_app = create_app(config_name)
+    config = flask_app.config
+
+    parse_executor = ThreadPoolExecutor(
+        max_workers=config['ASGI_PARSE_THREADS'], thread_name_prefix='marbefes-parse'
+    )
+    ratelimit_executor = ThreadPoolExecutor(
+        max_workers=config['ASGI_RATELIMIT_THREADS'], thread_name_prefix='marbefes-ratelimit'
+    )
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette):
+        limits = httpx.Limits(
+            max_connections=config['ASGI_UPSTREAM_CONNECTIONS'],
+            max_keepalive_connections=config['CONNECTION_POOL_SIZE']
+        )
+        async with httpx.AsyncClient(
+            limits=limits,
+            timeout=config['REQUEST_TIMEOUT'],
+            headers={'User-Agent': 'MARBEFES-BBT-Database/1.0'}
+        ) as client:
+            app.state.http_client = client
+            flask_app.logger.info('MARBEFES BBT Database ASGI startup')
+            yield
+        parse_executor.shutdown(wait=False)
+        ratelimit_executor.shutdown(wait=False)
+
+    origins = config['CORS_ORIGINS']
+    routes = [
+        _async_route('/api/layers', get_layers, ['GET', 'HEAD'], origins),
+        _async_route('/api/helcom-layers', get_helcom_layers, ['GET', 'HEAD'], origins),
+        _async_route('/api/capabilities', get_capabilities, ['GET', 'HEAD'], origins),
+        _async_route('/api/feature-info', get_feature_info, ['POST'], origins),
+        Mount('/', app=ConcurrentWsgiToAsgi(flask_app, config['ASGI_WSGI_THREADS'])),
+    ]
+
+    app = Starlette(routes=routes, lifespan=lifespan)
+    app.state.flask_app = flask_app
+    app.state.parse_executor = parse_executor
+    app.state.ratelimit_executor = ratelimit_executor
+    app.state.inflight = {}
+    return app
@@ -0,0 +1,475 @@
+"""
+Load-test harness for the MARBEFES BBT Database API
+
+Serves the application in a child process against a local stub WMS server
+and synthetic vector layers (with stand-ins from stub_services.py for any
+services.* modules missing from the tree), drives the /api/* and /api/vector/* endpoints at
+a fixed concurrency, and writes latency percentiles, throughput and server
+RSS to a JSON results file that can be compared across commits.
+
+Usage:
+    python benchmarks/run_benchmarks.py --concurrency 16 --requests 400
+    python benchmarks/run_benchmarks.py --server asgi --concurrency 200
+    python benchmarks/run_benchmarks.py --compare results/a.json results/b.json
+"""
+import argparse
+import json
+import logging
+import math
+import multiprocessing
+import os
+import platform
+import queue
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http.client import HTTPConnection
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+APP_DIR = BENCH_DIR.parent
+RESULTS_DIR = BENCH_DIR / 'results'
+
+sys.path.insert(0, str(BENCH_DIR))
+
+from stub_services import install as install_stub_services, missing_services  # noqa: E402
+from stub_wms import StubWMSServer  # noqa: E402
+from synthetic_layers import write_layers  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+# Synthetic layer name -> (features, vertices per ring)
+DEFAULT_LAYER_SIZES = {
+    'synthetic_small': (50, 32),
+    'synthetic_medium': (500, 64),
+    'synthetic_large': (1000, 128),
+}
+
+FEATURE_INFO_BODY = {
+    'layer': 'all_eusm2021',
+    'bbox': [-10, 35, 30, 70],
+    'width': 800,
+    'height': 600,
+    'x': 400,
+    'y': 300
+}
+
+
+def default_scenarios(layer_sizes: Dict[str, tuple]) -> List[Dict[str, Any]]:
+    """
+    Build the list of endpoint scenarios to drive
+
+    Args:
+        layer_sizes: Synthetic vector layers available to the server
+
+    Returns:
+        List of scenario dictionaries (name, method, path, body)
+    """
+    scenarios = [
+        {'name': 'api_layers', 'method': 'GET', 'path': '/api/layers'},
+        {'name': 'api_helcom_layers', 'method': 'GET', 'path': '/api/helcom-layers'},
+        {'name': 'api_all_layers', 'method': 'GET', 'path': '/api/all-layers'},
+        {'name': 'api_capabilities', 'method': 'GET', 'path': '/api/capabilities'},
+        {'name': 'api_legend', 'method': 'GET', 'path': '/api/legend/all_eusm2021'},
+        {'name': 'api_feature_info', 'method': 'POST', 'path': '/api/feature-info',
+         'body': FEATURE_INFO_BODY},
+        {'name': 'vector_layers', 'method': 'GET', 'path': '/api/vector/layers'},
+        {'name': 'vector_bounds', 'method': 'GET', 'path': '/api/vector/bounds'},
+        {'name': 'vector_search', 'method': 'GET', 'path': '/api/vector/search?q=patch&limit=50'},
+    ]
+    for layer in sorted(layer_sizes):
+        scenarios.append({
+            'name': f'vector_layer_{layer}',
+            'method': 'GET',
+            'path': f'/api/vector/layer/{layer}'
+        })
+    return scenarios
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """
+    Nearest-rank percentile of an already sorted list
+
+    Args:
+        sorted_values: Ascending list of samples
+        pct: Percentile in the range 0-100
+
+    Returns:
+        Percentile value or None for an empty list
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def read_rss_kb(pid: int) -> Dict[str, Optional[int]]:
+    """
+    Read current and peak resident set size of a process
+
+    Args:
+        pid: Process id
+
+    Returns:
+        Dictionary with 'rss_kb' and 'peak_rss_kb' (None when unavailable)
+    """
+    status_path = Path(f'/proc/{pid}/status')
+    if status_path.exists():
+        values = {}
+        for line in status_path.read_text().splitlines():
+            if line.startswith(('VmRSS:', 'VmHWM:')):
+                key, value = line.split(':', 1)
+                values[key] = int(value.split()[0])
+        return {'rss_kb': values.get('VmRSS'), 'peak_rss_kb': values.get('VmHWM')}
+
+    try:
+        import psutil
+        info = psutil.Process(pid).memory_info()
+        peak = getattr(info, 'peak_wset', None)
+        return {
+            'rss_kb': info.rss // 1024,
+            'peak_rss_kb': peak // 1024 if peak else None
+        }
+    except (ImportError, Exception):
+        return {'rss_kb': None, 'peak_rss_kb': None}
+
+
+def serve_app(port_queue, env: Dict[str, str], vector_dir: str,
+              config_name: str, workdir: str, server_kind: str = 'wsgi') -> None:
+    """
+    Child-process entry point running the app on a threaded WSGI server or uvicorn
+
+    Args:
+        port_queue: Queue the bound port is reported on
+        env: Environment overrides (WMS URLs) applied before importing config
+        vector_dir: Directory holding the synthetic vector layers
+        config_name: Configuration name passed to create_app
+        workdir: Working directory for logs and other relative paths
+        server_kind: 'wsgi' (Flask app) or 'asgi' (asgi.create_asgi_app on uvicorn)
+    """
+    os.environ.update(env)
+    os.chdir(workdir)
+    sys.path.insert(0, str(APP_DIR))
+    install_stub_services(APP_DIR)
+
+    if server_kind == 'asgi':
+        import socket
+        import uvicorn
+        from asgi import create_asgi_app
+
+        asgi_app = create_asgi_app(config_name)
+        asgi_app.state.flask_app.config.update(
+            VECTOR_DATA_PATH=Path(vector_dir),
+            ENABLE_VECTOR_SUPPORT=True
+        )
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(('127.0.0.1', 0))
+        sock.listen(2048)  # accept into the backlog before uvicorn finishes starting
+        port_queue.put(sock.getsockname()[1])
+        uvicorn.Server(uvicorn.Config(asgi_app, log_level='warning')).run(sockets=[sock])
+        return
+
+    from werkzeug.serving import make_server
+    from app import create_app
+
+    app = create_app(config_name)
+    app.config.update(
+        VECTOR_DATA_PATH=Path(vector_dir),
+        ENABLE_VECTOR_SUPPORT=True
+    )
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    port_queue.put(server.server_port)
+    server.serve_forever()
+
+
+def wait_for_port(port_queue, server, timeout: float = 60.0) -> int:
+    """
+    Wait for the server process to report its port
+
+    Args:
+        port_queue: Queue written by serve_app
+        server: Server process
+        timeout: Seconds to wait before giving up
+
+    Returns:
+        Bound port number
+
+    Raises:
+        RuntimeError: If the server exits or does not start in time
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not server.is_alive():
+            raise RuntimeError(f"Benchmark server exited during startup (code {server.exitcode})")
+        try:
+            return port_queue.get(timeout=0.5)
+        except queue.Empty:
+            continue
+    raise RuntimeError("Benchmark server did not start in time")
+
+
+def _request(host: str, port: int, scenario: Dict[str, Any], timeout: float) -> tuple:
+    """Issue one request and return (latency_seconds, status, body_bytes)"""
+    body = None
+    headers = {'Accept': 'application/json'}
+    if scenario.get('body') is not None:
+        body = json.dumps(scenario['body'])
+        headers['Content-Type'] = 'application/json'
+
+    start = time.perf_counter()
+    conn = HTTPConnection(host, port, timeout=timeout)
+    try:
+        conn.request(scenario['method'], scenario['path'], body=body, headers=headers)
+        response = conn.getresponse()
+        payload = response.read()
+        status = response.status
+    except OSError:
+        payload = b''
+        status = 0
+    finally:
+        conn.close()
+    return time.perf_counter() - start, status, len(payload)
+
+
+def run_scenario(host: str, port: int, scenario: Dict[str, Any], total: int,
+                 concurrency: int, warmup: int, timeout: float,
+                 server_pid: int) -> Dict[str, Any]:
+    """
+    Drive one endpoint at fixed concurrency and summarize the samples
+
+    Args:
+        host: Server host
+        port: Server port
+        scenario: Scenario dictionary
+        total: Number of measured requests
+        concurrency: Number of in-flight requests
+        warmup: Unmeasured requests issued first
+        timeout: Per-request timeout in seconds
+        server_pid: Server process id for RSS sampling
+
+    Returns:
+        Scenario result dictionary
+    """
+    for _ in range(warmup):
+        _request(host, port, scenario, timeout)
+
+    rss_before = read_rss_kb(server_pid)
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(
+            lambda _: _request(host, port, scenario, timeout), range(total)
+        ))
+    wall = time.perf_counter() - wall_start
+    rss_after = read_rss_kb(server_pid)
+
+    latencies = sorted(s[0] * 1000.0 for s in samples)
+    status_counts: Dict[str, int] = {}
+    for _, status, _ in samples:
+        status_counts[str(status)] = status_counts.get(str(status), 0) + 1
+    errors = sum(1 for _, status, _ in samples if status == 0 or status >= 500)
+
+    return {
+        'name': scenario['name'],
+        'method': scenario['method'],
+        'path': scenario['path'],
+        'requests': total,
+        'errors': errors,
+        'status_counts': status_counts,
+        'throughput_rps': round(total / wall, 2) if wall > 0 else None,
+        'latency_ms': {
+            'mean': round(sum(latencies) / len(latencies), 3) if latencies else None,
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+            'max': latencies[-1] if latencies else None
+        },
+        'bytes_mean': round(sum(s[2] for s in samples) / total, 1) if total else 0,
+        'rss_kb_before': rss_before['rss_kb'],
+        'rss_kb_after': rss_after['rss_kb']
+    }
+
+
+def git_commit() -> Optional[str]:
+    """Current git commit of the working tree, if available"""
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=APP_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(args) -> Dict[str, Any]:
+    """
+    Run the full benchmark suite
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        Results dictionary (also written to disk by main)
+    """
+    layer_sizes = dict(DEFAULT_LAYER_SIZES)
+    if args.large_features:
+        layer_sizes['synthetic_large'] = (args.large_features, args.large_vertices)
+
+    with tempfile.TemporaryDirectory(prefix='marbefes_bench_') as workdir, \
+            StubWMSServer(latency_ms=args.upstream_latency_ms) as stub:
+        vector_dir = Path(workdir) / 'vector'
+        write_layers(vector_dir, layer_sizes, seed=args.seed)
+
+        env = {
+            'WMS_BASE_URL': stub.url_for('/emodnet/wms'),
+            'HELCOM_WMS_BASE_URL': stub.url_for('/helcom/wms'),
+        }
+
+        ctx = multiprocessing.get_context('spawn')
+        port_queue = ctx.Queue()
+        server = ctx.Process(
+            target=serve_app,
+            args=(port_queue, env, str(vector_dir), args.config, workdir, args.server),
+            daemon=True
+        )
+        server.start()
+        try:
+            port = wait_for_port(port_queue, server)
+            rss_start = read_rss_kb(server.pid)
+
+            results = []
+            for scenario in default_scenarios(layer_sizes):
+                if args.only and scenario['name'] not in args.only:
+                    continue
+                result = run_scenario(
+                    '127.0.0.1', port, scenario, args.requests,
+                    args.concurrency, args.warmup, args.timeout, server.pid
+                )
+                results.append(result)
+                lat = result['latency_ms']
+                print(f"  {result['name']:<28} p50={lat['p50']:.1f}ms "
+                      f"p95={lat['p95']:.1f}ms p99={lat['p99']:.1f}ms "
+                      f"{result['throughput_rps']} req/s errors={result['errors']}")
+
+            rss_end = read_rss_kb(server.pid)
+        finally:
+            server.terminate()
+            server.join(timeout=10)
+
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'git_commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'config': args.config,
+            'server': args.server,
+            'concurrency': args.concurrency,
+            'requests_per_scenario': args.requests,
+            'warmup': args.warmup,
+            'upstream_latency_ms': args.upstream_latency_ms,
+            'layer_sizes': {k: list(v) for k, v in layer_sizes.items()},
+            'seed': args.seed,
+            'stubbed_services': missing_services(APP_DIR)
+        },
+        'server': {
+            'rss_kb_start': rss_start['rss_kb'],
+            'rss_kb_end': rss_end['rss_kb'],
+            'peak_rss_kb': rss_end['peak_rss_kb']
+        },
+        'scenarios': results
+    }
+
+
+def compare_results(base_path: Path, new_path: Path) -> None:
+    """
+    Print per-scenario deltas between two results files
+
+    Args:
+        base_path: Baseline results JSON
+        new_path: Candidate results JSON
+    """
+    with open(base_path, encoding='utf-8') as f:
+        base = json.load(f)
+    with open(new_path, encoding='utf-8') as f:
+        new = json.load(f)
+
+    def pct_change(old, cur):
+        if old in (None, 0) or cur is None:
+            return '   n/a'
+        return f"{(cur - old) / old * 100:+6.1f}%"
+
+    print(f"Baseline:  {base['meta'].get('git_commit')} ({base['meta']['timestamp']})")
+    print(f"Candidate: {new['meta'].get('git_commit')} ({new['meta']['timestamp']})")
+    print(f"{'scenario':<28} {'p50':>8} {'p95':>8} {'p99':>8} {'rps':>8}")
+
+    base_by_name = {s['name']: s for s in base['scenarios']}
+    for scenario in new['scenarios']:
+        old = base_by_name.get(scenario['name'])
+        if old is None:
+            print(f"{scenario['name']:<28} (new scenario)")
+            continue
+        print(f"{scenario['name']:<28} "
+              f"{pct_change(old['latency_ms']['p50'], scenario['latency_ms']['p50']):>8} "
+              f"{pct_change(old['latency_ms']['p95'], scenario['latency_ms']['p95']):>8} "
+              f"{pct_change(old['latency_ms']['p99'], scenario['latency_ms']['p99']):>8} "
+              f"{pct_change(old['throughput_rps'], scenario['throughput_rps']):>8}")
+
+    print(f"{'peak RSS':<28} "
+          f"{pct_change(base['server'].get('peak_rss_kb'), new['server'].get('peak_rss_kb')):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='MARBEFES API benchmark suite')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200,
+                        help='measured requests per scenario')
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--upstream-latency-ms', type=float, default=50.0,
+                        help='artificial latency added by the stub WMS')
+    parser.add_argument('--large-features', type=int, default=0,
+                        help='override feature count of synthetic_large')
+    parser.add_argument('--large-vertices', type=int, default=128)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--config', default='testing')
+    parser.add_argument('--server', choices=['wsgi', 'asgi'], default='wsgi',
+                        help='serve the Flask app (wsgi) or asgi.create_asgi_app on uvicorn')
+    parser.add_argument('--only', nargs='*', help='run only these scenario names')
+    parser.add_argument('--output', type=Path,
+                        help='results file (default: benchmarks/results/<timestamp>_<commit>.json)')
+    parser.add_argument('--compare', nargs=2, type=Path, metavar=('BASE', 'NEW'),
+                        help='compare two results files and exit')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare_results(*args.compare)
+        return
+
+    logging.basicConfig(level=logging.WARNING)
+    stubbed = missing_services(APP_DIR)
+    if stubbed:
+        print(f"Note: {', '.join(stubbed)} missing from this tree; "
+              f"benchmarking the stand-ins in benchmarks/stub_services.py")
+    print(f"Running benchmarks (concurrency={args.concurrency}, "
+          f"requests={args.requests}, upstream latency={args.upstream_latency_ms}ms)")
+    results = run_benchmarks(args)
+
+    output = args.output
+    if output is None:
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output = RESULTS_DIR / f"{stamp}_{results['meta']['git_commit'] or 'nogit'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""
+Stand-ins for service modules missing from this tree
+
+blueprints/api.py imports services.layer_service and blueprints/vector.py
+imports services.vector_service, but neither module exists in services/,
+so create_app() cannot start. The benchmark server installs these
+stand-ins under those module names (only when the real modules are
+missing) so the suite runs: VectorService serves the synthetic GeoJSON
+layers from VECTOR_DATA_PATH without geopandas, and LayerService combines
+the WMS, HELCOM and vector layer lists the way /api/all-layers expects.
+
+Timings of /api/all-layers and /api/vector/* therefore measure these
+stand-ins, not a production vector backend.
+"""
+import json
+import sys
+import types
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class VectorService:
+    """GeoJSON files in VECTOR_DATA_PATH served as vector layers"""
+
+    _layers: Dict[str, Dict] = {}
+
+    def __init__(self, config):
+        self.config = config
+        self.data_path = Path(config['VECTOR_DATA_PATH'])
+
+    def initialize(self) -> None:
+        self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        key = str(self.data_path.resolve())
+        layers = VectorService._layers.get(key)
+        if layers is None:
+            layers = {}
+            for path in sorted(self.data_path.glob('*.geojson')):
+                with open(path, encoding='utf-8') as f:
+                    layers[path.stem] = json.load(f)
+            VectorService._layers[key] = layers
+        return layers
+
+    @staticmethod
+    def _bounds(collection: Dict) -> Optional[List[float]]:
+        xs, ys = [], []
+        for feature in collection.get('features', []):
+            for ring in feature['geometry']['coordinates']:
+                for x, y in ring:
+                    xs.append(x)
+                    ys.append(y)
+        return [min(xs), min(ys), max(xs), max(ys)] if xs else None
+
+    def get_layers_summary(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                'name': name,
+                'feature_count': len(collection['features']),
+                'geometry_type': 'Polygon',
+                'bounds': self._bounds(collection),
+            }
+            for name, collection in self._load().items()
+        ]
+
+    def get_layer_geojson(self, layer_name: str, simplify: Optional[float] = None) -> Optional[Dict]:
+        return self._load().get(layer_name)
+
+    def create_bounds_summary(self) -> Dict[str, Any]:
+        return {name: {'bounds': self._bounds(collection)} for name, collection in self._load().items()}
+
+    def search_features(self, query: str, layer_name: Optional[str] = None,
+                        limit: int = 100) -> List[Dict[str, Any]]:
+        needle = query.lower()
+        results = []
+        for name, collection in self._load().items():
+            if layer_name and name != layer_name:
+                continue
+            for feature in collection['features']:
+                props = feature.get('properties', {})
+                if any(needle in str(value).lower() for value in props.values()):
+                    results.append({'layer': name, 'properties': props})
+                    if len(results) >= limit:
+                        return results
+        return results
+
+    def get_bbt_feature(self, area_name: str) -> Optional[Dict]:
+        return None
+
+
+class LayerService:
+    """WMS, HELCOM and vector layer lists for /api/all-layers"""
+
+    def __init__(self, config):
+        self.config = config
+
+    def get_all_layers(self) -> Dict[str, Any]:
+        from services.wms_service import WMSService
+
+        wms = WMSService(self.config['WMS_BASE_URL'], self.config['WMS_VERSION'])
+        helcom = WMSService(self.config['HELCOM_WMS_BASE_URL'], self.config['HELCOM_WMS_VERSION'])
+        vector = VectorService(self.config).get_layers_summary()
+        return {
+            'wms_layers': wms.get_available_layers(),
+            'helcom_layers': helcom.get_helcom_layers(),
+            'vector_layers': vector,
+            'vector_support': True,
+        }
+
+
+STUBS = {
+    'services.layer_service': LayerService,
+    'services.vector_service': VectorService,
+}
+
+
+def missing_services(app_dir: Path) -> List[str]:
+    """Names of the STUBS modules that have no source file under app_dir"""
+    return [
+        name for name in STUBS
+        if not (Path(app_dir) / (name.replace('.', '/') + '.py')).exists()
+    ]
+
+
+def install(app_dir: Path) -> List[str]:
+    """
+    Register the stand-ins for the services.* modules missing from app_dir
+
+    Args:
+        app_dir: Application directory (already on sys.path)
+
+    Returns:
+        Names of the modules that were stubbed
+    """
+    import services
+
+    stubbed = missing_services(app_dir)
+    for module_name in stubbed:
+        cls = STUBS[module_name]
+        module = types.ModuleType(module_name, f'Benchmark stand-in: {cls.__doc__}')
+        setattr(module, cls.__name__, cls)
+        sys.modules[module_name] = module
+        setattr(services, module_name.rsplit('.', 1)[1], module)
+    return stubbed
@@ -0,0 +1,229 @@
+"""
+Local stub WMS server for benchmarking
+
+Replays recorded GetCapabilities and GetFeatureInfo responses so that
+benchmark runs never depend on EMODnet or HELCOM availability.
+"""
+import argparse
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = Path(__file__).resolve().parent / 'fixtures'
+
+# Stub service path -> (capabilities fixture, upstream URL used when recording)
+SERVICES = {
+    '/emodnet/wms': (
+        'emodnet_capabilities.xml',
+        'https://ows.emodnet-seabedhabitats.eu/geoserver/emodnet_view/wms'
+    ),
+    '/helcom/wms': (
+        'helcom_capabilities.xml',
+        'https://maps.helcom.fi/arcgis/services/MADS/Pressures/MapServer/WMSServer'
+    ),
+}
+FEATURE_INFO_FIXTURE = 'feature_info.html'
+
+# 1x1 transparent PNG returned for GetLegendGraphic / GetMap
+_BLANK_PNG = bytes.fromhex(
+    '89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+    '1f15c4890000000d49444154789c6360000002000001e221bc330000000049454e44ae426082'
+)
+
+
+def load_fixtures(fixtures_dir: Path = FIXTURES_DIR) -> Dict[str, bytes]:
+    """
+    Load recorded responses into memory
+
+    Args:
+        fixtures_dir: Directory holding the recorded XML/HTML files
+
+    Returns:
+        Dictionary mapping fixture file name to its raw bytes
+    """
+    names = [capabilities for capabilities, _ in SERVICES.values()]
+    names.append(FEATURE_INFO_FIXTURE)
+    return {name: (fixtures_dir / name).read_bytes() for name in names}
+
+
+class StubWMSHandler(BaseHTTPRequestHandler):
+    """Request handler replaying fixtures for the WMS operations the app uses"""
+
+    fixtures: Dict[str, bytes] = {}
+    latency: float = 0.0
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        service = SERVICES.get(parsed.path)
+        if service is None:
+            self._send(404, b'Unknown service', 'text/plain')
+            return
+
+        params = {k.lower(): v[0] for k, v in parse_qs(parsed.query).items()}
+        operation = params.get('request', '').lower()
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if operation == 'getcapabilities':
+            self._send(200, self.fixtures[service[0]], 'text/xml')
+        elif operation == 'getfeatureinfo':
+            self._send(200, self.fixtures[FEATURE_INFO_FIXTURE], 'text/html')
+        elif operation in ('getlegendgraphic', 'getmap'):
+            self._send(200, _BLANK_PNG, 'image/png')
+        else:
+            self._send(400, b'Unsupported WMS request', 'text/plain')
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("stub-wms: " + format, *args)
+
+
+class _BacklogHTTPServer(ThreadingHTTPServer):
+    # The stdlib default backlog of 5 drops connection bursts from async
+    # clients, adding 1s SYN retransmits that no real WMS upstream would
+    request_queue_size = 1024
+
+
+class StubWMSServer:
+    """Threaded stub WMS server that can run in the background"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0,
+                 latency_ms: float = 0.0, fixtures_dir: Path = FIXTURES_DIR):
+        """
+        Initialize stub server
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            latency_ms: Artificial upstream latency added to every response
+            fixtures_dir: Directory holding the recorded responses
+        """
+        handler = type('BoundStubWMSHandler', (StubWMSHandler,), {
+            'fixtures': load_fixtures(fixtures_dir),
+            'latency': latency_ms / 1000.0,
+        })
+        self.httpd = _BacklogHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self.httpd.server_address[:2]
+
+    def url_for(self, service_path: str) -> str:
+        """
+        Get full URL for a stub service
+
+        Args:
+            service_path: One of the keys of SERVICES
+
+        Returns:
+            Absolute URL of the stub endpoint
+        """
+        host, port = self.address
+        return f"http://{host}:{port}{service_path}"
+
+    def start(self) -> 'StubWMSServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Stub WMS listening on {self.url_for('')}")
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def record_fixtures(fixtures_dir: Path = FIXTURES_DIR, timeout: int = 30) -> None:
+    """
+    Refresh the fixtures from the live upstream services
+
+    Args:
+        fixtures_dir: Directory the recorded responses are written to
+        timeout: Request timeout in seconds
+    """
+    import requests
+
+    fixtures_dir.mkdir(parents=True, exist_ok=True)
+    for fixture, upstream in SERVICES.values():
+        response = requests.get(upstream, params={
+            'service': 'WMS',
+            'version': '1.3.0',
+            'request': 'GetCapabilities'
+        }, timeout=timeout)
+        response.raise_for_status()
+        (fixtures_dir / fixture).write_bytes(response.content)
+        print(f"Recorded {fixture} ({len(response.content)} bytes)")
+
+    emodnet_url = SERVICES['/emodnet/wms'][1]
+    response = requests.get(emodnet_url, params={
+        'service': 'WMS',
+        'version': '1.1.0',
+        'request': 'GetFeatureInfo',
+        'layers': 'all_eusm2021',
+        'query_layers': 'all_eusm2021',
+        'styles': '',
+        'bbox': '-10,35,30,70',
+        'width': 800,
+        'height': 600,
+        'format': 'image/png',
+        'info_format': 'text/html',
+        'srs': 'EPSG:4326',
+        'x': 400,
+        'y': 300
+    }, timeout=timeout)
+    response.raise_for_status()
+    (fixtures_dir / FEATURE_INFO_FIXTURE).write_bytes(response.content)
+    print(f"Recorded {FEATURE_INFO_FIXTURE} ({len(response.content)} bytes)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stub WMS server replaying recorded responses')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8601)
+    parser.add_argument('--latency-ms', type=float, default=0.0,
+                        help='artificial upstream latency per request')
+    parser.add_argument('--record', action='store_true',
+                        help='refresh fixtures from the live services and exit')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if args.record:
+        record_fixtures()
+        return
+
+    server = StubWMSServer(args.host, args.port, args.latency_ms)
+    print(f"Stub WMS serving {', '.join(server.url_for(p) for p in SERVICES)}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Synthetic vector layer generation for benchmarking
+
+Produces deterministic GeoJSON polygon layers of configurable size so that
+vector endpoint timings are comparable across runs and machines.
+"""
+import json
+import math
+import random
+from pathlib import Path
+from typing import Dict, List
+
+# Bounding box the synthetic habitat patches are scattered over (Baltic/North Sea)
+DEFAULT_EXTENT = (-4.0, 51.0, 30.0, 66.0)
+
+HABITAT_CLASSES = [
+    'A5.13 Infralittoral coarse sediment',
+    'A5.23 Infralittoral fine sand',
+    'A5.27 Deep circalittoral sand',
+    'A5.35 Circalittoral sandy mud',
+    'A3.1 Atlantic and Mediterranean high energy infralittoral rock',
+]
+
+
+def _polygon_ring(cx: float, cy: float, radius: float, vertices: int,
+                  rng: random.Random) -> List[List[float]]:
+    """Irregular closed ring around (cx, cy) with full double-precision coordinates"""
+    ring = []
+    for i in range(vertices):
+        angle = 2 * math.pi * i / vertices
+        r = radius * (0.7 + 0.3 * rng.random())
+        ring.append([cx + r * math.cos(angle), cy + r * math.sin(angle)])
+    ring.append(list(ring[0]))
+    return ring
+
+
+def make_layer(features: int, vertices: int, seed: int = 0,
+               extent: tuple = DEFAULT_EXTENT) -> Dict:
+    """
+    Build a synthetic GeoJSON FeatureCollection
+
+    Args:
+        features: Number of polygon features
+        vertices: Vertices per polygon exterior ring
+        seed: Random seed so layers are reproducible
+        extent: (west, south, east, north) extent to scatter polygons over
+
+    Returns:
+        GeoJSON FeatureCollection dictionary
+    """
+    rng = random.Random(seed)
+    west, south, east, north = extent
+    radius = min(east - west, north - south) / max(math.sqrt(features), 1) / 3
+
+    collection = []
+    for fid in range(features):
+        cx = rng.uniform(west + radius, east - radius)
+        cy = rng.uniform(south + radius, north - radius)
+        habitat = rng.choice(HABITAT_CLASSES)
+        collection.append({
+            'type': 'Feature',
+            'properties': {
+                'id': fid,
+                'name': f'Habitat patch {fid}',
+                'habitat': habitat,
+                'area_km2': round(rng.uniform(0.5, 500.0), 3),
+            },
+            'geometry': {
+                'type': 'Polygon',
+                'coordinates': [_polygon_ring(cx, cy, radius, vertices, rng)]
+            }
+        })
+
+    return {'type': 'FeatureCollection', 'features': collection}
+
+
+def write_layers(target_dir: Path, sizes: Dict[str, tuple], seed: int = 0) -> List[Path]:
+    """
+    Write synthetic layers to a vector data directory
+
+    Args:
+        target_dir: Directory used as VECTOR_DATA_PATH
+        sizes: Mapping of layer name to (features, vertices)
+        seed: Base random seed
+
+    Returns:
+        List of written file paths
+    """
+    target_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    for offset, (name, (features, vertices)) in enumerate(sorted(sizes.items())):
+        path = target_dir / f'{name}.geojson'
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(make_layer(features, vertices, seed + offset), f)
+        written.append(path)
+    return written
@@ -8,14 +8,14 @@ import logging
 from services.wms_service import WMSService
 from services.layer_service import LayerService
 from utils.validators import validate_layer_name
-from utils.cache import cached
+from utils.compression import cached_response
 
 api_bp = Blueprint('api', __name__)
 logger = logging.getLogger(__name__)
 
 
 @api_bp.route('/layers')
-@cached(ttl=3600)
+@cached_response(ttl=3600)
 def get_layers():
     """Get available WMS layers"""
     try:
@@ -35,7 +35,7 @@ def get_layers():
 
 
 @api_bp.route('/helcom-layers')
-@cached(ttl=3600)
+@cached_response(ttl=3600)
 def get_helcom_layers():
     """Get available HELCOM WMS layers"""
     try:
@@ -55,7 +55,7 @@ def get_helcom_layers():
 
 
 @api_bp.route('/all-layers')
-@cached(ttl=3600)
+@cached_response(ttl=3600)
 def get_all_layers():
     """Get all available layers (WMS, HELCOM, and vector)"""
     try:
@@ -68,7 +68,7 @@ def get_all_layers():
 
 
 @api_bp.route('/capabilities')
-@cached(ttl=7200)
+@cached_response(ttl=7200)
 def get_capabilities():
     """Get WMS GetCapabilities document"""
     try:
@@ -147,6 +147,15 @@ def get_feature_info():
         return jsonify({'error': str(e)}), 500
 
 
+@api_bp.route('/rate-limit/stats')
+def get_rate_limit_stats():
+    """Get rate limiter metrics for this worker"""
+    limiter = current_app.extensions.get('rate_limiter')
+    if limiter is None:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, **limiter.get_stats()})
+
+
 # Error handlers for this blueprint
 @api_bp.errorhandler(404)
 def not_found(error):
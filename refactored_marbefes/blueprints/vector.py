@@ -1,19 +1,34 @@
 """
 Vector data blueprint for handling vector layer endpoints
 """
-from flask import Blueprint, jsonify, request, current_app
+from flask import Blueprint, Response, jsonify, request, current_app, stream_with_context
 from werkzeug.exceptions import BadRequest
+import json
 import logging
 
-from utils.validators import validate_layer_name, sanitize_url_parameter
-from utils.cache import cached
+from utils.validators import (
+    validate_layer_name,
+    sanitize_url_parameter,
+    validate_precision,
+    validate_zoom_level
+)
+from utils.compression import cached_response
+from utils.geometry_encoding import (
+    OUTPUT_FORMATS,
+    DEFAULT_TOPOJSON_PRECISION,
+    precision_for_zoom,
+    quantize_geojson,
+    to_topojson,
+    write_flatgeobuf,
+    stream_file
+)
 
 vector_bp = Blueprint('vector', __name__)
 logger = logging.getLogger(__name__)
 
 
 @vector_bp.route('/layers')
-@cached(ttl=3600)
+@cached_response(ttl=3600)
 def get_vector_layers():
     """Get available vector layers"""
     if not current_app.config['ENABLE_VECTOR_SUPPORT']:
@@ -44,8 +59,18 @@ def get_vector_layers():
 
 
 @vector_bp.route('/layer/<path:layer_name>')
+@cached_response(ttl=3600)
 def get_vector_layer_geojson(layer_name):
-    """Get GeoJSON for a specific vector layer"""
+    """
+    Get a specific vector layer
+    
+    Query parameters:
+        simplify: Simplification tolerance
+        format: 'geojson' (default), 'topojson' (shared, delta-encoded arcs)
+            or 'fgb' (FlatGeobuf binary stream)
+        precision: Coordinate decimal places
+        zoom: Map zoom level; picks a precision that resolves half a pixel
+    """
     if not current_app.config['ENABLE_VECTOR_SUPPORT']:
         return jsonify({"error": "Vector support not available"}), 503
     
@@ -56,14 +81,42 @@ def get_vector_layer_geojson(layer_name):
         # Get optional simplification parameter
         simplify = request.args.get('simplify', type=float)
         
+        output_format = request.args.get('format', 'geojson').lower()
+        if output_format not in OUTPUT_FORMATS:
+            return jsonify({
+                "error": f"Unsupported format '{output_format}'",
+                "formats": list(OUTPUT_FORMATS)
+            }), 400
+        precision = _requested_precision()
+        
         from services.vector_service import VectorService
         vector_service = VectorService(current_app.config)
         geojson = vector_service.get_layer_geojson(layer_name, simplify)
         
-        if geojson:
-            return jsonify(geojson)
-        else:
+        if not geojson:
             return jsonify({"error": f"Layer '{layer_name}' not found"}), 404
+        
+        if output_format == 'topojson':
+            topology = to_topojson(
+                geojson, layer_name,
+                precision if precision is not None else DEFAULT_TOPOJSON_PRECISION
+            )
+            return current_app.response_class(
+                json.dumps(topology, separators=(',', ':')),
+                mimetype='application/json'
+            )
+        
+        if output_format == 'fgb':
+            path = write_flatgeobuf(geojson)
+            return Response(
+                stream_with_context(stream_file(path)),
+                mimetype='application/flatgeobuf',
+                headers={'Content-Disposition': f'inline; filename="{layer_name}.fgb"'}
+            )
+        
+        if precision is not None:
+            geojson = quantize_geojson(geojson, precision)
+        return jsonify(geojson)
             
     except BadRequest as e:
         return jsonify({"error": str(e)}), 400
@@ -75,8 +128,17 @@ def get_vector_layer_geojson(layer_name):
         return jsonify({"error": str(e)}), 500
 
 
+def _requested_precision():
+    """Coordinate precision from the 'precision' or 'zoom' query parameter"""
+    if request.args.get('precision') is not None:
+        return validate_precision(request.args.get('precision'))
+    if request.args.get('zoom') is not None:
+        return precision_for_zoom(validate_zoom_level(request.args.get('zoom')))
+    return None
+
+
 @vector_bp.route('/bounds')
-@cached(ttl=3600)
+@cached_response(ttl=3600)
 def get_vector_bounds():
     """Get bounds of all vector layers"""
     if not current_app.config['ENABLE_VECTOR_SUPPORT']:
@@ -37,15 +37,38 @@ class Config:
     CACHE_DEFAULT_TIMEOUT = 3600  # 1 hour
     CACHE_KEY_PREFIX = 'marbefes_'
     
+    # Response compression (brotli/zstd used when their codecs are installed)
+    COMPRESSION_ENABLED = True
+    COMPRESSION_MIN_SIZE = 1024  # bytes
+    COMPRESSION_ENCODINGS = ['zstd', 'br', 'gzip']  # server preference order
+    
     # Security settings
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     ALLOWED_EXTENSIONS = {'gpkg', 'geojson', 'shp', 'json'}
     CORS_ORIGINS = '*'  # Configure appropriately for production
     
-    # Rate limiting
+    # Rate limiting (token bucket per client; storage: memory://, cache:// or redis://)
     RATELIMIT_ENABLED = True
     RATELIMIT_DEFAULT = "100/hour"
     RATELIMIT_STORAGE_URL = "memory://"
+    # Tokens spent per request by endpoint; unlisted endpoints cost 1
+    RATELIMIT_ENDPOINT_COSTS = {
+        'vector.get_vector_layer_geojson': 5,
+        'api.get_feature_info': 5,
+        'vector.search_vector_features': 3,
+        'vector.get_bbt_area': 3,
+        'api.get_capabilities': 2,
+    }
+    RATELIMIT_EXEMPT = {
+        'static', 'serve_logo', 'main.health_check', 'main.index',
+        'api.get_rate_limit_stats',
+    }
+    
+    # Reverse proxies in front of the app whose X-Forwarded-* headers are
+    # trusted (0 = none). Rate limits key on the client address, so behind
+    # nginx this must match the number of proxy hops or every client shares
+    # the proxy's bucket.
+    PROXY_FIX_X_FOR = int(os.getenv('PROXY_FIX_X_FOR', '0'))
     
     # Logging
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
@@ -58,6 +81,12 @@ class Config:
     MAX_WORKERS = 4
     CONNECTION_POOL_SIZE = 10
     
+    # ASGI serving (asgi.py)
+    ASGI_UPSTREAM_CONNECTIONS = 200  # concurrent upstream WMS connections per process
+    ASGI_WSGI_THREADS = 32  # threads running the mounted Flask routes
+    ASGI_PARSE_THREADS = 4  # threads parsing capabilities XML
+    ASGI_RATELIMIT_THREADS = 8  # threads checking shared rate limit storage
+    
     # Default layer configuration
     DEFAULT_LAYERS = [
         {
@@ -105,6 +134,8 @@ class ProductionConfig(Config):
     DEBUG = False
     CACHE_TYPE = 'redis'
     CACHE_REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+    RATELIMIT_STORAGE_URL = os.getenv('RATELIMIT_STORAGE_URL', 'cache://')
+    PROXY_FIX_X_FOR = int(os.getenv('PROXY_FIX_X_FOR', '1'))  # deployed behind nginx
     LOG_LEVEL = 'WARNING'
     
     # Stricter security in production
@@ -119,6 +150,7 @@ class TestingConfig(Config):
     TESTING = True
     WTF_CSRF_ENABLED = False
     CACHE_TYPE = 'null'
+    RATELIMIT_ENABLED = False
 
 
 # Configuration dictionary
@@ -0,0 +1,134 @@
+"""
+Async WMS Service Layer
+Non-blocking counterpart of WMSService for the ASGI app; shares its
+request building and capabilities parsing
+"""
+import asyncio
+from concurrent.futures import Executor
+import logging
+from typing import List, Dict, Optional, Any
+
+import httpx
+
+from .wms_service import (
+    ServiceError,
+    capabilities_params,
+    feature_info_params,
+    parse_capabilities,
+    parse_layers,
+    select_helcom_layers
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncWMSService:
+    """Service for WMS operations over a shared httpx.AsyncClient"""
+
+    def __init__(self, client: httpx.AsyncClient, base_url: str, version: str = "1.3.0",
+                 executor: Optional[Executor] = None):
+        """
+        Initialize service
+
+        Args:
+            client: Shared async HTTP client (owns the connection pool)
+            base_url: WMS endpoint URL
+            version: WMS version for GetCapabilities
+            executor: Pool capabilities XML is parsed in; None uses the loop default
+        """
+        self.client = client
+        self.base_url = base_url
+        self.version = version
+        self.executor = executor
+
+    async def get_capabilities_xml(self) -> bytes:
+        """
+        Get raw GetCapabilities XML document
+
+        Returns:
+            XML content as bytes
+        """
+        try:
+            response = await self.client.get(
+                self.base_url,
+                params=capabilities_params(self.version),
+                timeout=10
+            )
+            response.raise_for_status()
+            return response.content
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to fetch capabilities: {e}")
+            raise ServiceError(f"Failed to fetch capabilities: {e}")
+
+    async def get_available_layers(self, default_layers: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """
+        Fetch available layers from WMS GetCapabilities
+
+        Args:
+            default_layers: Layers returned when the service is unreachable
+
+        Returns:
+            List of layer dictionaries with name, title, and description
+        """
+        try:
+            return await self._parse(await self.get_capabilities_xml(), parse_layers)
+        except Exception as e:
+            logger.error(f"Error fetching WMS layers: {e}")
+            return default_layers
+
+    async def get_helcom_layers(self) -> List[Dict[str, str]]:
+        """
+        Fetch available HELCOM layers
+
+        Returns:
+            List of HELCOM layer dictionaries
+        """
+        try:
+            layers = await self._parse(await self.get_capabilities_xml(), parse_layers)
+            return select_helcom_layers(layers)
+        except Exception as e:
+            logger.error(f"Error fetching HELCOM layers: {e}")
+            return []
+
+    async def get_feature_info(
+        self,
+        layer_name: str,
+        bbox: List[float],
+        width: int,
+        height: int,
+        x: int,
+        y: int,
+        info_format: str = 'text/html'
+    ) -> str:
+        """
+        Get feature information for a specific location
+
+        Args:
+            layer_name: Name of the layer
+            bbox: Bounding box [minx, miny, maxx, maxy]
+            width: Map width in pixels
+            height: Map height in pixels
+            x: Click x coordinate
+            y: Click y coordinate
+            info_format: Response format
+
+        Returns:
+            Feature information content
+        """
+        params = feature_info_params(layer_name, bbox, width, height, x, y, info_format)
+
+        try:
+            response = await self.client.get(self.base_url, params=params, timeout=10)
+            response.raise_for_status()
+            return response.text
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to get feature info: {e}")
+            raise ServiceError(f"Failed to get feature info: {e}")
+
+    async def _parse(self, xml_content: bytes, parser) -> Any:
+        """Parse capabilities off the event loop; large documents take a while"""
+        def run():
+            return parser(parse_capabilities(xml_content))
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, run)
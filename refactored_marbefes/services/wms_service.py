@@ -16,6 +16,112 @@ class ServiceError(Exception):
     pass
 
 
+def capabilities_params(version: str) -> Dict[str, str]:
+    """Query parameters for a GetCapabilities request"""
+    return {
+        'service': 'WMS',
+        'version': version,
+        'request': 'GetCapabilities'
+    }
+
+
+def feature_info_params(
+    layer_name: str,
+    bbox: List[float],
+    width: int,
+    height: int,
+    x: int,
+    y: int,
+    info_format: str = 'text/html'
+) -> Dict[str, Any]:
+    """Query parameters for a GetFeatureInfo request"""
+    return {
+        'service': 'WMS',
+        'version': '1.1.0',
+        'request': 'GetFeatureInfo',
+        'layers': layer_name,
+        'query_layers': layer_name,
+        'styles': '',
+        'bbox': ','.join(map(str, bbox)),
+        'width': width,
+        'height': height,
+        'format': 'image/png',
+        'info_format': info_format,
+        'srs': 'EPSG:4326',
+        'x': x,
+        'y': y
+    }
+
+
+def parse_capabilities(xml_content: bytes) -> ET.Element:
+    """
+    Parse a GetCapabilities document with namespaces stripped
+    
+    Args:
+        xml_content: Raw XML
+        
+    Returns:
+        Parsed XML root element
+    """
+    root = ET.fromstring(xml_content)
+    
+    # Remove namespaces for easier parsing
+    for elem in root.iter():
+        if '}' in elem.tag:
+            elem.tag = elem.tag.split('}')[1]
+            
+    return root
+
+
+def parse_layers(root: ET.Element) -> List[Dict[str, str]]:
+    """
+    Parse layers from GetCapabilities XML
+    
+    Args:
+        root: XML root element
+        
+    Returns:
+        List of parsed layer dictionaries
+    """
+    layers = []
+    
+    for layer in root.findall('.//Layer'):
+        name_elem = layer.find('Name')
+        title_elem = layer.find('Title')
+        abstract_elem = layer.find('Abstract')
+        
+        if name_elem is not None and name_elem.text:
+            # Skip workspace-prefixed names for now
+            if ':' not in name_elem.text:
+                layers.append({
+                    'name': name_elem.text,
+                    'title': title_elem.text if title_elem is not None else name_elem.text,
+                    'description': abstract_elem.text if abstract_elem is not None else ''
+                })
+                
+    return layers[:20] if layers else []  # Limit results
+
+
+def select_helcom_layers(layers: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """
+    Filter parsed layers down to HELCOM-style layers
+    
+    Args:
+        layers: Parsed layer dictionaries
+        
+    Returns:
+        HELCOM layer dictionaries with readable titles
+    """
+    helcom_layers = []
+    for layer in layers:
+        layer_name = layer.get('name', '').strip()
+        if layer_name and '_' in layer_name:  # HELCOM naming convention
+            layer['title'] = layer.get('title') or layer_name.replace('_', ' ').title()
+            helcom_layers.append(layer)
+            
+    return helcom_layers[:15]  # Limit to reasonable number
+
+
 class WMSService:
     """Service for handling WMS operations"""
     
@@ -52,17 +158,7 @@ class WMSService:
         """
         try:
             capabilities = self._get_capabilities()
-            layers = self._parse_layers(capabilities)
-            
-            # Filter for HELCOM-specific layers
-            helcom_layers = []
-            for layer in layers:
-                layer_name = layer.get('name', '').strip()
-                if layer_name and '_' in layer_name:  # HELCOM naming convention
-                    layer['title'] = layer.get('title') or layer_name.replace('_', ' ').title()
-                    helcom_layers.append(layer)
-                    
-            return helcom_layers[:15]  # Limit to reasonable number
+            return select_helcom_layers(self._parse_layers(capabilities))
         except Exception as e:
             logger.error(f"Error fetching HELCOM layers: {e}")
             return []
@@ -74,11 +170,7 @@ class WMSService:
         Returns:
             XML content as bytes
         """
-        params = {
-            'service': 'WMS',
-            'version': self.version,
-            'request': 'GetCapabilities'
-        }
+        params = capabilities_params(self.version)
         
         try:
             response = self.session.get(
@@ -136,22 +228,7 @@ class WMSService:
         Returns:
             Feature information content
         """
-        params = {
-            'service': 'WMS',
-            'version': '1.1.0',
-            'request': 'GetFeatureInfo',
-            'layers': layer_name,
-            'query_layers': layer_name,
-            'styles': '',
-            'bbox': ','.join(map(str, bbox)),
-            'width': width,
-            'height': height,
-            'format': 'image/png',
-            'info_format': info_format,
-            'srs': 'EPSG:4326',
-            'x': x,
-            'y': y
-        }
+        params = feature_info_params(layer_name, bbox, width, height, x, y, info_format)
         
         try:
             response = self.session.get(
@@ -172,15 +249,7 @@ class WMSService:
         Returns:
             Parsed XML root element
         """
-        xml_content = self.get_capabilities_xml()
-        root = ET.fromstring(xml_content)
-        
-        # Remove namespaces for easier parsing
-        for elem in root.iter():
-            if '}' in elem.tag:
-                elem.tag = elem.tag.split('}')[1]
-                
-        return root
+        return parse_capabilities(self.get_capabilities_xml())
     
     def _parse_layers(self, root: ET.Element) -> List[Dict[str, str]]:
         """
@@ -192,23 +261,7 @@ class WMSService:
         Returns:
             List of parsed layer dictionaries
         """
-        layers = []
-        
-        for layer in root.findall('.//Layer'):
-            name_elem = layer.find('Name')
-            title_elem = layer.find('Title')
-            abstract_elem = layer.find('Abstract')
-            
-            if name_elem is not None and name_elem.text:
-                # Skip workspace-prefixed names for now
-                if ':' not in name_elem.text:
-                    layers.append({
-                        'name': name_elem.text,
-                        'title': title_elem.text if title_elem is not None else name_elem.text,
-                        'description': abstract_elem.text if abstract_elem is not None else ''
-                    })
-                    
-        return layers[:20] if layers else []  # Limit results
+        return parse_layers(root)
     
     def get_layer_bounds(self, layer_name: str) -> Optional[List[float]]:
         """
@@ -10,6 +10,7 @@ from .validators import (
     validate_file_extension,
     validate_geojson,
     validate_zoom_level,
+    validate_precision,
     validate_opacity
 )
 
@@ -21,6 +22,17 @@ from .cache import (
     CacheManager
 )
 
+from .compression import (
+    cached_response,
+    negotiate_encoding,
+    CompressedBody
+)
+
+from .rate_limit import (
+    RateLimiter,
+    parse_rate
+)
+
 __all__ = [
     # Validators
     'validate_layer_name',
@@ -31,11 +43,19 @@ __all__ = [
     'validate_file_extension',
     'validate_geojson',
     'validate_zoom_level',
+    'validate_precision',
     'validate_opacity',
     # Cache
     'SimpleCache',
     'get_cache',
     'cached',
     'cache_key_for_request',
-    'CacheManager'
+    'CacheManager',
+    # Compression
+    'cached_response',
+    'negotiate_encoding',
+    'CompressedBody',
+    # Rate limiting
+    'RateLimiter',
+    'parse_rate'
 ]
@@ -0,0 +1,322 @@
+"""
+Response compression utilities
+
+Negotiates gzip, brotli and zstd with the client and stores every encoded
+variant next to the raw body in the response cache, so a hot response is
+compressed at most once per encoding rather than once per request.
+"""
+import gzip
+import threading
+from functools import wraps
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+from flask import current_app, make_response, request, Response
+
+from .cache import get_cache, cache_key_for_request
+
+logger = logging.getLogger(__name__)
+
+# Optional codecs - gzip is always available
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Server preference when the client weights several encodings equally
+DEFAULT_ENCODINGS = ['zstd', 'br', 'gzip']
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/geo+json',
+    'application/xml',
+    'text/xml',
+    'text/html',
+    'text/plain',
+    'text/csv',
+}
+
+# (upper size bound in bytes, {encoding: level}); larger payloads get cheaper
+# levels so the one-off compression on a cache miss stays fast
+LEVELS_BY_SIZE = [
+    (64 * 1024, {'gzip': 9, 'br': 11, 'zstd': 19}),
+    (1024 * 1024, {'gzip': 6, 'br': 8, 'zstd': 12}),
+    (16 * 1024 * 1024, {'gzip': 5, 'br': 5, 'zstd': 6}),
+    (None, {'gzip': 3, 'br': 4, 'zstd': 3}),
+]
+
+
+def available_encodings() -> List[str]:
+    """
+    Get content encodings supported by the installed codecs
+
+    Returns:
+        Encoding tokens in server preference order
+    """
+    supported = {'gzip'}
+    if brotli is not None:
+        supported.add('br')
+    if zstandard is not None:
+        supported.add('zstd')
+    return [enc for enc in DEFAULT_ENCODINGS if enc in supported]
+
+
+def enabled_encodings(config: dict) -> List[str]:
+    """
+    Get the encodings the app may use, honouring COMPRESSION_* settings
+
+    Args:
+        config: Application configuration
+
+    Returns:
+        Encoding tokens in server preference order
+    """
+    if not config.get('COMPRESSION_ENABLED', True):
+        return []
+    available = available_encodings()
+    return [
+        enc for enc in config.get('COMPRESSION_ENCODINGS', DEFAULT_ENCODINGS)
+        if enc in available
+    ]
+
+
+def compression_level(encoding: str, size: int) -> int:
+    """
+    Pick a compression level appropriate for the payload size
+
+    Args:
+        encoding: Content encoding token
+        size: Raw payload size in bytes
+
+    Returns:
+        Codec-specific compression level
+    """
+    for limit, levels in LEVELS_BY_SIZE:
+        if limit is None or size <= limit:
+            return levels[encoding]
+    return LEVELS_BY_SIZE[-1][1][encoding]
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """
+    Compress a payload with the given encoding
+
+    Args:
+        data: Raw payload
+        encoding: 'gzip', 'br' or 'zstd'
+
+    Returns:
+        Encoded payload
+
+    Raises:
+        ValueError: If the encoding is unsupported or its codec is missing
+    """
+    level = compression_level(encoding, len(data))
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    if encoding == 'br' and brotli is not None:
+        return brotli.compress(data, quality=level)
+    if encoding == 'zstd' and zstandard is not None:
+        return zstandard.ZstdCompressor(level=level).compress(data)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """
+    Parse an Accept-Encoding header into quality values
+
+    Args:
+        header: Raw header value
+
+    Returns:
+        Mapping of lower-cased coding to q-value
+    """
+    weights = {}
+    if not header:
+        return weights
+
+    for part in header.split(','):
+        token, _, params = part.strip().partition(';')
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[token] = q
+    return weights
+
+
+def negotiate_encoding(header: Optional[str], supported: List[str]) -> Optional[str]:
+    """
+    Choose the best content encoding for a request
+
+    Args:
+        header: Accept-Encoding header value
+        supported: Encodings the server can produce, in preference order
+
+    Returns:
+        Chosen encoding, or None to send the identity representation
+    """
+    weights = parse_accept_encoding(header)
+    if not weights:
+        return None
+
+    wildcard = weights.get('*')
+    best, best_q = None, 0.0
+    for encoding in supported:
+        q = weights.get(encoding, wildcard if wildcard is not None else 0.0)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressedBody:
+    """Cached response body with lazily built, memoized encoded variants"""
+
+    __slots__ = ('raw', 'status', 'mimetype', 'headers', 'variants', '_lock')
+
+    def __init__(self, raw: bytes, status: int, mimetype: str,
+                 headers: List[Tuple[str, str]]):
+        self.raw = raw
+        self.status = status
+        self.mimetype = mimetype
+        self.headers = headers
+        self.variants: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_response(cls, response: Response) -> 'CompressedBody':
+        """
+        Capture a Flask response for caching
+
+        Args:
+            response: Fully built response
+
+        Returns:
+            CompressedBody holding the raw body and passthrough headers
+        """
+        skip = {'content-length', 'content-encoding', 'content-type', 'vary'}
+        headers = [(k, v) for k, v in response.headers.items() if k.lower() not in skip]
+        return cls(response.get_data(), response.status_code, response.content_type, headers)
+
+    def is_compressible(self, min_size: int) -> bool:
+        base_type = self.mimetype.split(';')[0].strip().lower()
+        return len(self.raw) >= min_size and base_type in COMPRESSIBLE_MIMETYPES
+
+    def variant(self, encoding: str) -> bytes:
+        """
+        Get the body encoded with the given encoding, compressing only once
+
+        Args:
+            encoding: Content encoding token
+
+        Returns:
+            Encoded body
+        """
+        data = self.variants.get(encoding)
+        if data is not None:
+            return data
+        with self._lock:
+            data = self.variants.get(encoding)
+            if data is None:
+                data = compress(self.raw, encoding)
+                self.variants[encoding] = data
+                logger.debug(
+                    f"Compressed {len(self.raw)} -> {len(data)} bytes with {encoding}"
+                )
+        return data
+
+    def select(self, accept_encoding: Optional[str], min_size: int,
+               supported: List[str]) -> Tuple[bytes, Optional[str]]:
+        """
+        Choose the body variant for a client
+
+        Args:
+            accept_encoding: Client Accept-Encoding header
+            min_size: Bodies smaller than this are sent uncompressed
+            supported: Encodings the server may use
+
+        Returns:
+            Tuple of (body, content encoding or None for identity)
+        """
+        encoding = None
+        if self.is_compressible(min_size):
+            encoding = negotiate_encoding(accept_encoding, supported)
+        return (self.variant(encoding) if encoding else self.raw), encoding
+
+    def to_response(self, accept_encoding: Optional[str], min_size: int,
+                    supported: List[str]) -> Response:
+        """
+        Build a response for a client, choosing the best encoding
+
+        Args:
+            accept_encoding: Client Accept-Encoding header
+            min_size: Bodies smaller than this are sent uncompressed
+            supported: Encodings the server may use
+
+        Returns:
+            Flask response
+        """
+        body, encoding = self.select(accept_encoding, min_size, supported)
+        response = Response(body, status=self.status, content_type=self.mimetype)
+        for key, value in self.headers:
+            response.headers[key] = value
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if self.is_compressible(min_size):
+            response.vary.add('Accept-Encoding')
+        return response
+
+
+def cached_response(ttl: int = 3600, key_prefix: str = None):
+    """
+    Decorator caching a view's response body together with its compressed variants
+
+    Only successful (200), non-streamed responses are cached. The cache key
+    covers the request path, method and query string.
+
+    Args:
+        ttl: Time to live in seconds
+        key_prefix: Optional prefix for cache keys
+
+    Returns:
+        Decorated view function
+    """
+    def decorator(view: Callable):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            config = current_app.config
+            min_size = config.get('COMPRESSION_MIN_SIZE', 1024)
+            supported = enabled_encodings(config)
+
+            cache = get_cache(ttl)
+            cache_key = f"{key_prefix or view.__name__}:{cache_key_for_request(request)}"
+            entry = cache.get(cache_key)
+
+            if entry is None:
+                response = make_response(view(*args, **kwargs))
+                if (response.status_code != 200 or response.is_streamed
+                        or response.direct_passthrough):
+                    return response
+                entry = CompressedBody.from_response(response)
+                cache.set(cache_key, entry)
+
+            return entry.to_response(
+                request.headers.get('Accept-Encoding'), min_size, supported
+            )
+
+        wrapper.clear_cache = lambda: get_cache().clear()
+
+        return wrapper
+    return decorator
@@ -0,0 +1,434 @@
+"""
+Compact geometry encodings for vector API responses
+
+Provides coordinate quantization for GeoJSON, a TopoJSON encoder with
+shared, delta-encoded arcs, and FlatGeobuf binary output.
+"""
+import math
+import os
+import tempfile
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_FORMATS = ('geojson', 'topojson', 'fgb')
+
+# Decimal places used for TopoJSON when the client gives neither zoom nor precision
+# (1e-5 degrees is roughly 1 m at the equator)
+DEFAULT_TOPOJSON_PRECISION = 5
+
+MAX_PRECISION = 10
+
+Point = Tuple[int, int]
+
+
+def precision_for_zoom(zoom: int, tile_size: int = 256) -> int:
+    """
+    Get the number of decimal places that resolves half a screen pixel
+
+    Args:
+        zoom: Web map zoom level (0-22)
+        tile_size: Tile size in pixels
+
+    Returns:
+        Decimal places for degree coordinates
+    """
+    degrees_per_pixel = 360.0 / (tile_size * 2 ** zoom)
+    decimals = math.ceil(-math.log10(degrees_per_pixel / 2))
+    return max(0, min(MAX_PRECISION, decimals))
+
+
+# --- Quantized GeoJSON ---------------------------------------------------
+
+def _round_position(position: List[float], decimals: int) -> List[float]:
+    return [round(c, decimals) for c in position]
+
+
+def _round_line(line: List[List[float]], decimals: int, closed: bool) -> List[List[float]]:
+    """Round a coordinate sequence and drop consecutive duplicates"""
+    rounded = []
+    for position in line:
+        point = _round_position(position, decimals)
+        if not rounded or point != rounded[-1]:
+            rounded.append(point)
+
+    if closed:
+        if rounded and rounded[0] != rounded[-1]:
+            rounded.append(list(rounded[0]))
+        # Keep degenerate rings valid rather than dropping them
+        while len(rounded) < 4 and rounded:
+            rounded.append(list(rounded[0]))
+    return rounded
+
+
+def quantize_geometry(geometry: Optional[Dict], decimals: int) -> Optional[Dict]:
+    """
+    Round a GeoJSON geometry's coordinates to a fixed number of decimals
+
+    Args:
+        geometry: GeoJSON geometry dictionary (or None)
+        decimals: Decimal places to keep
+
+    Returns:
+        New geometry dictionary
+    """
+    if geometry is None:
+        return None
+
+    geom_type = geometry.get('type')
+    coords = geometry.get('coordinates')
+
+    if geom_type == 'GeometryCollection':
+        return {
+            'type': geom_type,
+            'geometries': [quantize_geometry(g, decimals) for g in geometry.get('geometries', [])]
+        }
+    if geom_type == 'Point':
+        new_coords = _round_position(coords, decimals)
+    elif geom_type == 'MultiPoint':
+        new_coords = [_round_position(p, decimals) for p in coords]
+    elif geom_type == 'LineString':
+        new_coords = _round_line(coords, decimals, closed=False)
+    elif geom_type == 'MultiLineString':
+        new_coords = [_round_line(line, decimals, closed=False) for line in coords]
+    elif geom_type == 'Polygon':
+        new_coords = [_round_line(ring, decimals, closed=True) for ring in coords]
+    elif geom_type == 'MultiPolygon':
+        new_coords = [
+            [_round_line(ring, decimals, closed=True) for ring in polygon]
+            for polygon in coords
+        ]
+    else:
+        return geometry
+
+    return {'type': geom_type, 'coordinates': new_coords}
+
+
+def quantize_geojson(geojson: Dict, decimals: int) -> Dict:
+    """
+    Quantize every feature geometry of a FeatureCollection
+
+    Args:
+        geojson: GeoJSON FeatureCollection
+        decimals: Decimal places to keep
+
+    Returns:
+        New FeatureCollection (input is not modified)
+    """
+    result = {k: v for k, v in geojson.items() if k != 'features'}
+    result['features'] = [
+        {**feature, 'geometry': quantize_geometry(feature.get('geometry'), decimals)}
+        for feature in geojson.get('features', [])
+    ]
+    if isinstance(result.get('metadata'), dict):
+        result['metadata'] = {**result['metadata'], 'coordinate_precision': decimals}
+    return result
+
+
+# --- TopoJSON --------------------------------------------------------------
+
+def _iter_positions(geometry: Optional[Dict]) -> Iterator[List[float]]:
+    if geometry is None:
+        return
+    geom_type = geometry.get('type')
+    if geom_type == 'GeometryCollection':
+        for child in geometry.get('geometries', []):
+            yield from _iter_positions(child)
+        return
+    coords = geometry.get('coordinates')
+    if geom_type == 'Point':
+        yield coords
+    elif geom_type in ('MultiPoint', 'LineString'):
+        yield from coords
+    elif geom_type in ('MultiLineString', 'Polygon'):
+        for line in coords:
+            yield from line
+    elif geom_type == 'MultiPolygon':
+        for polygon in coords:
+            for ring in polygon:
+                yield from ring
+
+
+class _TopologyBuilder:
+    """Builds TopoJSON arcs shared between all lines and rings of a layer"""
+
+    def __init__(self, translate: Tuple[float, float], scale: Tuple[float, float]):
+        self.translate = translate
+        self.scale = scale
+        # Line records: (points, closed)
+        self.lines: List[Tuple[List[Point], bool]] = []
+        self.arcs: List[List[Point]] = []
+        self._arc_index: Dict[Tuple[Point, ...], int] = {}
+
+    def quantize(self, position: List[float]) -> Point:
+        return (
+            int(round((position[0] - self.translate[0]) / self.scale[0])),
+            int(round((position[1] - self.translate[1]) / self.scale[1]))
+        )
+
+    def add_line(self, coords: List[List[float]], closed: bool) -> int:
+        """Register a line or ring and return its line id"""
+        points: List[Point] = []
+        for position in coords:
+            point = self.quantize(position)
+            if not points or point != points[-1]:
+                points.append(point)
+        if closed and len(points) > 1 and points[0] == points[-1]:
+            points.pop()  # rings are stored open and closed again when cut
+        self.lines.append((points, closed))
+        return len(self.lines) - 1
+
+    def _junctions(self) -> set:
+        """Points where lines meet, fork or end"""
+        neighbours: Dict[Point, frozenset] = {}
+        junctions = set()
+        for points, closed in self.lines:
+            n = len(points)
+            for i, point in enumerate(points):
+                if closed:
+                    prev_pt, next_pt = points[i - 1], points[(i + 1) % n]
+                else:
+                    if i == 0 or i == n - 1:
+                        junctions.add(point)
+                        continue
+                    prev_pt, next_pt = points[i - 1], points[i + 1]
+                pair = frozenset((prev_pt, next_pt))
+                seen = neighbours.setdefault(point, pair)
+                if seen != pair:
+                    junctions.add(point)
+        return junctions
+
+    def _index_arc(self, arc: List[Point]) -> int:
+        key = tuple(arc)
+        index = self._arc_index.get(key)
+        if index is not None:
+            return index
+        index = self._arc_index.get(tuple(reversed(arc)))
+        if index is not None:
+            return ~index
+        self.arcs.append(arc)
+        self._arc_index[key] = len(self.arcs) - 1
+        return len(self.arcs) - 1
+
+    def cut(self) -> List[List[int]]:
+        """
+        Split every line at junctions and deduplicate the resulting arcs
+
+        Returns:
+            Arc index list per registered line id
+        """
+        junctions = self._junctions()
+        line_arcs = []
+        for points, closed in self.lines:
+            if not points:
+                line_arcs.append([])
+                continue
+
+            if closed:
+                starts = [i for i, p in enumerate(points) if p in junctions]
+                if not starts:
+                    # Isolated ring: rotate to a canonical start so identical
+                    # rings with different starting vertices share one arc
+                    start = points.index(min(points))
+                    ring = points[start:] + points[:start] + [points[start]]
+                    line_arcs.append([self._index_arc(ring)])
+                    continue
+                start = starts[0]
+                points = points[start:] + points[:start] + [points[start]]
+
+            indices = []
+            arc = [points[0]]
+            for point in points[1:]:
+                arc.append(point)
+                if point in junctions and len(arc) > 1:
+                    indices.append(self._index_arc(arc))
+                    arc = [point]
+            if len(arc) > 1:
+                indices.append(self._index_arc(arc))
+            elif not indices:
+                indices.append(self._index_arc(arc + arc))
+            line_arcs.append(indices)
+        return line_arcs
+
+    def encoded_arcs(self) -> List[List[List[int]]]:
+        """Delta-encode arcs: first position absolute, the rest relative"""
+        encoded = []
+        for arc in self.arcs:
+            x0, y0 = arc[0]
+            deltas = [[x0, y0]]
+            for x, y in arc[1:]:
+                deltas.append([x - x0, y - y0])
+                x0, y0 = x, y
+            encoded.append(deltas)
+        return encoded
+
+
+def _register_geometry(builder: _TopologyBuilder, geometry: Optional[Dict]) -> Optional[Dict]:
+    """Register a geometry's lines; return a template with line ids in place of arcs"""
+    if geometry is None:
+        return None
+
+    geom_type = geometry.get('type')
+    coords = geometry.get('coordinates')
+
+    if geom_type == 'GeometryCollection':
+        return {
+            'type': geom_type,
+            'geometries': [_register_geometry(builder, g) for g in geometry.get('geometries', [])]
+        }
+    if geom_type == 'Point':
+        return {'type': geom_type, 'coordinates': list(builder.quantize(coords))}
+    if geom_type == 'MultiPoint':
+        return {'type': geom_type, 'coordinates': [list(builder.quantize(p)) for p in coords]}
+    if geom_type == 'LineString':
+        return {'type': geom_type, 'lines': builder.add_line(coords, closed=False)}
+    if geom_type == 'MultiLineString':
+        return {'type': geom_type, 'lines': [builder.add_line(c, closed=False) for c in coords]}
+    if geom_type == 'Polygon':
+        return {'type': geom_type, 'lines': [builder.add_line(r, closed=True) for r in coords]}
+    if geom_type == 'MultiPolygon':
+        return {
+            'type': geom_type,
+            'lines': [[builder.add_line(r, closed=True) for r in polygon] for polygon in coords]
+        }
+    return None
+
+
+def _resolve_lines(template: Optional[Dict], line_arcs: List[List[int]]) -> Optional[Dict]:
+    """Replace line ids in a geometry template with arc index lists"""
+    if template is None:
+        return None
+    if template['type'] == 'GeometryCollection':
+        return {
+            'type': 'GeometryCollection',
+            'geometries': [_resolve_lines(g, line_arcs) for g in template['geometries']]
+        }
+    if 'lines' not in template:
+        return template
+
+    lines = template['lines']
+    geom_type = template['type']
+    if geom_type == 'LineString':
+        arcs = line_arcs[lines]
+    elif geom_type in ('MultiLineString', 'Polygon'):
+        arcs = [line_arcs[line] for line in lines]
+    else:
+        arcs = [[line_arcs[ring] for ring in polygon] for polygon in lines]
+    return {'type': geom_type, 'arcs': arcs}
+
+
+def to_topojson(geojson: Dict, object_name: str, decimals: int = DEFAULT_TOPOJSON_PRECISION) -> Dict:
+    """
+    Encode a FeatureCollection as quantized TopoJSON with shared arcs
+
+    Boundaries shared by adjacent polygons are stored once and referenced
+    from both sides, and arc positions are delta-encoded integers.
+
+    Args:
+        geojson: GeoJSON FeatureCollection
+        object_name: Name of the TopoJSON object holding the features
+        decimals: Decimal places of the quantization grid
+
+    Returns:
+        TopoJSON Topology dictionary
+    """
+    features = geojson.get('features', [])
+
+    xs, ys = [], []
+    for feature in features:
+        for position in _iter_positions(feature.get('geometry')):
+            xs.append(position[0])
+            ys.append(position[1])
+    bbox = [min(xs), min(ys), max(xs), max(ys)] if xs else [0.0, 0.0, 0.0, 0.0]
+
+    step = 10.0 ** -decimals
+    builder = _TopologyBuilder(translate=(bbox[0], bbox[1]), scale=(step, step))
+
+    templates = [_register_geometry(builder, f.get('geometry')) for f in features]
+    line_arcs = builder.cut()
+
+    geometries = []
+    for feature, template in zip(features, templates):
+        geometry = _resolve_lines(template, line_arcs)
+        if geometry is None:
+            geometry = {'type': None}
+        if feature.get('properties'):
+            geometry['properties'] = feature['properties']
+        if feature.get('id') is not None:
+            geometry['id'] = feature['id']
+        geometries.append(geometry)
+
+    topology = {
+        'type': 'Topology',
+        'bbox': bbox,
+        'transform': {'scale': [step, step], 'translate': [bbox[0], bbox[1]]},
+        'objects': {
+            object_name: {'type': 'GeometryCollection', 'geometries': geometries}
+        },
+        'arcs': builder.encoded_arcs()
+    }
+    if isinstance(geojson.get('metadata'), dict):
+        topology['metadata'] = {**geojson['metadata'], 'coordinate_precision': decimals}
+    return topology
+
+
+# --- FlatGeobuf ------------------------------------------------------------
+
+def write_flatgeobuf(geojson: Dict, crs: str = 'EPSG:4326') -> str:
+    """
+    Write a FeatureCollection to a temporary FlatGeobuf file
+
+    Requires geopandas (with a fiona or pyogrio FlatGeobuf driver).
+
+    Args:
+        geojson: GeoJSON FeatureCollection
+        crs: CRS of the coordinates
+
+    Returns:
+        Path of the temporary file; the caller owns and must delete it
+
+    Raises:
+        ImportError: If geopandas is not installed
+    """
+    import geopandas as gpd
+
+    metadata = geojson.get('metadata') or {}
+    crs = metadata.get('crs') or crs
+    gdf = gpd.GeoDataFrame.from_features(geojson.get('features', []), crs=crs)
+
+    fd, path = tempfile.mkstemp(suffix='.fgb', prefix='marbefes_')
+    os.close(fd)
+    try:
+        gdf.to_file(path, driver='FlatGeobuf')
+    except Exception:
+        os.remove(path)
+        raise
+    return path
+
+
+def stream_file(path: str, chunk_size: int = 64 * 1024, delete: bool = True) -> Iterator[bytes]:
+    """
+    Stream a file in chunks, optionally deleting it afterwards
+
+    Args:
+        path: File to stream
+        chunk_size: Bytes per chunk
+        delete: Remove the file once streaming finishes or is aborted
+
+    Yields:
+        File content chunks
+    """
+    try:
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+    finally:
+        if delete:
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning(f"Could not remove temporary file {path}: {e}")
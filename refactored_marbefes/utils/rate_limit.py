@@ -0,0 +1,475 @@
+"""
+Per-client token-bucket rate limiting
+
+Each client gets a bucket holding up to ``capacity`` tokens that refills
+continuously at ``capacity / period`` tokens per second. A request spends
+its endpoint's cost in tokens, so expensive endpoints (full vector layers,
+upstream GetFeatureInfo) drain the bucket faster than cached listings.
+Every check is O(1): one read and one write of a (tokens, timestamp) pair.
+"""
+import math
+import re
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+import logging
+
+from flask import current_app, jsonify, request
+
+from .cache import CacheManager
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {
+    'second': 1,
+    'minute': 60,
+    'hour': 3600,
+    'day': 86400,
+}
+
+_RATE_PATTERN = re.compile(
+    r'^\s*(\d+)\s*(?:/|per)\s*(\d+)?\s*(second|minute|hour|day)s?\s*$',
+    re.IGNORECASE
+)
+
+# (allowed, tokens remaining, seconds until the request would be allowed)
+ConsumeResult = Tuple[bool, float, float]
+
+
+def parse_rate(rate: str) -> Tuple[int, float]:
+    """
+    Parse a rate limit string such as "100/hour" or "10 per 5 minutes"
+
+    Args:
+        rate: Rate limit string
+
+    Returns:
+        Tuple of (bucket capacity, refill rate in tokens per second)
+
+    Raises:
+        ValueError: If the string cannot be parsed
+    """
+    match = _RATE_PATTERN.match(rate or '')
+    if not match:
+        raise ValueError(f"Invalid rate limit: {rate!r}")
+
+    amount = int(match.group(1))
+    multiplier = int(match.group(2) or 1)
+    period = PERIODS[match.group(3).lower()] * multiplier
+    if amount <= 0 or period <= 0:
+        raise ValueError(f"Invalid rate limit: {rate!r}")
+    return amount, amount / period
+
+
+def forwarded_client(remote_addr: Optional[str], forwarded_for: Optional[str],
+                     hops: int) -> str:
+    """
+    Resolve the client address the way ProxyFix(x_for=hops) does
+
+    Args:
+        remote_addr: Address of the connecting peer
+        forwarded_for: X-Forwarded-For header value, if any
+        hops: Number of trusted reverse proxies (0 trusts none)
+
+    Returns:
+        The address ``hops`` entries from the end of X-Forwarded-For when
+        the header has that many, else the peer address
+    """
+    if hops > 0 and forwarded_for:
+        values = [value.strip() for value in forwarded_for.split(',')]
+        if len(values) >= hops and values[-hops]:
+            return values[-hops]
+    return remote_addr or 'unknown'
+
+
+def _refill(tokens: float, updated: float, capacity: int, refill_rate: float,
+            now: float) -> float:
+    """Tokens in a bucket at time ``now`` given its last stored state"""
+    return min(capacity, tokens + max(0.0, now - updated) * refill_rate)
+
+
+def _spend(tokens: float, cost: float, refill_rate: float) -> ConsumeResult:
+    """Try to spend ``cost`` tokens from a refilled bucket"""
+    if tokens >= cost:
+        return True, tokens - cost, 0.0
+    return False, tokens, (cost - tokens) / refill_rate
+
+
+class MemoryStorage:
+    """In-process bucket storage; limits are per worker process"""
+
+    def __init__(self, max_keys: int = 10000):
+        """
+        Initialize storage
+
+        Args:
+            max_keys: Bucket count above which idle, fully refilled buckets are dropped
+        """
+        self.buckets: Dict[str, list] = {}
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, cost: float, capacity: int,
+                refill_rate: float, now: float) -> ConsumeResult:
+        with self._lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                tokens = float(capacity)
+            else:
+                tokens = _refill(bucket[0], bucket[1], capacity, refill_rate, now)
+
+            allowed, tokens, retry_after = _spend(tokens, cost, refill_rate)
+            self.buckets[key] = [tokens, now]
+
+            if len(self.buckets) > self.max_keys:
+                self.cleanup(capacity, refill_rate, now)
+            return allowed, tokens, retry_after
+
+    def cleanup(self, capacity: int, refill_rate: float, now: float) -> int:
+        """
+        Drop buckets that have refilled completely (equivalent to no bucket)
+
+        Returns:
+            Number of buckets removed
+        """
+        full = [
+            key for key, (tokens, updated) in self.buckets.items()
+            if _refill(tokens, updated, capacity, refill_rate, now) >= capacity
+        ]
+        for key in full:
+            del self.buckets[key]
+        if full:
+            logger.debug(f"Dropped {len(full)} idle rate limit buckets")
+        return len(full)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.buckets.clear()
+
+
+class CacheStorage:
+    """
+    Bucket storage on top of a get/set cache backend (SimpleCache and friends)
+
+    The read-modify-write is serialised per process only, so concurrent
+    workers sharing a cache may occasionally both spend the same token.
+    The backend may hold other entries, so the storage remembers the
+    bucket keys it wrote and ``clear`` deletes only those.
+    """
+
+    def __init__(self, cache: Any, key_prefix: str = 'ratelimit:'):
+        self.cache = cache
+        self.key_prefix = key_prefix
+        self._keys = set()
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, cost: float, capacity: int,
+                refill_rate: float, now: float) -> ConsumeResult:
+        cache_key = f"{self.key_prefix}{key}"
+        with self._lock:
+            self._keys.add(cache_key)
+            bucket = self.cache.get(cache_key)
+            if bucket is None:
+                tokens = float(capacity)
+            else:
+                tokens = _refill(bucket[0], bucket[1], capacity, refill_rate, now)
+
+            allowed, tokens, retry_after = _spend(tokens, cost, refill_rate)
+            self.cache.set(cache_key, (tokens, now))
+            return allowed, tokens, retry_after
+
+    def clear(self) -> None:
+        with self._lock:
+            for cache_key in self._keys:
+                self.cache.delete(cache_key)
+            self._keys.clear()
+
+
+class RedisStorage:
+    """Bucket storage in Redis, updated atomically by a Lua script"""
+
+    # KEYS[1] = bucket key
+    # ARGV = cost, capacity, refill rate (tokens/s), now (s), ttl (ms)
+    # Returns {allowed, tokens remaining, retry after} as strings to keep precision
+    SCRIPT = """
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local cost = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local rate = tonumber(ARGV[3])
+local now = tonumber(ARGV[4])
+
+local tokens = tonumber(bucket[1])
+local updated = tonumber(bucket[2])
+if tokens == nil then
+    tokens = capacity
+else
+    tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+end
+
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], ARGV[5])
+return {allowed, tostring(tokens), tostring(retry_after)}
+"""
+
+    def __init__(self, client: Any, key_prefix: str = 'marbefes_ratelimit:'):
+        self.client = client
+        self.key_prefix = key_prefix
+        self._script = client.register_script(self.SCRIPT)
+
+    def consume(self, key: str, cost: float, capacity: int,
+                refill_rate: float, now: float) -> ConsumeResult:
+        # Buckets expire once they would have refilled, so idle clients cost nothing
+        ttl_ms = int(math.ceil(capacity / refill_rate * 1000)) + 1000
+        allowed, tokens, retry_after = self._script(
+            keys=[f"{self.key_prefix}{key}"],
+            args=[cost, capacity, refill_rate, now, ttl_ms]
+        )
+        return bool(int(allowed)), float(tokens), float(retry_after)
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(f"{self.key_prefix}*"):
+            self.client.delete(key)
+
+
+def storage_from_url(url: str, config: dict) -> Any:
+    """
+    Create bucket storage from RATELIMIT_STORAGE_URL
+
+    Supported URLs are ``memory://``, ``cache://`` (the backend selected by
+    CACHE_TYPE) and ``redis://...``. Redis falls back to in-memory storage
+    when the client library is not installed.
+
+    Args:
+        url: Storage URL
+        config: Application configuration
+
+    Returns:
+        Storage instance
+    """
+    scheme = (url or 'memory://').split('://', 1)[0].lower()
+
+    if scheme == 'memory':
+        return MemoryStorage()
+
+    if scheme == 'cache':
+        backend = CacheManager.get_cache_backend(config)
+        if hasattr(backend, 'register_script'):
+            return RedisStorage(backend)
+        return CacheStorage(backend)
+
+    if scheme in ('redis', 'rediss'):
+        try:
+            import redis
+            return RedisStorage(redis.from_url(url))
+        except ImportError:
+            logger.warning("Redis not installed, falling back to in-memory rate limiting")
+            return MemoryStorage()
+
+    logger.warning(f"Unknown rate limit storage: {url}, using in-memory storage")
+    return MemoryStorage()
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter for a Flask application
+
+    Reads RATELIMIT_DEFAULT, RATELIMIT_STORAGE_URL, RATELIMIT_ENDPOINT_COSTS
+    and RATELIMIT_EXEMPT from the app config. Clients are keyed by remote
+    address (ProxyFix resolves the real address in production).
+    """
+
+    def __init__(self, app=None):
+        self.storage = None
+        self.capacity = 0
+        self.refill_rate = 0.0
+        self.costs: Dict[str, float] = {}
+        self.exempt = set()
+        self._stats_lock = threading.Lock()
+        self._reset_stats()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        """
+        Configure the limiter and register request hooks
+
+        Args:
+            app: Flask application
+        """
+        config = app.config
+        self.capacity, self.refill_rate = parse_rate(config.get('RATELIMIT_DEFAULT', '100/hour'))
+        self.costs = dict(config.get('RATELIMIT_ENDPOINT_COSTS', {}))
+        self.exempt = set(config.get('RATELIMIT_EXEMPT', ()))
+        self.storage = storage_from_url(config.get('RATELIMIT_STORAGE_URL', 'memory://'), config)
+
+        app.extensions['rate_limiter'] = self
+        app.before_request(self._check_request)
+        app.after_request(self._add_headers)
+
+        logger.info(
+            f"Rate limiting {config.get('RATELIMIT_DEFAULT')} per client "
+            f"using {type(self.storage).__name__}"
+        )
+
+    def cost_for(self, endpoint: Optional[str]) -> float:
+        """
+        Get the token cost of an endpoint, capped at the bucket capacity
+
+        Args:
+            endpoint: Flask endpoint name (e.g. 'vector.get_vector_layer_geojson')
+
+        Returns:
+            Token cost
+        """
+        return min(float(self.costs.get(endpoint, 1)), float(self.capacity))
+
+    def client_key(self) -> str:
+        """
+        Get the bucket key of the current request's client
+
+        The remote address is only the real client when the app is reached
+        directly. Behind reverse proxies it is the client address ProxyFix
+        takes from X-Forwarded-For, which requires PROXY_FIX_X_FOR to be set
+        to the number of proxy hops; otherwise all clients share one bucket.
+
+        Returns:
+            Client address
+        """
+        return request.remote_addr or 'unknown'
+
+    def consume(self, client: str, cost: float) -> ConsumeResult:
+        """
+        Spend tokens from a client's bucket
+
+        Storage failures fail open so an unavailable backend never takes
+        the API down with it.
+
+        Args:
+            client: Client identifier
+            cost: Tokens to spend
+
+        Returns:
+            Tuple of (allowed, tokens remaining, retry after in seconds)
+        """
+        try:
+            return self.storage.consume(client, cost, self.capacity,
+                                        self.refill_rate, time.time())
+        except Exception as e:
+            logger.warning(f"Rate limit storage error, allowing request: {e}")
+            with self._stats_lock:
+                self._stats['storage_errors'] += 1
+            return True, float(self.capacity), 0.0
+
+    def check(self, client: str, endpoint: Optional[str],
+              method: str = 'GET') -> Optional[Tuple[bool, float, int]]:
+        """
+        Charge a request to its client's bucket and record the outcome
+
+        Args:
+            client: Client identifier
+            endpoint: Endpoint name used to look up the cost
+            method: HTTP method (CORS preflights are never charged)
+
+        Returns:
+            Tuple of (allowed, tokens remaining, whole seconds to wait), or
+            None when the request is exempt
+        """
+        if endpoint is None or endpoint in self.exempt or method == 'OPTIONS':
+            return None
+
+        cost = self.cost_for(endpoint)
+        allowed, remaining, retry_after = self.consume(client, cost)
+        self._record(endpoint, cost, allowed)
+
+        retry_seconds = 0 if allowed else max(1, int(math.ceil(retry_after)))
+        if not allowed:
+            logger.info(
+                f"Rate limited {client} on {endpoint} "
+                f"(cost {cost:g}, retry in {retry_seconds}s)"
+            )
+        return allowed, remaining, retry_seconds
+
+    def _check_request(self):
+        result = self.check(self.client_key(), request.endpoint, request.method)
+        if result is None:
+            return None
+
+        allowed, remaining, retry_seconds = result
+        request.environ['marbefes.ratelimit'] = remaining
+        if allowed:
+            return None
+
+        response = jsonify({
+            'error': 'Rate limit exceeded',
+            'limit': current_app.config.get('RATELIMIT_DEFAULT'),
+            'retry_after': retry_seconds
+        })
+        response.status_code = 429
+        response.headers['Retry-After'] = str(retry_seconds)
+        return response
+
+    def _add_headers(self, response):
+        remaining = request.environ.get('marbefes.ratelimit')
+        if remaining is not None:
+            response.headers['X-RateLimit-Limit'] = str(self.capacity)
+            response.headers['X-RateLimit-Remaining'] = str(int(remaining))
+        return response
+
+    def _reset_stats(self) -> None:
+        self._stats = {
+            'allowed': 0,
+            'limited': 0,
+            'tokens_spent': 0.0,
+            'storage_errors': 0,
+            'endpoints': {}
+        }
+
+    def _record(self, endpoint: str, cost: float, allowed: bool) -> None:
+        with self._stats_lock:
+            per_endpoint = self._stats['endpoints'].setdefault(
+                endpoint, {'allowed': 0, 'limited': 0, 'cost': cost}
+            )
+            if allowed:
+                self._stats['allowed'] += 1
+                self._stats['tokens_spent'] += cost
+                per_endpoint['allowed'] += 1
+            else:
+                self._stats['limited'] += 1
+                per_endpoint['limited'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get limiter metrics for this process
+
+        Returns:
+            Dictionary with allowed/limited counts overall and per endpoint
+        """
+        with self._stats_lock:
+            total = self._stats['allowed'] + self._stats['limited']
+            limited_rate = (self._stats['limited'] / total * 100) if total > 0 else 0
+            return {
+                'limit': f"{self.capacity} tokens, refill {self.refill_rate * 3600:g}/hour",
+                'storage': type(self.storage).__name__,
+                'allowed': self._stats['allowed'],
+                'limited': self._stats['limited'],
+                'limited_rate': f"{limited_rate:.2f}%",
+                'tokens_spent': self._stats['tokens_spent'],
+                'storage_errors': self._stats['storage_errors'],
+                'endpoints': {k: dict(v) for k, v in self._stats['endpoints'].items()}
+            }
+
+    def reset(self) -> None:
+        """Clear all buckets and metrics"""
+        if self.storage is not None:
+            self.storage.clear()
+        with self._stats_lock:
+            self._reset_stats()
@@ -239,6 +239,31 @@ def validate_zoom_level(zoom: int) -> int:
     return zoom
 
 
+def validate_precision(precision: int, max_precision: int = 10) -> int:
+    """
+    Validate coordinate precision (decimal places)
+    
+    Args:
+        precision: Number of decimal places
+        max_precision: Largest allowed value
+        
+    Returns:
+        Validated precision
+        
+    Raises:
+        BadRequest: If precision is invalid
+    """
+    try:
+        precision = int(precision)
+    except (ValueError, TypeError):
+        abort(400, "Precision must be an integer")
+    
+    if not 0 <= precision <= max_precision:
+        abort(400, f"Precision must be between 0 and {max_precision}")
+    
+    return precision
+
+
 def validate_opacity(opacity: float) -> float:
     """
     Validate opacity value